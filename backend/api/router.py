@@ -1,31 +1,36 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi import APIRouter, HTTPException, Depends, Request, UploadFile, File
 from fastapi.security import OAuth2PasswordBearer
 from typing import Optional, List
 import os
 from ..services.transcription import TranscriptionService
 from ..services.command_parser import CommandParser, JiraAction
 from ..services.jira_client import JiraClient
+from ..services.streaming import ndjson_response, sse_response
+from ..services.etag import etag_response
+from ..services.fast_parser import fast_parser
+from ..services.parse_cache import parse_cache
+from ..services.prompt_compiler import token_usage
+from ..services.jira_prefetch import prefetch_stats
+from ..services.audio_upload import UploadTooLarge
+from ..services.client_registry import use_client
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# Initialize services
-transcription_service = TranscriptionService()
-command_parser = CommandParser()
-jira_client = JiraClient()
-
 @router.post("/transcribe")
 async def transcribe_audio(
     audio_file: UploadFile = File(...),
-    language: str = "en-US"
+    language: str = "en-US",
+    transcription_service: TranscriptionService = Depends(use_client("deepgram_sdk"))
 ):
     """
     Transcribe uploaded audio file
     """
     try:
-        audio_data = await audio_file.read()
-        transcript = await transcription_service.transcribe_audio(audio_data, language)
+        transcript = await transcription_service.transcribe_upload(audio_file, language)
         return {"transcript": transcript}
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -33,7 +38,8 @@ async def transcribe_audio(
 async def parse_command(
     transcript: str,
     project_key: Optional[str] = None,
-    token: str = Depends(oauth2_scheme)
+    token: str = Depends(oauth2_scheme),
+    command_parser: CommandParser = Depends(use_client("command_parser"))
 ):
     """
     Parse transcribed command into Jira action
@@ -44,26 +50,70 @@ async def parse_command(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/parse-stats")
+async def get_parse_stats(
+    token: str = Depends(oauth2_scheme),
+    command_parser: CommandParser = Depends(use_client("command_parser"))
+):
+    """
+    Get command parser statistics: fast-path and result cache hit rates, LLM token usage and Jira prefetching
+    """
+    return {
+        "fast_path": fast_parser.stats(),
+        "result_cache": parse_cache.stats(),
+        "token_usage": token_usage.stats(),
+        "micro_batch": command_parser.batcher.stats(),
+        "cascade": command_parser.cascade.stats(),
+        "jira_prefetch": prefetch_stats()
+    }
+
 @router.post("/process-teams-transcript")
 async def process_teams_transcript(
     transcript: str,
     project_key: Optional[str] = None,
-    token: str = Depends(oauth2_scheme)
+    token: str = Depends(oauth2_scheme),
+    transcription_service: TranscriptionService = Depends(use_client("deepgram_sdk")),
+    command_parser: CommandParser = Depends(use_client("command_parser")),
+    jira_client: JiraClient = Depends(use_client("jira"))
 ):
     """
     Process Teams meeting transcript and extract Jira actions
     """
     try:
         cleaned_transcript = await transcription_service.process_teams_transcript(transcript)
+        jira_client.prefetch(cleaned_transcript, project_key)
         actions = await command_parser.parse_teams_transcript(cleaned_transcript, project_key)
         return {"actions": [action.dict() for action in actions]}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/process-teams-transcript/stream")
+async def stream_teams_transcript(
+    transcript: str,
+    project_key: Optional[str] = None,
+    token: str = Depends(oauth2_scheme),
+    transcription_service: TranscriptionService = Depends(use_client("deepgram_sdk")),
+    command_parser: CommandParser = Depends(use_client("command_parser")),
+    jira_client: JiraClient = Depends(use_client("jira"))
+):
+    """
+    Process Teams meeting transcript, streaming each Jira action as a Server-Sent Event
+    """
+    try:
+        cleaned_transcript = await transcription_service.process_teams_transcript(transcript)
+        jira_client.prefetch(cleaned_transcript, project_key)
+        return await sse_response(
+            command_parser.stream_teams_transcript(cleaned_transcript, project_key),
+            event="action"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/execute-action")
 async def execute_action(
     action: JiraAction,
-    token: str = Depends(oauth2_scheme)
+    token: str = Depends(oauth2_scheme),
+    jira_client: JiraClient = Depends(use_client("jira"))
 ):
     """
     Execute a parsed Jira action
@@ -74,27 +124,46 @@ async def execute_action(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/execute-actions")
+async def execute_actions(
+    actions: List[JiraAction],
+    token: str = Depends(oauth2_scheme),
+    jira_client: JiraClient = Depends(use_client("jira"))
+):
+    """
+    Execute many parsed Jira actions, bulk-creating issues where possible
+    """
+    try:
+        results = await jira_client.execute_actions(actions)
+        return {"results": results}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/projects")
-async def get_projects(token: str = Depends(oauth2_scheme)):
+async def get_projects(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    jira_client: JiraClient = Depends(use_client("jira"))
+):
     """
-    Get list of accessible Jira projects
+    Get list of accessible Jira projects, honouring If-None-Match
     """
     try:
         projects = await jira_client.get_projects()
-        return {"projects": projects}
+        return etag_response(request, {"projects": projects})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/search")
 async def search_issues(
     jql: str,
-    token: str = Depends(oauth2_scheme)
+    token: str = Depends(oauth2_scheme),
+    jira_client: JiraClient = Depends(use_client("jira"))
 ):
     """
-    Search Jira issues using JQL
+    Search Jira issues using JQL, streaming results as NDJSON
     """
     try:
-        issues = await jira_client.search_issues(jql)
-        return {"issues": issues}
+        return await ndjson_response(jira_client.iter_issues(jql))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) 
\ No newline at end of file
@@ -2,6 +2,7 @@ import requests
 import os
 from dotenv import load_dotenv
 from ..utils.supabase import get_supabase_client
+from ...services.jira_client_cache import jira_client_cache
 from datetime import datetime, timedelta
 
 load_dotenv()
@@ -66,6 +67,9 @@ class JiraService:
         }
         
         this.supabase.table("users").update(data).eq("id", user_id).execute()
+        
+        # Cached Jira clients still hold the old access token
+        jira_client_cache.invalidate_user(user_id)
 
     async def check_token_expiry(self, user_id: str):
         """Check if the user's token is expired and refresh if necessary"""
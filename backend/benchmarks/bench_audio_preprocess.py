@@ -0,0 +1,74 @@
+"""
+Measure how much audio preprocessing saves before upload and what it costs.
+
+Synthesises a browser-style recording (stereo 48 kHz 16-bit WAV with long
+silences around and between speech), streams it through the preprocessor in
+upload-sized chunks and reports bytes saved and processing time per audio
+minute.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_audio_preprocess --minutes 10
+"""
+import argparse
+import time
+import numpy as np
+from ..services.audio_preprocess import AudioPreprocessor, encode_wav
+from ..services.audio_upload import UPLOAD_CHUNK_BYTES
+
+RATE = 48000
+
+def meeting_audio(minutes: float, speech_ratio: float, seed: int = 11) -> bytes:
+    """
+    Alternate speech bursts and pauses until `minutes` of stereo audio exist
+    """
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * RATE)
+    segments = []
+    length = 0
+    while length < total:
+        seconds = rng.uniform(1, 8)
+        count = int(seconds * RATE)
+        if rng.random() < speech_ratio:
+            t = np.arange(count) / RATE
+            envelope = 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 4 * t))
+            segments.append(0.1 * envelope * rng.standard_normal(count))
+        else:
+            segments.append(0.0005 * rng.standard_normal(count))
+        length += count
+    mono = np.concatenate(segments)[:total]
+    stereo = np.stack([mono, mono], axis=1)
+    return encode_wav((np.clip(stereo, -1, 1) * 32767).astype("<i2").tobytes(), RATE, channels=2)
+
+def run(data: bytes, chunk_size: int, trim_silence: bool) -> dict:
+    preprocessor = AudioPreprocessor(trim_silence=trim_silence)
+    started = time.perf_counter()
+    for start in range(0, len(data), chunk_size):
+        preprocessor.feed(data[start:start + chunk_size])
+    preprocessor.flush()
+    elapsed = time.perf_counter() - started
+    stats = preprocessor.stats()
+    minutes = stats["seconds_in"] / 60
+    return {
+        **stats,
+        "saved": round(1 - stats["bytes_out"] / stats["bytes_in"], 3),
+        "ms_per_audio_minute": round(elapsed * 1000 / minutes, 1),
+        "realtime_factor": round(stats["seconds_in"] / elapsed)
+    }
+
+def main(args: argparse.Namespace):
+    data = meeting_audio(args.minutes, args.speech_ratio)
+    print(f"input: {args.minutes} min stereo {RATE} Hz 16-bit WAV, {len(data) / 1e6:.1f} MB")
+    for name, trim_silence in (("downmix+resample", False), ("downmix+resample+vad", True)):
+        result = run(data, args.chunk_size, trim_silence)
+        print(
+            f"{name:>22}: {result['bytes_out'] / 1e6:7.1f} MB out ({result['saved']:.1%} saved), "
+            f"{result['seconds_out']:.0f}s of {result['seconds_in']:.0f}s audio kept, "
+            f"{result['ms_per_audio_minute']} ms per audio minute ({result['realtime_factor']}x realtime)"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=5)
+    parser.add_argument("--speech-ratio", type=float, default=0.5, help="Share of segments that are speech")
+    parser.add_argument("--chunk-size", type=int, default=UPLOAD_CHUNK_BYTES)
+    main(parser.parse_args())
@@ -0,0 +1,80 @@
+"""
+Compare per-call ClientSession requests against the shared Jira connection pool.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_jira_pool
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import aiohttp
+from ..services.http_pool import HttpPool
+from ..services.jira_service import JiraService
+from .jira_stub import JiraStub
+
+async def _per_call_session(base_url: str) -> None:
+    # Previous behaviour: a new session (and TCP connection) for every request
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{base_url}/rest/api/3/project") as response:
+            await response.json()
+
+async def _measure(name: str, call, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def run_one():
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "mode": name,
+        "requests": requests,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3)
+    }
+
+async def main(requests: int, concurrency: int, latency: float):
+    stub = JiraStub(latency=latency)
+    base_url = await stub.start()
+    try:
+        stub.peers.clear()
+        per_call = await _measure(
+            "session-per-call",
+            lambda: _per_call_session(base_url),
+            requests,
+            concurrency
+        )
+        per_call["connections"] = stub.connection_count
+
+        pool = HttpPool("bench", limit_per_host=concurrency)
+        service = JiraService("bench-token", pool=pool)
+        service.base_url = base_url
+        stub.peers.clear()
+        pooled = await _measure("pooled", service.get_projects, requests, concurrency)
+        pooled["connections"] = stub.connection_count
+        await pool.close()
+    finally:
+        await stub.stop()
+
+    for result in (per_call, pooled):
+        print(
+            f"{result['mode']:>18}: {result['throughput_rps']:>8} req/s  "
+            f"p50={result['p50_ms']}ms  p95={result['p95_ms']}ms  "
+            f"connections={result['connections']}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub server latency in seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.latency))
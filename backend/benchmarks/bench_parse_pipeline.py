@@ -0,0 +1,115 @@
+"""
+Benchmark the command parsing pipeline offline against the local LLM stand-in.
+
+Runs the same command mix through CommandService.parse_command with each
+layer switched on in turn (LLM only, fast path, result cache, micro-batching)
+and reports throughput, latency and how many LLM requests were made.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_parse_pipeline --llm-latency 0.8 --tokens-per-second 50
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from ..services.llm import LocalLLMProvider, set_llm_provider
+from ..services.fast_parser import fast_parser
+from ..services.parse_cache import parse_cache
+from ..services.command_service import CommandService, command_batcher
+
+STRUCTURED = [
+    "Add a comment to PROJ-{n} saying the fix is deployed",
+    "Move PROJ-{n} to in progress",
+    "Assign PROJ-{n} to alice",
+    "Create a bug in WEB called Login button {n} is broken"
+]
+# Phrases that need the LLM; standups repeat a handful of them
+FREE_FORM = [
+    "what is still open for the release",
+    "anything blocking the mobile team",
+    "what did we finish yesterday",
+    "show me what carol is working on",
+    "which tickets are waiting for review"
+]
+
+def workload(requests: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    commands = []
+    for n in range(requests):
+        if rng.random() < 0.4:
+            commands.append(rng.choice(STRUCTURED).format(n=n % 50 + 1))
+        elif rng.random() < 0.5:
+            commands.append(rng.choice(FREE_FORM))
+        else:
+            commands.append(f"summarise where the team stands on item {n}")
+    return commands
+
+async def _run(name: str, commands: list, concurrency: int, provider: LocalLLMProvider) -> dict:
+    service = CommandService("bench-token")
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    requests_before = provider.requests
+
+    async def run_one(text: str):
+        async with semaphore:
+            started = time.perf_counter()
+            await service.parse_command(text, "WEB")
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_one(text) for text in commands))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "mode": name,
+        "throughput_rps": round(len(commands) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+        "llm_requests": provider.requests - requests_before
+    }
+
+async def main(args: argparse.Namespace):
+    provider = LocalLLMProvider(latency=args.llm_latency, tokens_per_second=args.tokens_per_second)
+    set_llm_provider(provider)
+    commands = workload(args.requests)
+    min_confidence = fast_parser.min_confidence
+    ttl = parse_cache.memory.ttl
+    results = []
+
+    # Each mode switches on one more layer of the pipeline
+    modes = [
+        ("llm-only", {"fast_path": False, "cache": False, "batch": False}),
+        ("fast-path", {"fast_path": True, "cache": False, "batch": False}),
+        ("fast-path+cache", {"fast_path": True, "cache": True, "batch": False}),
+        ("fast-path+cache+batch", {"fast_path": True, "cache": True, "batch": True})
+    ]
+    try:
+        for name, layers in modes:
+            fast_parser.min_confidence = min_confidence if layers["fast_path"] else 2.0
+            parse_cache.clear()
+            parse_cache.memory.ttl = ttl if layers["cache"] else 0
+            command_batcher.window = args.batch_window / 1000 if layers["batch"] else 0
+            results.append(await _run(name, commands, args.concurrency, provider))
+    finally:
+        fast_parser.min_confidence = min_confidence
+        parse_cache.memory.ttl = ttl
+        command_batcher.window = 0
+        set_llm_provider(None)
+
+    for result in results:
+        print(
+            f"{result['mode']:>22}: {result['throughput_rps']:>8} cmd/s  "
+            f"p50={result['p50_ms']}ms  p95={result['p95_ms']}ms  "
+            f"llm_requests={result['llm_requests']}"
+        )
+    print(f"batches: {command_batcher.stats()}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Simulated time to first token in seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=50, help="Simulated generation speed")
+    parser.add_argument("--batch-window", type=float, default=20, help="Micro-batch window in milliseconds")
+    asyncio.run(main(parser.parse_args()))
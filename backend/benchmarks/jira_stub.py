@@ -0,0 +1,313 @@
+"""
+Local stand-in for the Jira Cloud REST API.
+
+Serves the endpoints the backend uses (projects, paginated search, issues,
+comments, transitions, bulk create) from memory with configurable latency,
+page size and 429 injection, under both /rest/api/2 and /rest/api/3.
+
+Run standalone and point JIRA_SERVER_URL, JIRA_URL and JIRA_API_BASE_URL at it:
+    python -m backend.benchmarks.jira_stub --port 8081 --latency 0.05 --rate-limit 50
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, Dict, List, Optional
+from aiohttp import web
+
+class JiraStub:
+    """
+    In-memory Jira Cloud stand-in used by tests and benchmarks
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        project_count: int = 20,
+        issues_per_project: int = 250,
+        max_page_size: int = 100,
+        rate_limit: Optional[float] = None,
+        throttle_probability: float = 0.0,
+        retry_after: float = 1.0
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.project_count = project_count
+        self.max_page_size = max_page_size
+        self.rate_limit = rate_limit
+        self.throttle_probability = throttle_probability
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.throttled_count = 0
+        self.peers = set()
+        self._tokens = rate_limit or 0.0
+        self._tokens_updated_at = time.monotonic()
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+        self.projects = [
+            {"id": str(10000 + i), "key": f"PROJ{i}" if i else "PROJ", "name": f"Project {i}"}
+            for i in range(project_count)
+        ]
+        self.issues: Dict[str, Dict[str, Any]] = {}
+        self.comments: Dict[str, List[Dict[str, Any]]] = {}
+        for project in self.projects:
+            for n in range(1, issues_per_project + 1):
+                self._add_issue(project["key"], f"Issue {n}", key=f"{project['key']}-{n}")
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        api = "/rest/api/{version:[23]}"
+        app.router.add_get("/rest/api/2/serverInfo", self.server_info)
+        app.router.add_get("/rest/api/2/field", self.get_fields)
+        app.router.add_get(f"{api}/project", self.get_projects)
+        app.router.add_get(f"{api}/project/{{key}}", self.get_project)
+        app.router.add_get(f"{api}/search", self.search)
+        app.router.add_post(f"{api}/search", self.search)
+        app.router.add_get(f"{api}/search/jql", self.search)
+        app.router.add_post(f"{api}/issue", self.create_issue)
+        app.router.add_post(f"{api}/issue/bulk", self.bulk_create)
+        app.router.add_get(f"{api}/issue/{{key}}", self.get_issue)
+        app.router.add_put(f"{api}/issue/{{key}}", self.update_issue)
+        app.router.add_post(f"{api}/issue/{{key}}/comment", self.add_comment)
+        app.router.add_get(f"{api}/issue/{{key}}/transitions", self.get_transitions)
+        app.router.add_post(f"{api}/issue/{{key}}/transitions", self.do_transition)
+        return app
+
+    @property
+    def connection_count(self) -> int:
+        return len(self.peers)
+
+    def _throttle(self) -> bool:
+        if self.throttle_probability and random.random() < self.throttle_probability:
+            return True
+        if self.rate_limit:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._tokens_updated_at) * self.rate_limit)
+            self._tokens_updated_at = now
+            if self._tokens < 1:
+                return True
+            self._tokens -= 1
+        return False
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.request_count += 1
+        # Each distinct client address/port is one TCP connection
+        self.peers.add(request.transport.get_extra_info("peername"))
+        if self._throttle():
+            self.throttled_count += 1
+            return web.json_response(
+                {"errorMessages": ["Rate limit exceeded"]},
+                status=429,
+                headers={"Retry-After": str(self.retry_after)}
+            )
+        delay = self.latency + (random.uniform(-self.jitter, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return await handler(request)
+
+    def _base(self, request: web.Request) -> str:
+        return f"{request.scheme}://{request.host}/rest/api/{request.match_info.get('version', '3')}"
+
+    def _add_issue(self, project_key: str, summary: str, key: Optional[str] = None, **fields) -> Dict[str, Any]:
+        issue_id = str(20000 + len(self.issues))
+        key = key or f"{project_key}-{sum(1 for k in self.issues if k.startswith(project_key + '-')) + 1}"
+        issue = {
+            "id": issue_id,
+            "key": key,
+            "fields": {
+                "summary": summary,
+                "description": fields.get("description"),
+                "status": {"name": "To Do"},
+                "assignee": None,
+                "issuetype": {"name": "Task"},
+                "project": {"key": project_key}
+            }
+        }
+        self.issues[key] = issue
+        return issue
+
+    def _issue_ref(self, request: web.Request, issue: Dict[str, Any]) -> Dict[str, Any]:
+        return {"id": issue["id"], "key": issue["key"], "self": f"{self._base(request)}/issue/{issue['id']}"}
+
+    def _issue_or_404(self, request: web.Request) -> Dict[str, Any]:
+        issue = self.issues.get(request.match_info["key"])
+        if issue is None:
+            raise web.HTTPNotFound(
+                text='{"errorMessages": ["Issue does not exist"]}',
+                content_type="application/json"
+            )
+        return issue
+
+    async def server_info(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "baseUrl": f"{request.scheme}://{request.host}",
+            "version": "1001.0.0",
+            "versionNumbers": [1001, 0, 0],
+            "deploymentType": "Cloud"
+        })
+
+    async def get_fields(self, request: web.Request) -> web.Response:
+        return web.json_response([
+            {"id": name, "key": name, "name": name.title(), "custom": False}
+            for name in ("summary", "status", "assignee", "description", "issuetype", "project")
+        ])
+
+    async def get_projects(self, request: web.Request) -> web.Response:
+        return web.json_response([
+            {**project, "self": f"{self._base(request)}/project/{project['id']}"}
+            for project in self.projects
+        ])
+
+    async def get_project(self, request: web.Request) -> web.Response:
+        key = request.match_info["key"]
+        for project in self.projects:
+            if key in (project["key"], project["id"]):
+                return web.json_response({**project, "issueTypes": [{"id": "1", "name": "Task"}, {"id": "2", "name": "Bug"}]})
+        raise web.HTTPNotFound()
+
+    async def search(self, request: web.Request) -> web.Response:
+        params = dict(request.query)
+        if request.method == "POST":
+            params.update(await request.json())
+        jql = str(params.get("jql", ""))
+        fields = params.get("fields")
+        if isinstance(fields, str):
+            fields = fields.split(",")
+        max_results = min(int(params.get("maxResults", 50)), self.max_page_size)
+        token = params.get("nextPageToken")
+        start_at = int(token) if token else int(params.get("startAt", 0))
+
+        project_key = None
+        if "project" in jql and "=" in jql:
+            project_key = jql.split("=", 1)[1].split()[0].strip("\"'")
+        matches = [
+            issue for issue in self.issues.values()
+            if project_key is None or issue["fields"]["project"]["key"] == project_key
+        ]
+        page = matches[start_at:start_at + max_results]
+        issues = [
+            {
+                **self._issue_ref(request, issue),
+                "fields": {
+                    name: value for name, value in issue["fields"].items()
+                    if not fields or name in fields
+                }
+            }
+            for issue in page
+        ]
+        is_last = start_at + len(page) >= len(matches)
+        if request.path.endswith("/search/jql"):
+            response = {"issues": issues, "isLast": is_last}
+            if not is_last:
+                response["nextPageToken"] = str(start_at + len(page))
+            return web.json_response(response)
+        return web.json_response({
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(matches),
+            "issues": issues
+        })
+
+    async def create_issue(self, request: web.Request) -> web.Response:
+        fields = (await request.json()).get("fields", {})
+        issue = self._add_issue(fields.get("project", {}).get("key", "PROJ"), fields.get("summary") or "")
+        return web.json_response(self._issue_ref(request, issue), status=201)
+
+    async def bulk_create(self, request: web.Request) -> web.Response:
+        updates = (await request.json()).get("issueUpdates", [])
+        if len(updates) > 50:
+            return web.json_response({"errorMessages": ["Bulk create is limited to 50 issues"]}, status=400)
+        issues = []
+        errors = []
+        for index, update in enumerate(updates):
+            fields = update.get("fields", {})
+            if not fields.get("summary"):
+                errors.append({
+                    "status": 400,
+                    "failedElementNumber": index,
+                    "elementErrors": {"errorMessages": [], "errors": {"summary": "You must specify a summary of the issue."}}
+                })
+                continue
+            issue = self._add_issue(fields.get("project", {}).get("key", "PROJ"), fields["summary"])
+            issues.append(self._issue_ref(request, issue))
+        return web.json_response({"issues": issues, "errors": errors}, status=201 if issues else 400)
+
+    async def get_issue(self, request: web.Request) -> web.Response:
+        issue = self._issue_or_404(request)
+        return web.json_response({**self._issue_ref(request, issue), "fields": issue["fields"]})
+
+    async def update_issue(self, request: web.Request) -> web.Response:
+        issue = self._issue_or_404(request)
+        issue["fields"].update((await request.json()).get("fields", {}))
+        return web.Response(status=204)
+
+    async def add_comment(self, request: web.Request) -> web.Response:
+        issue = self._issue_or_404(request)
+        body = await request.json()
+        comments = self.comments.setdefault(issue["key"], [])
+        comment = {
+            "id": str(30000 + len(comments)),
+            "body": body.get("body"),
+            "created": "2024-01-01T00:00:00.000+0000",
+            "self": f"{self._base(request)}/issue/{issue['id']}/comment/{len(comments)}"
+        }
+        comments.append(comment)
+        return web.json_response(comment, status=201)
+
+    async def get_transitions(self, request: web.Request) -> web.Response:
+        self._issue_or_404(request)
+        return web.json_response({"transitions": [
+            {"id": "11", "name": "To Do", "to": {"name": "To Do"}},
+            {"id": "21", "name": "In Progress", "to": {"name": "In Progress"}},
+            {"id": "31", "name": "Done", "to": {"name": "Done"}}
+        ]})
+
+    async def do_transition(self, request: web.Request) -> web.Response:
+        issue = self._issue_or_404(request)
+        transition_id = (await request.json()).get("transition", {}).get("id")
+        names = {"11": "To Do", "21": "In Progress", "31": "Done"}
+        issue["fields"]["status"] = {"name": names.get(transition_id, "To Do")}
+        return web.Response(status=204)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Start the stub server and return its base URL
+        """
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-request latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform latency jitter in seconds")
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--issues-per-project", type=int, default=250)
+    parser.add_argument("--max-page-size", type=int, default=100)
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second before 429s")
+    parser.add_argument("--throttle-probability", type=float, default=0.0, help="Chance of a random 429")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    args = parser.parse_args()
+    stub = JiraStub(
+        latency=args.latency,
+        jitter=args.jitter,
+        project_count=args.projects,
+        issues_per_project=args.issues_per_project,
+        max_page_size=args.max_page_size,
+        rate_limit=args.rate_limit,
+        throttle_probability=args.throttle_probability,
+        retry_after=args.retry_after
+    )
+    web.run_app(stub.build_app(), port=args.port)
@@ -0,0 +1,147 @@
+"""
+Fixed-concurrency load benchmark for the backend API.
+
+Start the Jira stand-in and a backend pointed at it, then drive the API
+from the repository root:
+    python -m backend.benchmarks.jira_stub --port 8081 --latency 0.05 &
+    JIRA_SERVER_URL=http://127.0.0.1:8081 JIRA_EMAIL=bench@example.com JIRA_API_TOKEN=bench \\
+        uvicorn backend.main:app --port 8000 &
+    python -m backend.benchmarks.load_test --base-url http://127.0.0.1:8000 --concurrency 20
+
+Every scenario goes through /api/execute-action, which uses the shared
+Jira client built from those variables. The /api/jira/* routes look up a
+per-user Jira connection in Supabase, so the stand-in cannot serve them.
+
+Results (p50/p95/p99 latency, throughput, error counts) are printed and saved
+as JSON tagged with the current commit so runs can be compared.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import aiohttp
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "execute-action": {
+        "method": "POST",
+        "path": "/api/execute-action",
+        "json": {"action_type": "comment", "issue_key": "PROJ-1", "comment": "Load test comment"}
+    },
+    "update": {
+        "method": "POST",
+        "path": "/api/execute-action",
+        "json": {"action_type": "update", "issue_key": "PROJ-2", "fields": {"status": "In Progress"}}
+    },
+    "tasks": {
+        "method": "POST",
+        "path": "/api/execute-action",
+        "json": {"action_type": "search", "jql": "project = PROJ AND issuetype = Task"}
+    },
+    "search": {
+        "method": "POST",
+        "path": "/api/execute-action",
+        "json": {"action_type": "search", "jql": "project = PROJ"}
+    }
+}
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+async def run_scenario(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    name: str,
+    requests: int,
+    concurrency: int,
+    headers: Dict[str, str]
+) -> Dict[str, Any]:
+    scenario = SCENARIOS[name]
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                async with session.request(
+                    scenario["method"],
+                    f"{base_url}{scenario['path']}",
+                    json=scenario.get("json"),
+                    headers=headers
+                ) as response:
+                    # Drain streamed bodies so latency covers the full response
+                    async for _ in response.content.iter_chunked(65536):
+                        pass
+                    status = str(response.status)
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "scenario": name,
+        "requests": requests,
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "statuses": statuses
+    }
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def main(args: argparse.Namespace):
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    results = []
+    async with aiohttp.ClientSession(connector=connector) as session:
+        for name in args.scenarios:
+            result = await run_scenario(session, args.base_url, name, args.requests, args.concurrency, headers)
+            results.append(result)
+            print(
+                f"{name:>15}: {result['throughput_rps']:>8} req/s  p50={result['p50_ms']}ms  "
+                f"p95={result['p95_ms']}ms  p99={result['p99_ms']}ms  statuses={result['statuses']}"
+            )
+
+    report = {
+        "commit": current_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "base_url": args.base_url,
+        "results": results
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved results to {args.output}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", default=os.getenv("BENCH_TOKEN"), help="Bearer token for authenticated routes")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument(
+        "--output",
+        default=f"bench-results/load-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    asyncio.run(main(parser.parse_args()))
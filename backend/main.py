@@ -1,25 +1,43 @@
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File
+from fastapi import FastAPI, Depends, HTTPException, Request, status, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 import os
 from dotenv import load_dotenv
 import uvicorn
+from contextlib import asynccontextmanager
 from typing import Optional, List
 from .services.transcription_service import TranscriptionService
 from .services.command_parser import CommandParser, JiraAction
 from .services.jira_client import JiraClient
+from .services.client_registry import client_registry, use_client, optional_client
+from .services.jira_executor import shutdown_executors
+from .services.etag import etag_response
+from .services.audio_upload import UploadTooLarge
+from .services.transcription_jobs import transcription_jobs
 
 # Load environment variables
 load_dotenv()
 
 # Import routers
-from routes import auth, transcription, commands, jira
+from .routes import auth, transcription, jira
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build every upstream client and open and prewarm their connection pools once per worker
+    await client_registry.start()
+    # Background transcription workers resume jobs left unfinished by the last run
+    await transcription_jobs.start()
+    yield
+    await transcription_jobs.close()
+    await client_registry.close()
+    shutdown_executors()
 
 app = FastAPI(
     title="Jira Voice Assistant API",
     description="API for the Jira Voice Assistant application",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -34,15 +52,9 @@ app.add_middleware(
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# Initialize services
-transcription_service = TranscriptionService()
-command_parser = CommandParser()
-jira_client = JiraClient()
-
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(transcription.router, prefix="/api/transcribe", tags=["Transcription"])
-app.include_router(commands.router, prefix="/api/commands", tags=["Commands"])
 app.include_router(jira.router, prefix="/api/jira", tags=["Jira"])
 
 @app.get("/")
@@ -53,37 +65,51 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/api/client-stats")
+async def get_client_stats():
+    """
+    Get which upstream clients are ready and their connection pool statistics
+    """
+    return client_registry.stats()
+
 @app.post("/api/transcribe")
 async def transcribe_audio(
     file: UploadFile = File(...),
-    language: Optional[str] = "en-US"
+    language: Optional[str] = "en-US",
+    transcription_service: TranscriptionService = Depends(use_client("deepgram"))
 ):
     """
     Transcribe uploaded audio file
     """
     try:
-        audio_data = await file.read()
-        transcript = await transcription_service.transcribe_audio(audio_data, language)
+        transcript = await transcription_service.transcribe_upload(file, language)
         return {"transcript": transcript}
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/parse-command")
 async def parse_command(
     transcript: str,
-    project_key: Optional[str] = None
+    project_key: Optional[str] = None,
+    command_parser: CommandParser = Depends(use_client("command_parser")),
+    jira_client: Optional[JiraClient] = Depends(optional_client("jira"))
 ):
     """
     Parse transcribed text into Jira action
     """
     try:
+        # Warm the Jira data /api/execute-action will need while the LLM parses
+        if jira_client is not None:
+            jira_client.prefetch(transcript, project_key)
         action = await command_parser.parse_command(transcript, project_key)
         return action.dict()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/execute-action")
-async def execute_action(action: JiraAction):
+async def execute_action(action: JiraAction, jira_client: JiraClient = Depends(use_client("jira"))):
     """
     Execute parsed Jira action
     """
@@ -93,23 +119,36 @@ async def execute_action(action: JiraAction):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/execute-actions")
+async def execute_actions(actions: List[JiraAction], jira_client: JiraClient = Depends(use_client("jira"))):
+    """
+    Execute many parsed Jira actions, bulk-creating issues where possible
+    """
+    try:
+        results = await jira_client.execute_actions(actions)
+        return {"results": results}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/jira/projects")
-async def get_projects():
+async def get_projects(request: Request, jira_client: JiraClient = Depends(use_client("jira"))):
     """
-    Get list of accessible Jira projects
+    Get list of accessible Jira projects, honouring If-None-Match
     """
     try:
-        projects = await jira_client.list_projects()
-        return projects
+        projects = await jira_client.get_projects()
+        return etag_response(request, projects)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/supported-languages")
-async def get_supported_languages():
+async def get_supported_languages(
+    transcription_service: TranscriptionService = Depends(use_client("deepgram"))
+):
     """
     Get list of supported languages for transcription
     """
     return transcription_service.get_supported_languages()
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    uvicorn.run("backend.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
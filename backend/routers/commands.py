@@ -1,7 +1,11 @@
 from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Optional
 from pydantic import BaseModel
-from ..services.command_service import CommandService
+from ..services.command_service import CommandService, command_batcher, command_cascade
+from ..services.fast_parser import fast_parser
+from ..services.parse_cache import parse_cache
+from ..services.prompt_compiler import token_usage
+from ..services.streaming import sse_response
 from ..auth.jwt_bearer import JWTBearer
 
 router = APIRouter()
@@ -43,6 +47,19 @@ async def parse_command(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/stats")
+async def get_parse_stats(token: str = Depends(jwt_bearer)):
+    """
+    Get command parser statistics: fast-path and result cache hit rates and LLM token usage
+    """
+    return {
+        "fast_path": fast_parser.stats(),
+        "result_cache": parse_cache.stats(),
+        "token_usage": token_usage.stats(),
+        "micro_batch": command_batcher.stats(),
+        "cascade": command_cascade.stats()
+    }
+
 @router.post("/execute")
 async def execute_command(
     command: CommandResponse,
@@ -58,6 +75,21 @@ async def execute_command(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/execute/batch")
+async def execute_commands(
+    commands: List[CommandResponse],
+    token: str = Depends(jwt_bearer)
+):
+    """
+    Execute many parsed commands, bulk-creating issues where possible
+    """
+    try:
+        command_service = CommandService(token)
+        results = await command_service.execute_commands(commands)
+        return {"results": results}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/parse/transcript", response_model=TranscriptParseResponse)
 async def parse_transcript(
     request: TranscriptParseRequest,
@@ -74,4 +106,21 @@ async def parse_transcript(
         )
         return result
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/parse/transcript/stream")
+async def stream_transcript(
+    request: TranscriptParseRequest,
+    token: str = Depends(jwt_bearer)
+):
+    """
+    Parse a Teams meeting transcript, streaming each action as a Server-Sent Event
+    """
+    try:
+        command_service = CommandService(token)
+        return await sse_response(
+            command_service.stream_transcript(request.transcript, request.project_key),
+            event="action"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import List, Optional
 from pydantic import BaseModel
 from ..services.jira_service import JiraService
+from ..services.streaming import ndjson_response
+from ..services.etag import etag_response
 from ..auth.jwt_bearer import JWTBearer
 
 router = APIRouter()
@@ -26,27 +28,26 @@ class Comment(BaseModel):
     task_id: str
 
 @router.get("/projects", response_model=List[Project])
-async def get_projects(token: str = Depends(jwt_bearer)):
-    """Get list of Jira projects the user has access to"""
+async def get_projects(request: Request, token: str = Depends(jwt_bearer)):
+    """Get list of Jira projects the user has access to, honouring If-None-Match"""
     try:
         jira_service = JiraService(token)
         projects = await jira_service.get_projects()
-        return projects
+        return etag_response(request, projects)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/tasks", response_model=List[Task])
+@router.get("/tasks")
 async def get_tasks(
     project_key: str,
     status: Optional[str] = None,
     assignee: Optional[str] = None,
     token: str = Depends(jwt_bearer)
 ):
-    """Get tasks from a specific project with optional filters"""
+    """Stream tasks from a specific project as NDJSON with optional filters"""
     try:
         jira_service = JiraService(token)
-        tasks = await jira_service.get_tasks(project_key, status, assignee)
-        return tasks
+        return await ndjson_response(jira_service.iter_tasks(project_key, status, assignee))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
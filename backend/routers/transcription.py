@@ -2,6 +2,8 @@ from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
 from typing import Optional
 from pydantic import BaseModel
 from ..services.transcription_service import TranscriptionService
+from ..services.audio_upload import UploadTooLarge
+from ..services.client_registry import use_client
 from ..auth.jwt_bearer import JWTBearer
 
 router = APIRouter()
@@ -16,7 +18,8 @@ class TranscriptionResponse(BaseModel):
 async def transcribe_audio(
     file: UploadFile = File(...),
     language: Optional[str] = "en",
-    token: str = Depends(jwt_bearer)
+    token: str = Depends(jwt_bearer),
+    transcription_service: TranscriptionService = Depends(use_client("deepgram"))
 ):
     """
     Transcribe audio file using Deepgram
@@ -28,9 +31,10 @@ async def transcribe_audio(
                 detail="File must be an audio file"
             )
 
-        transcription_service = TranscriptionService()
         result = await transcription_service.transcribe(file, language)
         return result
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -38,14 +42,14 @@ async def transcribe_audio(
 async def transcribe_stream(
     audio_chunk: bytes,
     language: Optional[str] = "en",
-    token: str = Depends(jwt_bearer)
+    token: str = Depends(jwt_bearer),
+    transcription_service: TranscriptionService = Depends(use_client("deepgram"))
 ):
     """
-    Transcribe streaming audio data
+    Transcribe a single chunk of audio; use the /api/transcribe/live WebSocket for continuous streaming
     """
     try:
-        transcription_service = TranscriptionService()
         result = await transcription_service.transcribe_stream(audio_chunk, language)
         return result
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -4,7 +4,9 @@ from pydantic import BaseModel
 from typing import Optional
 import os
 import requests
-from services.supabase import get_supabase_client
+from supabase import Client
+from ..services.client_registry import use_client
+from ..services.jira_client_cache import jira_client_cache
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -16,9 +18,6 @@ JIRA_REDIRECT_URI = "http://localhost:8000/api/auth/callback"
 JIRA_AUTH_URL = "https://auth.atlassian.com/authorize"
 JIRA_TOKEN_URL = "https://auth.atlassian.com/oauth/token"
 
-# Supabase client
-supabase = get_supabase_client()
-
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -37,7 +36,7 @@ async def login():
     return {"auth_url": auth_url}
 
 @router.get("/callback")
-async def callback(code: str):
+async def callback(code: str, supabase: Client = Depends(use_client("supabase"))):
     """
     Handle the OAuth callback from Jira
     """
@@ -99,6 +98,8 @@ async def callback(code: str):
             "refresh_token": token_data.get("refresh_token"),
             "expires_in": token_data.get("expires_in")
         }).execute()
+        # Cached Jira clients still hold the previous access token
+        jira_client_cache.invalidate_user(user_id)
         
         # Generate session token
         session_token = supabase.auth.sign_in_with_password({
@@ -123,7 +124,10 @@ async def callback(code: str):
         )
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login_for_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    supabase: Client = Depends(use_client("supabase"))
+):
     """
     OAuth2 compatible token login
     """
@@ -153,8 +157,38 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
             detail=f"Authentication error: {str(e)}"
         )
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    supabase: Client = Depends(use_client("supabase"))
+):
+    """
+    End the Supabase session and drop the user's cached Jira clients
+    """
+    try:
+        user = supabase.auth.get_user(token)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    try:
+        supabase.auth.admin.sign_out(token)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Logout error: {str(e)}"
+        )
+    finally:
+        jira_client_cache.invalidate_user(user.user.id)
+
 @router.get("/me", response_model=User)
-async def read_users_me(token: str = Depends(oauth2_scheme)):
+async def read_users_me(
+    token: str = Depends(oauth2_scheme),
+    supabase: Client = Depends(use_client("supabase"))
+):
     """
     Get current user information
     """
@@ -1,9 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from typing import List, Optional
+from typing import Any, List, Optional
 import os
+import asyncio
 from jira import JIRA
-from services.supabase import get_supabase_client
+from ..services.supabase import current_user, get_supabase_client
+from ..services.jira_executor import run_blocking
+from ..services.jira_search import SEARCH_FIELDS, paginate_issues, summarize_issue
+from ..services.streaming import ndjson_response
+from ..services.etag import etag_response
+from ..services.project_cache import get_cached_projects
+from ..services.jira_client_cache import jira_client_cache
+from ..services.jira_scheduler import jira_scheduler
+from ..services.issue_cache import invalidate_issue
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -13,16 +22,24 @@ JIRA_URL = os.getenv("JIRA_URL")
 JIRA_EMAIL = os.getenv("JIRA_EMAIL")
 JIRA_API_TOKEN = os.getenv("JIRA_API_TOKEN")
 
-def get_jira_client(token: str):
+def get_jira_client(token: str, user_id: str):
     """
-    Get authenticated Jira client using user's OAuth token
+    Get authenticated Jira client for a verified user, reusing a cached client when possible.
+    
+    This only talks to Supabase, so callers run it with asyncio.to_thread rather
+    than through the Jira scheduler.
     """
+    cached_client = jira_client_cache.get(token)
+    if cached_client is not None:
+        return cached_client
+    
     try:
         supabase = get_supabase_client()
-        user = supabase.auth.get_user(token)
         
         # Get user's Jira tokens from Supabase
-        user_data = supabase.table("users").select("jira_access_token").eq("id", user.id).single().execute()
+        user_data = supabase.table("users").select(
+            "jira_access_token, jira_refresh_token, jira_token_expires_at"
+        ).eq("id", user_id).single().execute()
         
         if not user_data.data or not user_data.data.get("jira_access_token"):
             raise HTTPException(
@@ -31,30 +48,55 @@ def get_jira_client(token: str):
             )
         
         # Initialize Jira client with user's OAuth token
-        return JIRA(
+        client = JIRA(
             server=JIRA_URL,
             oauth={
                 'access_token': user_data.data["jira_access_token"],
                 'access_token_secret': user_data.data.get("jira_refresh_token"),
                 'consumer_key': os.getenv("JIRA_CLIENT_ID"),
                 'key_cert': None
-            }
+            },
+            max_retries=0
         )
+        jira_client_cache.put(token, user_id, client, user_data.data.get("jira_token_expires_at"))
+        return client
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to initialize Jira client: {str(e)}"
         )
 
+@router.get("/client-cache/stats")
+async def get_client_cache_stats(user: Any = Depends(current_user)):
+    """
+    Get hit-rate statistics for the authenticated Jira client cache
+    """
+    return jira_client_cache.stats()
+
+@router.get("/scheduler/stats")
+async def get_scheduler_stats(user: Any = Depends(current_user)):
+    """
+    Get queue depth, wait time and throttling metrics for outbound Jira requests
+    """
+    return jira_scheduler.stats()
+
 @router.get("/projects")
-async def get_projects(token: str = Depends(oauth2_scheme)):
+async def get_projects(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    user: Any = Depends(current_user)
+):
     """
-    Get list of accessible Jira projects
+    Get list of accessible Jira projects, honouring If-None-Match
     """
     try:
-        jira = get_jira_client(token)
-        projects = jira.projects()
-        return [{"key": p.key, "name": p.name, "description": p.description} for p in projects]
+        async def load_projects():
+            jira = await asyncio.to_thread(get_jira_client, token, user.id)
+            projects = await run_blocking(JIRA_URL, jira.projects)
+            return [{"key": p.key, "name": p.name, "description": p.description} for p in projects]
+        
+        projects = await get_cached_projects(JIRA_URL, token, load_projects)
+        return etag_response(request, projects)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -68,13 +110,14 @@ async def create_issue(
     project_key: str,
     issue_type: str = "Task",
     assignee: Optional[str] = None,
-    token: str = Depends(oauth2_scheme)
+    token: str = Depends(oauth2_scheme),
+    user: Any = Depends(current_user)
 ):
     """
     Create a new Jira issue
     """
     try:
-        jira = get_jira_client(token)
+        jira = await asyncio.to_thread(get_jira_client, token, user.id)
         
         issue_dict = {
             'project': {'key': project_key},
@@ -86,7 +129,7 @@ async def create_issue(
         if assignee:
             issue_dict['assignee'] = {'name': assignee}
         
-        new_issue = jira.create_issue(fields=issue_dict)
+        new_issue = await run_blocking(JIRA_URL, jira.create_issue, fields=issue_dict)
         
         return {
             "key": new_issue.key,
@@ -103,15 +146,17 @@ async def create_issue(
 async def add_comment(
     issue_key: str,
     comment: str,
-    token: str = Depends(oauth2_scheme)
+    token: str = Depends(oauth2_scheme),
+    user: Any = Depends(current_user)
 ):
     """
     Add a comment to an existing Jira issue
     """
     try:
-        jira = get_jira_client(token)
-        issue = jira.issue(issue_key)
-        new_comment = jira.add_comment(issue, comment)
+        jira = await asyncio.to_thread(get_jira_client, token, user.id)
+        # Post the comment by key without fetching the issue first
+        new_comment = await run_blocking(JIRA_URL, jira.add_comment, issue_key, comment)
+        invalidate_issue(JIRA_URL, issue_key)
         
         return {
             "id": new_comment.id,
@@ -127,21 +172,31 @@ async def add_comment(
 @router.get("/search")
 async def search_issues(
     jql: str,
-    token: str = Depends(oauth2_scheme)
+    token: str = Depends(oauth2_scheme),
+    user: Any = Depends(current_user)
 ):
     """
-    Search for issues using JQL
+    Search for issues using JQL, streaming results as NDJSON
     """
     try:
-        jira = get_jira_client(token)
-        issues = jira.search_issues(jql)
+        jira = await asyncio.to_thread(get_jira_client, token, user.id)
+        
+        async def fetch_page(start_at, next_page_token, max_results):
+            return await run_blocking(
+                JIRA_URL,
+                jira.search_issues,
+                jql,
+                startAt=start_at,
+                maxResults=max_results,
+                fields=SEARCH_FIELDS,
+                json_result=True
+            )
+        
+        async def issues():
+            async for issue in paginate_issues(fetch_page):
+                yield summarize_issue(issue)
         
-        return [{
-            "key": issue.key,
-            "summary": issue.fields.summary,
-            "status": issue.fields.status.name,
-            "assignee": issue.fields.assignee.displayName if issue.fields.assignee else None
-        } for issue in issues]
+        return await ndjson_response(issues())
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
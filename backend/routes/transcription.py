@@ -1,21 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect, status, UploadFile, File
 from fastapi.security import OAuth2PasswordBearer
+from typing import Any, Optional
 import os
+import json
 import asyncio
-from deepgram import Deepgram
-from services.supabase import get_supabase_client
+from ..services.supabase import current_user, get_supabase_client, get_user
+from ..services.audio_upload import MAX_UPLOAD_BYTES, UploadTooLarge, limit_stream
+from ..services.transcription_service import TranscriptionService
+from ..services.client_registry import ClientUnavailable, client_registry, use_client
+from ..services.live_transcription import relay_live_transcription
+from ..services.audio_preprocess import preprocess_stats
+from ..services.transcription_cache import transcription_cache
+from ..services.transcription_jobs import JobQueueFull, transcription_jobs
+from ..services.streaming import sse_response
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# Initialize Deepgram client
-DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY")
-deepgram = Deepgram(DEEPGRAM_API_KEY)
-
 @router.post("/transcribe")
 async def transcribe_audio(
     file: UploadFile = File(...),
-    token: str = Depends(oauth2_scheme)
+    token: str = Depends(oauth2_scheme),
+    transcription_service: TranscriptionService = Depends(use_client("deepgram"))
 ):
     """
     Transcribe audio file using Deepgram
@@ -25,34 +31,193 @@ async def transcribe_audio(
         supabase = get_supabase_client()
         user = supabase.auth.get_user(token)
         
-        # Read audio file
-        audio_data = await file.read()
+        # Streamed to Deepgram in chunks through the shared client, reusing cached transcripts
+        result = await transcription_service.transcribe_upload(file, "en-US")
         
-        # Configure transcription options
-        source = {"buffer": audio_data, "mimetype": file.content_type}
-        options = {
-            "smart_format": True,
-            "model": "nova",
-            "language": "en-US"
+        return {
+            "transcript": result["transcript"],
+            "confidence": result["confidence"]
         }
-        
-        # Send to Deepgram for transcription
-        response = await deepgram.transcription.prerecorded(source, options)
-        
-        # Extract transcription text
-        transcript = response["results"]["channels"][0]["alternatives"][0]["transcript"]
+    
+    except UploadTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Transcription error: {str(e)}"
+        )
+
+@router.post("/audio/raw")
+async def transcribe_raw_audio(
+    request: Request,
+    language: Optional[str] = "en-US",
+    user: Any = Depends(current_user),
+    transcription_service: TranscriptionService = Depends(use_client("deepgram"))
+):
+    """
+    Transcribe audio sent as the raw request body.
+    
+    Unlike multipart uploads, which are spooled before the handler runs, the
+    body is piped to Deepgram as it arrives.
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("audio/"):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Body must be audio"
+        )
+    if int(request.headers.get("content-length") or 0) > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(UploadTooLarge(MAX_UPLOAD_BYTES))
+        )
+    
+    try:
+        result = await transcription_service.transcribe_chunks(limit_stream(request.stream()), content_type, language)
         
         return {
-            "transcript": transcript,
-            "confidence": response["results"]["channels"][0]["alternatives"][0]["confidence"]
+            "transcript": result["transcript"],
+            "confidence": result["confidence"]
         }
     
+    except UploadTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Transcription error: {str(e)}"
+        )
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_transcription_job(
+    file: UploadFile = File(...),
+    language: Optional[str] = "en-US",
+    user: Any = Depends(current_user)
+):
+    """
+    Queue an audio file for background transcription and return the job at once.
+    
+    Poll GET /jobs/{job_id} or subscribe to GET /jobs/{job_id}/events for the result.
+    """
+    if not file.content_type or not file.content_type.startswith("audio/"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be an audio file"
+        )
+    try:
+        return await transcription_jobs.submit_upload(file, language)
+    except UploadTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "30"}
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Transcription error: {str(e)}"
         )
 
+@router.get("/jobs/{job_id}")
+async def get_transcription_job(job_id: str, user: Any = Depends(current_user)):
+    """
+    Get a transcription job's status, and its result once completed
+    """
+    job = transcription_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transcription job not found"
+        )
+    return job
+
+@router.get("/jobs/{job_id}/events")
+async def watch_transcription_job(job_id: str, user: Any = Depends(current_user)):
+    """
+    Stream a transcription job's status changes as Server-Sent Events until it finishes
+    """
+    if transcription_jobs.get(job_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transcription job not found"
+        )
+    return await sse_response(transcription_jobs.watch(job_id), event="job")
+
+@router.get("/stats")
+async def get_transcription_stats(user: Any = Depends(current_user)):
+    """
+    Get transcription cache hit rates, audio preprocessing savings and background job counts
+    """
+    return {
+        "cache": transcription_cache.stats(),
+        "preprocess": preprocess_stats.stats(),
+        "jobs": transcription_jobs.stats()
+    }
+
+@router.websocket("/live")
+async def transcribe_live(
+    websocket: WebSocket,
+    language: Optional[str] = "en-US",
+    encoding: Optional[str] = None,
+    sample_rate: Optional[int] = None,
+    channels: Optional[int] = None,
+    token: Optional[str] = None
+):
+    """
+    Stream audio over a WebSocket and receive interim and final transcripts.
+    
+    Binary messages are audio frames; a text message {"type": "CloseStream"}
+    ends the audio. Browsers cannot set headers on WebSockets, so the bearer
+    token is passed as a query parameter.
+    """
+    try:
+        user = await get_user(token) if token else None
+    except ClientUnavailable:
+        user = None
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    
+    async def receive_audio() -> Optional[bytes]:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes") is not None:
+                # An empty frame also ends the audio
+                return message["bytes"] or None
+            try:
+                if json.loads(message.get("text") or "{}").get("type") == "CloseStream":
+                    return None
+            except (ValueError, AttributeError):
+                pass
+    
+    try:
+        transcription_service = client_registry.get("deepgram")
+        session = transcription_service.live_session(language, encoding, sample_rate, channels)
+        await session.connect()
+        summary = await relay_live_transcription(session, receive_audio, websocket.send_json)
+        await websocket.send_json({"type": "closed", **summary})
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+
 @router.post("/parse-teams-transcript")
 async def parse_teams_transcript(
     transcript: str,
@@ -0,0 +1,450 @@
+import os
+import time
+import struct
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple, Union
+import numpy as np
+
+AUDIO_PREPROCESS = os.getenv("AUDIO_PREPROCESS", "false").lower() == "true"
+TARGET_SAMPLE_RATE = int(os.getenv("AUDIO_TARGET_SAMPLE_RATE", "16000"))
+# Frames quieter than the threshold, or than the noise floor plus the margin, count as silence
+VAD_FRAME_MS = 20
+VAD_THRESHOLD_DB = float(os.getenv("AUDIO_VAD_THRESHOLD_DB", "-45"))
+VAD_MARGIN_DB = float(os.getenv("AUDIO_VAD_MARGIN_DB", "12"))
+# Cap on the tracked noise floor, so a recording that opens mid-sentence is not mistaken for noise
+VAD_MAX_NOISE_DB = float(os.getenv("AUDIO_VAD_MAX_NOISE_DB", "-50"))
+# Silence kept around speech, and the longest pause left in place
+VAD_PAD_MS = int(os.getenv("AUDIO_VAD_PAD_MS", "200"))
+MAX_PAUSE_MS = int(os.getenv("AUDIO_MAX_PAUSE_MS", "600"))
+# Bytes buffered while looking for the WAV header
+MAX_HEADER_BYTES = 64 * 1024
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+FIR_TAPS = 63
+
+class UnsupportedAudio(ValueError):
+    """
+    Audio the preprocessor cannot decode, such as compressed formats
+    """
+
+@dataclass
+class WavFormat:
+    audio_format: int
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+
+    @property
+    def frame_bytes(self) -> int:
+        return self.channels * self.bits_per_sample // 8
+
+def parse_wav_header(data: bytes) -> Optional[Tuple[WavFormat, int]]:
+    """
+    Find the format and the offset of the sample data in the start of a WAV file.
+
+    Returns None until enough bytes have arrived; raises UnsupportedAudio for
+    anything that is not PCM or float WAV.
+    """
+    if len(data) < 12:
+        return None
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise UnsupportedAudio("Not a WAV file")
+
+    offset = 12
+    wav_format = None
+    while offset + 8 <= len(data):
+        chunk_id, chunk_size = struct.unpack("<4sI", data[offset:offset + 8])
+        if chunk_id == b"data":
+            if wav_format is None:
+                raise UnsupportedAudio("WAV data before format chunk")
+            return wav_format, offset + 8
+        if offset + 8 + chunk_size > len(data):
+            return None
+        if chunk_id == b"fmt ":
+            audio_format, channels, sample_rate, _, _, bits = struct.unpack("<HHIIHH", data[offset + 8:offset + 24])
+            if audio_format == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+                # The real format is the first two bytes of the sub-format GUID
+                audio_format = struct.unpack("<H", data[offset + 32:offset + 34])[0]
+            supported = (
+                (audio_format == WAVE_FORMAT_PCM and bits in (8, 16, 24, 32))
+                or (audio_format == WAVE_FORMAT_FLOAT and bits in (32, 64))
+            )
+            if not supported or channels < 1:
+                raise UnsupportedAudio(f"Unsupported WAV encoding: format {audio_format}, {bits} bits")
+            wav_format = WavFormat(audio_format, channels, sample_rate, bits)
+        # Chunks are padded to an even size
+        offset += 8 + chunk_size + (chunk_size & 1)
+    return None
+
+def decode_frames(data: bytes, wav_format: WavFormat) -> np.ndarray:
+    """
+    Decode interleaved WAV samples to float32 in [-1, 1], shaped (frames, channels)
+    """
+    bits = wav_format.bits_per_sample
+    if wav_format.audio_format == WAVE_FORMAT_FLOAT:
+        samples = np.frombuffer(data, dtype="<f4" if bits == 32 else "<f8").astype(np.float32)
+    elif bits == 8:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif bits == 16:
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768
+    elif bits == 24:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        samples = values.astype(np.float32) / 8388608
+    else:
+        samples = np.frombuffer(data, dtype="<i4").astype(np.float32) / 2147483648
+    return samples.reshape(-1, wav_format.channels)
+
+def encode_linear16(samples: np.ndarray) -> bytes:
+    """
+    Encode float samples as little-endian 16-bit PCM
+    """
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+def encode_wav(pcm: bytes, sample_rate: int, channels: int = 1) -> bytes:
+    """
+    Wrap 16-bit PCM in a WAV header
+    """
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(pcm), b"WAVE",
+        b"fmt ", 16, WAVE_FORMAT_PCM, channels, sample_rate, sample_rate * channels * 2, channels * 2, 16,
+        b"data", len(pcm)
+    )
+    return header + pcm
+
+def lowpass_filter(cutoff: float, taps: int = FIR_TAPS) -> np.ndarray:
+    """
+    Windowed-sinc low-pass FIR; `cutoff` is in cycles per sample
+    """
+    n = np.arange(taps) - (taps - 1) / 2
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return (h / h.sum()).astype(np.float32)
+
+class Resampler:
+    """
+    Streaming resampler: anti-alias low-pass, then linear interpolation.
+
+    Filter history and the fractional read position carry across blocks, so
+    feeding audio in any block sizes gives the same output.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int):
+        self.source_rate = source_rate
+        self.target_rate = target_rate
+        self.step = source_rate / target_rate
+        self.filter = lowpass_filter(0.45 * target_rate / source_rate) if target_rate < source_rate else None
+        self._history = np.zeros(FIR_TAPS - 1 if self.filter is not None else 0, dtype=np.float32)
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._position = 0.0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        if self.source_rate == self.target_rate:
+            return samples
+        if self.filter is not None:
+            padded = np.concatenate([self._history, samples])
+            self._history = padded[len(padded) - len(self._history):]
+            samples = np.convolve(padded, self.filter, mode="valid").astype(np.float32)
+
+        buffered = np.concatenate([self._tail, samples])
+        last = len(buffered) - 1
+        if last < self._position:
+            self._tail = buffered
+            return np.zeros(0, dtype=np.float32)
+        count = int((last - self._position) // self.step) + 1
+        positions = self._position + self.step * np.arange(count)
+        output = np.interp(positions, np.arange(len(buffered)), buffered).astype(np.float32)
+        # Keep the last sample so the next block can interpolate across the boundary
+        self._position = positions[-1] + self.step - last
+        self._tail = buffered[-1:]
+        return output
+
+    def flush(self) -> np.ndarray:
+        """
+        Push the filter delay out with trailing zeros
+        """
+        if self.filter is None:
+            return np.zeros(0, dtype=np.float32)
+        return self.process(np.zeros((FIR_TAPS - 1) // 2, dtype=np.float32))
+
+class SilenceTrimmer:
+    """
+    Streaming energy-based VAD that drops leading and trailing silence and shortens long pauses.
+
+    Frame energies are computed a block at a time. The noise floor tracks the
+    quietest frames seen, so a steady hiss is treated as silence too.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frame_ms: int = VAD_FRAME_MS,
+        threshold_db: float = VAD_THRESHOLD_DB,
+        margin_db: float = VAD_MARGIN_DB,
+        max_noise_db: float = VAD_MAX_NOISE_DB,
+        pad_ms: int = VAD_PAD_MS,
+        max_pause_ms: int = MAX_PAUSE_MS
+    ):
+        self.frame_size = sample_rate * frame_ms // 1000
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.max_noise_db = max_noise_db
+        self.pad_frames = max(1, pad_ms // frame_ms)
+        self.half_pause_frames = max(1, max_pause_ms // frame_ms // 2)
+        self.noise_floor_db: Optional[float] = None
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._speech_seen = False
+        # Leading silence: only the frames just before speech are kept
+        self._lead: Deque[np.ndarray] = deque(maxlen=self.pad_frames)
+        # A pause in progress: its first and last frames, and how many were dropped
+        self._pause_head: List[np.ndarray] = []
+        self._pause_tail: Deque[np.ndarray] = deque(maxlen=self.half_pause_frames)
+        self.speech_frames = 0
+        self.dropped_frames = 0
+
+    def frame_energies(self, frames: np.ndarray) -> np.ndarray:
+        rms = np.sqrt(np.mean(frames * frames, axis=1) + 1e-12)
+        return 20 * np.log10(rms)
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        samples = np.concatenate([self._remainder, samples])
+        count = len(samples) // self.frame_size
+        self._remainder = samples[count * self.frame_size:]
+        if count == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        frames = samples[:count * self.frame_size].reshape(count, self.frame_size)
+        energies = self.frame_energies(frames)
+        quietest = float(np.percentile(energies, 10))
+        if self.noise_floor_db is None or quietest < self.noise_floor_db:
+            self.noise_floor_db = quietest
+        else:
+            # Let the floor rise slowly when the room gets louder
+            self.noise_floor_db += 0.1 * (quietest - self.noise_floor_db)
+        noise_floor = min(self.noise_floor_db, self.max_noise_db)
+        speech = energies > max(self.threshold_db, noise_floor + self.margin_db)
+
+        kept: List[np.ndarray] = []
+        for frame, is_speech in zip(frames, speech):
+            if is_speech:
+                kept.extend(self._end_silence())
+                kept.append(frame)
+                self._speech_seen = True
+                self.speech_frames += 1
+            elif not self._speech_seen:
+                if len(self._lead) == self._lead.maxlen:
+                    self.dropped_frames += 1
+                self._lead.append(frame)
+            elif len(self._pause_head) < self.half_pause_frames:
+                self._pause_head.append(frame)
+            else:
+                if len(self._pause_tail) == self._pause_tail.maxlen:
+                    self.dropped_frames += 1
+                self._pause_tail.append(frame)
+        return np.concatenate(kept) if kept else np.zeros(0, dtype=np.float32)
+
+    def _end_silence(self) -> List[np.ndarray]:
+        frames = list(self._lead) + self._pause_head + list(self._pause_tail)
+        self._lead.clear()
+        self._pause_head = []
+        self._pause_tail.clear()
+        return frames
+
+    def flush(self) -> np.ndarray:
+        """
+        Keep a short tail after the last speech; if nothing sounded like speech, keep the lead-in
+        """
+        if self._speech_seen:
+            kept = self._pause_head[:self.pad_frames]
+            self.dropped_frames += len(self._pause_head) - len(kept) + len(self._pause_tail)
+        else:
+            kept = list(self._lead)
+        self._lead.clear()
+        self._pause_head = []
+        self._pause_tail.clear()
+        return np.concatenate(kept) if kept else np.zeros(0, dtype=np.float32)
+
+class AudioPreprocessor:
+    """
+    Streaming WAV preprocessing: decode, downmix to mono, resample and trim silence.
+
+    Feed raw WAV bytes in any chunk sizes and get 16-bit mono PCM at
+    `target_rate` back; memory use is bounded by the chunk size.
+    """
+
+    def __init__(self, target_rate: int = TARGET_SAMPLE_RATE, trim_silence: bool = True):
+        self.target_rate = target_rate
+        self.trim_silence = trim_silence
+        self.format: Optional[WavFormat] = None
+        self._header = b""
+        self._partial = b""
+        self._resampler: Optional[Resampler] = None
+        self._trimmer = SilenceTrimmer(target_rate) if trim_silence else None
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.frames_in = 0
+        self.samples_out = 0
+
+    def feed(self, chunk: bytes) -> bytes:
+        self.bytes_in += len(chunk)
+        if self.format is None:
+            self._header += chunk
+            parsed = parse_wav_header(self._header)
+            if parsed is None:
+                if len(self._header) > MAX_HEADER_BYTES:
+                    raise UnsupportedAudio("No WAV data chunk found")
+                return b""
+            self.format, offset = parsed
+            self._resampler = Resampler(self.format.sample_rate, self.target_rate)
+            chunk, self._header = self._header[offset:], b""
+
+        data = self._partial + chunk
+        usable = len(data) - len(data) % self.format.frame_bytes
+        self._partial = data[usable:]
+        if not usable:
+            return b""
+        frames = decode_frames(data[:usable], self.format)
+        self.frames_in += len(frames)
+        mono = frames.mean(axis=1) if self.format.channels > 1 else frames[:, 0]
+        return self._emit(self._resampler.process(mono))
+
+    def flush(self) -> bytes:
+        if self.format is None:
+            raise UnsupportedAudio("Audio ended before the WAV header was complete")
+        samples = self._resampler.flush()
+        if self._trimmer is not None:
+            output = self._trimmer.process(samples)
+            return self._encode(np.concatenate([output, self._trimmer.flush()]))
+        return self._encode(samples)
+
+    def _emit(self, samples: np.ndarray) -> bytes:
+        if self._trimmer is not None:
+            samples = self._trimmer.process(samples)
+        return self._encode(samples)
+
+    def _encode(self, samples: np.ndarray) -> bytes:
+        pcm = encode_linear16(samples)
+        self.samples_out += len(samples)
+        self.bytes_out += len(pcm)
+        return pcm
+
+    def stats(self) -> Dict[str, Any]:
+        seconds_in = self.frames_in / self.format.sample_rate if self.format else 0.0
+        return {
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "seconds_in": round(seconds_in, 3),
+            "seconds_out": round(self.samples_out / self.target_rate, 3)
+        }
+
+class PreprocessStats:
+    def __init__(self):
+        self.files = 0
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.processing_seconds = 0.0
+
+    def record(self, preprocessor: AudioPreprocessor, elapsed: float):
+        self.files += 1
+        self.bytes_in += preprocessor.bytes_in
+        self.bytes_out += preprocessor.bytes_out
+        self.processing_seconds += elapsed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "files": self.files,
+            "skipped": self.skipped,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved_ratio": round(1 - self.bytes_out / self.bytes_in, 4) if self.bytes_in else 0.0,
+            "processing_seconds": round(self.processing_seconds, 3)
+        }
+
+preprocess_stats = PreprocessStats()
+
+def preprocess_audio(data: bytes, target_rate: int = TARGET_SAMPLE_RATE) -> Tuple[bytes, str]:
+    """
+    Preprocess a whole WAV file in memory, returning (audio, mimetype).
+
+    Returns a 16 kHz mono WAV, or the input unchanged if it is not PCM WAV.
+    """
+    started = time.perf_counter()
+    preprocessor = AudioPreprocessor(target_rate)
+    try:
+        pcm = preprocessor.feed(data) + preprocessor.flush()
+    except UnsupportedAudio:
+        preprocess_stats.skipped += 1
+        return data, "audio/wav"
+    preprocess_stats.record(preprocessor, time.perf_counter() - started)
+    return encode_wav(pcm, target_rate), "audio/wav"
+
+async def read_wav_head(chunks: AsyncIterator[bytes]) -> Tuple[bytes, bool, bool]:
+    """
+    Read the start of a stream until its WAV header is parsed or ruled out.
+
+    Returns (bytes read, whether the stream ended, whether it is usable WAV).
+    """
+    head = b""
+    async for chunk in chunks:
+        head += chunk
+        try:
+            if parse_wav_header(head) is not None:
+                return head, False, True
+        except UnsupportedAudio:
+            return head, False, False
+        if len(head) > MAX_HEADER_BYTES:
+            return head, False, False
+    return head, True, False
+
+async def replay_stream(head: bytes, chunks: AsyncIterator[bytes], ended: bool) -> AsyncIterator[bytes]:
+    if head:
+        yield head
+    if not ended:
+        async for chunk in chunks:
+            yield chunk
+
+async def _preprocessed(
+    preprocessor: AudioPreprocessor,
+    chunks: AsyncIterator[bytes]
+) -> AsyncIterator[bytes]:
+    started = time.perf_counter()
+    async for chunk in chunks:
+        # Decoding and filtering a chunk is CPU work; keep it off the event loop
+        pcm = await asyncio.to_thread(preprocessor.feed, chunk)
+        if pcm:
+            yield pcm
+    pcm = preprocessor.flush()
+    preprocess_stats.record(preprocessor, time.perf_counter() - started)
+    if pcm:
+        yield pcm
+
+async def prepare_audio(
+    audio: Union[bytes, AsyncIterator[bytes]],
+    content_type: Optional[str],
+    options: Dict[str, Any],
+    target_rate: int = TARGET_SAMPLE_RATE
+) -> Tuple[Union[bytes, AsyncIterator[bytes]], Optional[str], Dict[str, Any]]:
+    """
+    Preprocess audio on its way to Deepgram, returning (audio, content type, options).
+
+    Streams come back as raw linear16 with the encoding options Deepgram
+    needs to read it. Anything that is not PCM WAV passes through unchanged.
+    """
+    if isinstance(audio, (bytes, bytearray)):
+        data = bytes(audio)
+        processed, mimetype = await asyncio.to_thread(preprocess_audio, data, target_rate)
+        return processed, (mimetype if processed is not data else content_type), options
+
+    head, ended, is_wav = await read_wav_head(audio)
+    if not is_wav:
+        preprocess_stats.skipped += 1
+        return replay_stream(head, audio, ended), content_type, options
+
+    raw_options = {**options, "encoding": "linear16", "sample_rate": target_rate, "channels": 1}
+    return _preprocessed(AudioPreprocessor(target_rate), replay_stream(head, audio, ended)), "audio/l16", raw_options
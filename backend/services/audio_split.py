@@ -0,0 +1,175 @@
+import os
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import numpy as np
+from ..models.transcription import TranscriptionResult
+from .audio_preprocess import TARGET_SAMPLE_RATE, VAD_FRAME_MS, AudioPreprocessor, encode_wav
+
+SPLIT_WINDOW_SECONDS = float(os.getenv("TRANSCRIBE_SPLIT_WINDOW_SECONDS", "300"))
+# How far either side of each window boundary to look for a pause to cut at
+SPLIT_SEARCH_SECONDS = float(os.getenv("TRANSCRIBE_SPLIT_SEARCH_SECONDS", "30"))
+SPLIT_CONCURRENCY = int(os.getenv("TRANSCRIBE_SPLIT_CONCURRENCY", "4"))
+# Energies are averaged over this long so a cut lands in a pause, not between two syllables
+SPLIT_SMOOTH_MS = 300
+
+@dataclass
+class AudioWindow:
+    index: int
+    offset: float
+    duration: float
+    audio: bytes
+
+class SilenceSplitter:
+    """
+    Cuts a stream of mono samples into windows of about `window_seconds`.
+
+    Each cut is made at the quietest moment within `search_seconds` either
+    side of the window boundary, so words are not split between windows.
+    Only the current window is buffered.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        window_seconds: float = SPLIT_WINDOW_SECONDS,
+        search_seconds: float = SPLIT_SEARCH_SECONDS,
+        frame_ms: int = VAD_FRAME_MS
+    ):
+        self.sample_rate = sample_rate
+        self.window = int(window_seconds * sample_rate)
+        self.search = max(1, min(int(search_seconds * sample_rate), self.window // 2))
+        self.frame_size = sample_rate * frame_ms // 1000
+        self.smooth_frames = max(1, SPLIT_SMOOTH_MS // frame_ms)
+        self.offset = 0
+        self._pending: List[np.ndarray] = []
+        self._pending_samples = 0
+
+    def process(self, samples: np.ndarray) -> List[Tuple[int, np.ndarray]]:
+        """
+        Add samples, returning any windows completed as (start sample, samples)
+        """
+        if len(samples):
+            self._pending.append(samples)
+            self._pending_samples += len(samples)
+        windows = []
+        # Wait for a search span beyond the latest possible cut so the last window is never a sliver
+        while self._pending_samples >= self.window + 2 * self.search:
+            buffer = np.concatenate(self._pending)
+            start = self.window - self.search
+            cut = start + self.quietest(buffer[start:self.window + self.search])
+            windows.append((self.offset, buffer[:cut]))
+            self.offset += cut
+            self._pending = [buffer[cut:]]
+            self._pending_samples = len(buffer) - cut
+        return windows
+
+    def flush(self) -> List[Tuple[int, np.ndarray]]:
+        if not self._pending_samples:
+            return []
+        window = (self.offset, np.concatenate(self._pending))
+        self.offset += self._pending_samples
+        self._pending = []
+        self._pending_samples = 0
+        return [window]
+
+    def quietest(self, region: np.ndarray) -> int:
+        """
+        Sample index of the middle of the quietest frame in `region`
+        """
+        count = len(region) // self.frame_size
+        if count == 0:
+            return len(region)
+        frames = region[:count * self.frame_size].reshape(count, self.frame_size).astype(np.float32) / 32768
+        energies = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-12)
+        if count >= self.smooth_frames:
+            energies = np.convolve(energies, np.ones(self.smooth_frames) / self.smooth_frames, mode="same")
+        return int(np.argmin(energies)) * self.frame_size + self.frame_size // 2
+
+async def split_wav_stream(
+    chunks: AsyncIterator[bytes],
+    window_seconds: float = SPLIT_WINDOW_SECONDS,
+    search_seconds: float = SPLIT_SEARCH_SECONDS,
+    target_rate: int = TARGET_SAMPLE_RATE
+) -> AsyncIterator[AudioWindow]:
+    """
+    Decode a WAV stream to mono at `target_rate` and yield it as windows cut at pauses.
+
+    Windows are yielded as soon as they are complete, so the first can be
+    transcribed while the rest of the file is still being read. Raises
+    UnsupportedAudio for anything that is not PCM or float WAV.
+    """
+    decoder = AudioPreprocessor(target_rate, trim_silence=False)
+    splitter = SilenceSplitter(target_rate, window_seconds, search_seconds)
+    index = 0
+
+    def windows(ranges: List[Tuple[int, np.ndarray]]) -> List[AudioWindow]:
+        nonlocal index
+        result = []
+        for start, samples in ranges:
+            result.append(AudioWindow(
+                index=index,
+                offset=start / target_rate,
+                duration=len(samples) / target_rate,
+                audio=encode_wav(samples.tobytes(), target_rate)
+            ))
+            index += 1
+        return result
+
+    def decode(chunk: bytes) -> np.ndarray:
+        return np.frombuffer(chunk, dtype="<i2")
+
+    async for chunk in chunks:
+        # Decoding and resampling is CPU work; keep it off the event loop
+        pcm = await asyncio.to_thread(decoder.feed, chunk)
+        for window in windows(splitter.process(decode(pcm))):
+            yield window
+    for window in windows(splitter.process(decode(decoder.flush())) + splitter.flush()):
+        yield window
+
+def _shift(item: Dict[str, Any], offset: float) -> Dict[str, Any]:
+    shifted = dict(item)
+    for field in ("start", "end"):
+        if isinstance(shifted.get(field), (int, float)):
+            shifted[field] = round(shifted[field] + offset, 3)
+    if isinstance(shifted.get("words"), list):
+        shifted["words"] = [_shift(word, offset) for word in shifted["words"]]
+    return shifted
+
+def stitch_transcripts(parts: List[Tuple[float, Dict[str, Any]]]) -> TranscriptionResult:
+    """
+    Join Deepgram responses for consecutive windows into one result.
+
+    `parts` are (window offset in seconds, response) in any order. Word and
+    utterance timestamps are moved onto the timeline of the whole recording,
+    and the confidence is averaged over words.
+    """
+    transcripts: List[str] = []
+    words: List[dict] = []
+    timestamps: List[dict] = []
+    weighted_confidence = 0.0
+    weight = 0
+    for offset, response in sorted(parts, key=lambda part: part[0]):
+        alternative = response["results"]["channels"][0]["alternatives"][0]
+        part_words = [_shift(word, offset) for word in alternative.get("words") or []]
+        if alternative["transcript"].strip():
+            transcripts.append(alternative["transcript"].strip())
+        words.extend(part_words)
+        timestamps.extend(_shift(utterance, offset) for utterance in response["results"].get("utterances") or [])
+        # Silent windows carry no words and should not drag the average down
+        part_weight = len(part_words) or (1 if alternative["transcript"].strip() else 0)
+        weighted_confidence += alternative.get("confidence", 0.0) * part_weight
+        weight += part_weight
+    return TranscriptionResult(
+        transcript=" ".join(transcripts),
+        confidence=round(weighted_confidence / weight, 4) if weight else 0.0,
+        words=words,
+        timestamps=timestamps
+    )
+
+def detected_language(parts: List[Tuple[float, Dict[str, Any]]], language: Optional[str]) -> Optional[str]:
+    for _, response in sorted(parts, key=lambda part: part[0]):
+        detected = response["results"]["channels"][0].get("detected_language")
+        if detected:
+            return detected
+    return language
@@ -0,0 +1,93 @@
+import os
+import asyncio
+from typing import AsyncIterator
+from fastapi import UploadFile
+
+MAX_UPLOAD_BYTES = int(os.getenv("TRANSCRIBE_MAX_UPLOAD_BYTES", str(500 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = int(os.getenv("TRANSCRIBE_UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+
+class UploadTooLarge(ValueError):
+    """
+    An audio upload over TRANSCRIBE_MAX_UPLOAD_BYTES
+    """
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Audio file exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+        self.max_bytes = max_bytes
+
+def upload_size(file: UploadFile) -> int:
+    """
+    Size of an uploaded file without reading it.
+
+    Starlette spools multipart uploads to memory, rolling over to a temp file
+    past 1 MB, so the spool can be measured by seeking.
+    """
+    position = file.file.tell()
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(position)
+    return size
+
+def check_upload_size(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> int:
+    """
+    Reject an upload over the limit before anything is sent upstream
+    """
+    size = upload_size(file)
+    if size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+    return size
+
+def iter_upload(
+    file: UploadFile,
+    chunk_size: int = UPLOAD_CHUNK_BYTES,
+    max_bytes: int = MAX_UPLOAD_BYTES
+) -> AsyncIterator[bytes]:
+    """
+    Stream an upload in fixed-size chunks, holding one chunk in memory at a time.
+
+    The size limit is checked here, before any request is started.
+    """
+    check_upload_size(file, max_bytes)
+    return _read_upload(file, chunk_size)
+
+async def _read_upload(file: UploadFile, chunk_size: int) -> AsyncIterator[bytes]:
+    await file.seek(0)
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+def iter_file(
+    path: str,
+    chunk_size: int = UPLOAD_CHUNK_BYTES,
+    max_bytes: int = MAX_UPLOAD_BYTES
+) -> AsyncIterator[bytes]:
+    """
+    Stream a file from disk in chunks, reading off the event loop
+    """
+    if os.path.getsize(path) > max_bytes:
+        raise UploadTooLarge(max_bytes)
+    return _read_file(path, chunk_size)
+
+async def _read_file(path: str, chunk_size: int) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = await asyncio.to_thread(f.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+async def limit_stream(
+    chunks: AsyncIterator[bytes],
+    max_bytes: int = MAX_UPLOAD_BYTES
+) -> AsyncIterator[bytes]:
+    """
+    Pass a body of unknown length through, failing once it passes the limit
+    """
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        yield chunk
@@ -0,0 +1,81 @@
+import os
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Jira accepts at most 50 issues per /rest/api/3/issue/bulk call
+BULK_CREATE_LIMIT = 50
+DEFAULT_BATCH_CONCURRENCY = int(os.getenv("JIRA_BATCH_CONCURRENCY", "5"))
+
+def chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    """
+    Split a sequence into consecutive chunks of at most `size` items
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def group_by(items: Sequence[T], key: Callable[[T], Hashable]) -> "OrderedDict[Hashable, List[Tuple[int, T]]]":
+    """
+    Group items by key, keeping each item's original index
+    """
+    groups: "OrderedDict[Hashable, List[Tuple[int, T]]]" = OrderedDict()
+    for index, item in enumerate(items):
+        groups.setdefault(key(item), []).append((index, item))
+    return groups
+
+def success_result(data: Any) -> Dict[str, Any]:
+    return {"success": True, "message": "OK", "data": data}
+
+def error_result(error: Exception) -> Dict[str, Any]:
+    return {"success": False, "message": str(error), "data": None}
+
+async def gather_bounded(
+    calls: Sequence[Callable[[], Awaitable[T]]],
+    max_concurrency: int = DEFAULT_BATCH_CONCURRENCY
+) -> List[Dict[str, Any]]:
+    """
+    Run calls with bounded concurrency, returning one result dict per call in order
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(call: Callable[[], Awaitable[T]]) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return success_result(await call())
+            except Exception as e:
+                return error_result(e)
+
+    return await asyncio.gather(*(run(call) for call in calls))
+
+def split_bulk_response(count: int, response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Map a Jira bulk-create response back onto its input elements in order.
+
+    Jira lists created issues in input order, skipping failed elements, and
+    reports failures by `failedElementNumber`.
+    """
+    failures = {
+        error.get("failedElementNumber"): error
+        for error in response.get("errors", [])
+    }
+    created = iter(response.get("issues", []))
+    results = []
+    for index in range(count):
+        if index in failures:
+            element_errors = failures[index].get("elementErrors", {})
+            messages = list(element_errors.get("errorMessages", []))
+            messages += [f"{field}: {msg}" for field, msg in element_errors.get("errors", {}).items()]
+            results.append(error_result(Exception("; ".join(messages) or "Issue creation failed")))
+        else:
+            issue = next(created, None)
+            if issue is None:
+                results.append(error_result(Exception("Missing issue in bulk response")))
+            else:
+                results.append(success_result({
+                    "key": issue.get("key"),
+                    "self": issue.get("self"),
+                    "id": issue.get("id")
+                }))
+    return results
@@ -0,0 +1,178 @@
+import os
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Optional
+from fastapi import HTTPException
+from .http_pool import HttpPool, jira_http_pool
+from .llm import OpenAIProvider, get_llm_provider, openai_http_pool
+from .transcription_service import TranscriptionService, deepgram_http_pool
+from .transcription import TranscriptionService as SDKTranscriptionService
+from .command_parser import CommandParser
+from .jira_client import JiraClient
+from .supabase import create_supabase_client
+
+PREWARM_CONNECTIONS = int(os.getenv("CLIENT_PREWARM_CONNECTIONS", "2"))
+PREWARM_TIMEOUT = float(os.getenv("CLIENT_PREWARM_TIMEOUT", "5"))
+
+class ClientUnavailable(Exception):
+    """
+    An upstream client that could not be built, usually for missing credentials
+    """
+
+def _deepgram_url() -> Optional[str]:
+    return os.getenv("DEEPGRAM_API_URL", "https://api.deepgram.com/v1")
+
+def _openai_url() -> Optional[str]:
+    provider = get_llm_provider()
+    # The local stand-in never goes over the network
+    return provider.base_url if isinstance(provider, OpenAIProvider) else None
+
+def _jira_url() -> Optional[str]:
+    # The shared pool carries the OAuth REST traffic; JiraClient keeps its own session
+    return os.getenv("JIRA_API_BASE_URL", "https://api.atlassian.com/ex/jira")
+
+class ClientRegistry:
+    """
+    Builds each upstream client once per worker and hands the same instance to every router.
+
+    The app lifespan opens and prewarms the shared connection pools at
+    startup, builds every client, and closes the pools on shutdown. A client
+    whose configuration is missing does not stop the app from starting;
+    requests that need it get a 503 instead.
+    """
+
+    def __init__(self):
+        self.pools: Dict[str, HttpPool] = {}
+        self._prewarm_urls: Dict[str, Callable[[], Optional[str]]] = {}
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._clients: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.started = False
+
+    def add_pool(self, name: str, pool: HttpPool, prewarm_url: Optional[Callable[[], Optional[str]]] = None):
+        self.pools[name] = pool
+        if prewarm_url is not None:
+            self._prewarm_urls[name] = prewarm_url
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        """
+        Get a client, building it on first use outside the app lifespan
+        """
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+        if name not in self._factories:
+            raise KeyError(f"Unknown client: {name}")
+        # Routers resolve clients from worker threads too; build each one only once
+        with self._lock:
+            if name not in self._clients:
+                try:
+                    self._clients[name] = self._factories[name]()
+                    self._errors.pop(name, None)
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    raise ClientUnavailable(f"{name} client is unavailable: {str(e)}")
+            return self._clients[name]
+
+    def set(self, name: str, client: Optional[Any]):
+        """
+        Replace a client, e.g. with a fake in tests; None drops it so it is rebuilt
+        """
+        if client is None:
+            self._clients.pop(name, None)
+        else:
+            self._clients[name] = client
+
+    async def start(self, prewarm_connections: int = PREWARM_CONNECTIONS):
+        """
+        Open the pools, build every registered client, then prewarm the pools
+        """
+        for pool in self.pools.values():
+            await pool.start()
+        for name in self._factories:
+            try:
+                self.get(name)
+            except ClientUnavailable:
+                pass
+        if prewarm_connections > 0:
+            await self.prewarm(prewarm_connections)
+        self.started = True
+
+    async def prewarm(self, connections: int = PREWARM_CONNECTIONS):
+        """
+        Open connections to every configured upstream at once, waiting at most CLIENT_PREWARM_TIMEOUT
+        """
+        warmups = []
+        for name, pool in self.pools.items():
+            try:
+                url = self._prewarm_urls[name]() if name in self._prewarm_urls else None
+            except Exception:
+                # The client behind this pool is misconfigured; that is reported by get()
+                url = None
+            if url:
+                warmups.append(pool.prewarm(url, connections))
+        if not warmups:
+            return
+        try:
+            await asyncio.wait_for(asyncio.gather(*warmups), PREWARM_TIMEOUT)
+        except asyncio.TimeoutError:
+            # Startup should not wait on a slow upstream; the pools fill on demand
+            pass
+
+    async def close(self):
+        """
+        Close every pool and drop the clients so a restarted lifespan builds fresh ones
+        """
+        await asyncio.gather(*(pool.close() for pool in self.pools.values()))
+        self._clients.clear()
+        self.started = False
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get per-client build status and connection pool statistics
+        """
+        return {
+            "started": self.started,
+            "clients": {
+                name: {"ready": name in self._clients, "error": self._errors.get(name)}
+                for name in self._factories
+            },
+            "pools": {name: pool.stats() for name, pool in self.pools.items()}
+        }
+
+def use_client(name: str) -> Callable[[], Any]:
+    """
+    FastAPI dependency that injects the shared client registered as `name`
+    """
+    def dependency() -> Any:
+        try:
+            return client_registry.get(name)
+        except ClientUnavailable as e:
+            raise HTTPException(status_code=503, detail=str(e))
+    return dependency
+
+def optional_client(name: str) -> Callable[[], Optional[Any]]:
+    """
+    FastAPI dependency that injects the shared client registered as `name`, or None if it cannot be built
+    """
+    def dependency() -> Optional[Any]:
+        try:
+            return client_registry.get(name)
+        except ClientUnavailable:
+            return None
+    return dependency
+
+client_registry = ClientRegistry()
+client_registry.add_pool("deepgram", deepgram_http_pool, _deepgram_url)
+client_registry.add_pool("openai", openai_http_pool, _openai_url)
+client_registry.add_pool("jira", jira_http_pool, _jira_url)
+client_registry.register("deepgram", TranscriptionService)
+client_registry.register("deepgram_sdk", SDKTranscriptionService)
+client_registry.register("openai", get_llm_provider)
+client_registry.register("command_parser", CommandParser)
+client_registry.register("jira", JiraClient)
+client_registry.register("supabase", create_supabase_client)
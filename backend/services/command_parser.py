@@ -1,8 +1,15 @@
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel
-import openai
-import os
 import json
+from .fast_parser import fast_parser
+from .parse_cache import parse_cache, parse_cache_key, prompt_version
+from .transcript_chunker import chunk_transcript, map_chunks, merge_actions, stream_chunks
+from .json_stream import JsonArrayStream
+from .prompt_compiler import CompiledPrompt, PromptTemplate
+from . import llm
+from .llm import get_llm_provider
+from .micro_batcher import MicroBatcher, parse_numbered_batch
+from .model_cascade import InvalidParse, ModelCascade, required_confidence
 
 class JiraAction(BaseModel):
     action_type: str  # create, comment, update, search
@@ -15,12 +22,28 @@ class JiraAction(BaseModel):
     fields: Optional[Dict[str, Any]] = None
     jql: Optional[str] = None
 
+def validate_action(content: str) -> Tuple[Dict[str, Any], str, float]:
+    """
+    Validate an LLM answer, returning the action as a dict, its type and confidence.
+
+    Unknown action types or missing fields count as zero confidence, so a
+    cheaper model's incomplete answer is escalated while the last tier's is kept.
+    """
+    try:
+        action_json = json.loads(content)
+        confidence = float(action_json.pop("confidence", 0.0))
+        action = JiraAction(**action_json)
+    except json.JSONDecodeError:
+        raise InvalidParse("Failed to parse LLM response as JSON")
+    except Exception as e:
+        raise InvalidParse(f"Invalid action from LLM: {str(e)}")
+    values = action.dict()
+    return values, action.action_type, required_confidence(action.action_type, values, confidence)
+
 class CommandParser:
     def __init__(self):
-        self.api_key = os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
-            raise ValueError("Missing OpenAI API key")
-        openai.api_key = self.api_key
+        # Fails fast when the configured provider is missing credentials
+        self.llm = get_llm_provider()
         
         self.system_prompt = """You are a command parser for a voice-enabled Jira assistant.
 Convert natural language commands into structured Jira actions.
@@ -58,56 +81,184 @@ Example commands and their parsed actions:
     "action_type": "search",
     "jql": "project = PROJECT-1 AND type = Bug AND priority = High"
 }"""
+        # Command parsing tries PARSE_MODEL_TIERS in order; other prompts use the largest model
+        self.cascade = ModelCascade.from_env("gpt-4")
+        self.model = self.cascade.top_model
+        # Both prompts share the system prompt as a stable, cacheable prefix
+        self.command_prompt = PromptTemplate(
+            "jira_action",
+            self.system_prompt,
+            instructions="""
+                Reply with the action JSON only, adding a "confidence" field between 0 and 1
+                that says how sure you are of the parse.
+                """,
+            fields=[("transcript", "Parse this command"), ("project_key", "Project context")],
+            truncatable="transcript"
+        )
+        self.transcript_prompt = PromptTemplate(
+            "teams_transcript",
+            self.system_prompt,
+            instructions="""
+                Parse the Teams transcript in the next message into a JSON array of Jira actions.
+                Each line should be treated as a separate command.
+                """,
+            fields=[("transcript", "Transcript"), ("project_key", "Project context"), ("part", "Part")],
+            truncatable="transcript"
+        )
+        self.batch_prompt = PromptTemplate(
+            "jira_action_batch",
+            self.system_prompt,
+            instructions="""
+                Parse each numbered command in the next message independently.
+                A project in square brackets is the project context for that command only.
+                Return a JSON array with exactly one action object per command, in order,
+                each with an extra "index" field holding the command number and a "confidence"
+                field between 0 and 1 that says how sure you are of the parse.
+                """,
+            fields=[("commands", "Commands")]
+        )
+        self.prompt_version = prompt_version(self.command_prompt.version, *self.cascade.tiers)
+        # Optional: coalesces concurrent LLM parses into one numbered request
+        self.batcher = MicroBatcher(self._parse_batch_with_llm)
 
     async def parse_command(self, transcript: str, project_key: Optional[str] = None) -> JiraAction:
         """
-        Parse a transcribed command into a Jira action
+        Parse a transcribed command into a Jira action, trying the local fast path first
         """
+        fast_result = fast_parser.parse(transcript, project_key)
+        if fast_result is not None:
+            return fast_result.to_jira_action()
+        
         try:
-            messages = [
-                {"role": "system", "content": self.system_prompt},
-                {"role": "user", "content": f"Parse this command: {transcript}"}
-            ]
-            
-            if project_key:
-                messages[1]["content"] += f"\nProject context: {project_key}"
-            
-            response = await openai.ChatCompletion.acreate(
-                model="gpt-4",
-                messages=messages,
-                temperature=0.1
+            key = parse_cache_key("jira_action", self.prompt_version, transcript, project_key)
+            action_json = await parse_cache.get_or_parse(
+                key,
+                lambda: self._parse_with_llm(transcript, project_key)
             )
-            
-            action_json = json.loads(response.choices[0].message.content)
             return JiraAction(**action_json)
             
         except Exception as e:
             raise Exception(f"Failed to parse command: {str(e)}")
+
+    async def _parse_with_llm(self, transcript: str, project_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Ask the LLM to parse a command, returning the validated action as a dict.
+
+        With micro-batching enabled, concurrent commands share one request.
+        """
+        if self.batcher.enabled:
+            return await self.batcher.submit((transcript, project_key))
+        return await self._parse_single_with_llm(transcript, project_key)
+
+    async def _parse_single_with_llm(self, transcript: str, project_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Parse one command with its own LLM request
+        """
+        prompt = self.command_prompt.render(transcript=transcript, project_key=project_key)
+        
+        # Escalate to larger models when the answer is unsure; validated before caching
+        return await self.cascade.run(
+            lambda model: self._complete(prompt, model),
+            validate_action
+        )
     
+    async def _parse_batch_with_llm(self, requests: List[Tuple[str, Optional[str]]]) -> List[Any]:
+        """
+        Parse a batch of commands with one numbered LLM request
+        """
+        return await parse_numbered_batch(
+            requests,
+            describe=lambda request: f"{request[0]} [project: {request[1]}]" if request[1] else request[0],
+            complete=lambda commands, model: self._complete(self.batch_prompt.render(commands=commands), model),
+            validate=validate_action,
+            cascade=self.cascade,
+            parse_single=lambda request: self._parse_single_with_llm(*request)
+        )
+
     async def parse_teams_transcript(self, transcript: str, project_key: Optional[str] = None) -> List[JiraAction]:
         """
-        Parse a Teams meeting transcript into multiple Jira actions
+        Parse a Teams meeting transcript into multiple Jira actions.
+
+        Long transcripts are split on speaker turns into overlapping,
+        token-budgeted windows that are parsed concurrently and then merged.
         """
         try:
-            messages = [
-                {"role": "system", "content": self.system_prompt},
-                {"role": "user", "content": f"""Parse this Teams transcript into Jira actions.
-Each line should be treated as a separate command.
-Transcript:
-{transcript}"""}
-            ]
-            
-            if project_key:
-                messages[1]["content"] += f"\nProject context: {project_key}"
-            
-            response = await openai.ChatCompletion.acreate(
-                model="gpt-4",
-                messages=messages,
-                temperature=0.1
+            chunks = chunk_transcript(transcript)
+            results = await map_chunks(
+                chunks,
+                lambda chunk, index: self._parse_transcript_chunk(chunk, project_key, index, len(chunks))
             )
-            
-            actions_json = json.loads(response.choices[0].message.content)
-            return [JiraAction(**action) for action in actions_json]
+            return merge_actions(results)
             
         except Exception as e:
-            raise Exception(f"Failed to parse Teams transcript: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Failed to parse Teams transcript: {str(e)}")
+
+    async def stream_teams_transcript(
+        self,
+        transcript: str,
+        project_key: Optional[str] = None
+    ) -> AsyncIterator[JiraAction]:
+        """
+        Parse a Teams meeting transcript, yielding each Jira action as soon as
+        the model finishes writing it
+        """
+        try:
+            chunks = chunk_transcript(transcript)
+            async for action in stream_chunks(
+                chunks,
+                lambda chunk, index: self._stream_transcript_chunk(chunk, project_key, index, len(chunks))
+            ):
+                yield action
+                
+        except Exception as e:
+            raise Exception(f"Failed to parse Teams transcript: {str(e)}")
+
+    def _transcript_prompt(
+        self,
+        transcript: str,
+        project_key: Optional[str],
+        index: int,
+        total: int
+    ) -> CompiledPrompt:
+        part = None
+        if total > 1:
+            part = f"{index + 1} of {total} of a longer transcript; it may start or end mid-conversation"
+        return self.transcript_prompt.render(transcript=transcript, project_key=project_key, part=part)
+
+    async def _complete(self, prompt: CompiledPrompt, model: Optional[str] = None) -> str:
+        """
+        Run a compiled prompt through the LLM provider
+        """
+        return await llm.complete(prompt, model or self.model, temperature=0.1)
+
+    async def _parse_transcript_chunk(
+        self,
+        transcript: str,
+        project_key: Optional[str],
+        index: int,
+        total: int
+    ) -> List[JiraAction]:
+        """
+        Parse one window of a transcript into Jira actions
+        """
+        content = await self._complete(self._transcript_prompt(transcript, project_key, index, total))
+        
+        actions_json = json.loads(content)
+        return [JiraAction(**action) for action in actions_json]
+
+    async def _stream_transcript_chunk(
+        self,
+        transcript: str,
+        project_key: Optional[str],
+        index: int,
+        total: int
+    ) -> AsyncIterator[JiraAction]:
+        """
+        Stream one window of a transcript, yielding actions as their objects close
+        """
+        prompt = self._transcript_prompt(transcript, project_key, index, total)
+        parser = JsonArrayStream()
+        async for content in llm.stream(prompt, self.model, temperature=0.1):
+            for action in parser.feed(content):
+                yield JiraAction(**action)
+        parser.close()
@@ -1,22 +1,85 @@
-import os
 import json
-import aiohttp
-from typing import List, Optional, Dict, Any
-from ..models.commands import CommandResponse, TranscriptParseResponse
+import asyncio
+import textwrap
+from fastapi.encoders import jsonable_encoder
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
+from ..models.commands import CommandResponse, TranscriptParseResponse, CommandExecutionResult
+from ..models.jira import TaskCreate
 from ..services.jira_service import JiraService
+from ..services.fast_parser import fast_parser
+from ..services.parse_cache import parse_cache, parse_cache_key, prompt_version
+from ..services.prompt_compiler import CompiledPrompt, PromptTemplate, compact_json
+from ..services import llm
+from ..services.llm import get_llm_provider
+from ..services.micro_batcher import MicroBatcher, parse_numbered_batch
+from ..services.model_cascade import InvalidParse, ModelCascade, required_confidence
+from ..services.transcript_chunker import chunk_transcript, map_chunks, merge_actions, stream_chunks
+from ..services.json_stream import JsonArrayStream
+from ..services.batch_executor import DEFAULT_BATCH_CONCURRENCY, gather_bounded, error_result
+
+SYSTEM_MESSAGE = "You are a helpful assistant that parses commands for Jira task management."
+MODEL = "gpt-4"
+
+# Command parsing tries PARSE_MODEL_TIERS in order; a single model disables the cascade
+command_cascade = ModelCascade.from_env(MODEL)
+
+ACTION_DETAILS = """
+For query_tasks, details should include: project_key, status (optional), assignee (optional)
+For update_comment, details should include: task_id, comment
+For create_issue, details should include: project_key, summary, description (optional), assignee (optional)
+For update_task, details should include: task_id, summary (optional), description (optional), status (optional), assignee (optional)
+"""
+
+# Static instructions come first so every request shares a byte-identical prefix
+COMMAND_PROMPT = PromptTemplate(
+    "command",
+    SYSTEM_MESSAGE,
+    instructions=textwrap.dedent("""
+        Parse the command in the next message for Jira task management.
+
+        Return a JSON object with the following structure:
+        {"action": "query_tasks|update_comment|create_issue|update_task", "details": {}, "confidence": 0.95}
+        where details holds the action-specific details.
+        """) + ACTION_DETAILS,
+    fields=[("text", "Command"), ("project_key", "Project"), ("context", "Context")],
+    truncatable="text",
+    droppable=["context"]
+)
+
+COMMAND_BATCH_PROMPT = PromptTemplate(
+    "command_batch",
+    SYSTEM_MESSAGE,
+    instructions=textwrap.dedent("""
+        Parse each numbered command in the next message independently for Jira task management.
+        Project and context in square brackets apply only to that command.
+
+        Return a JSON array with exactly one object per command, in order, with the following structure:
+        [{"index": 1, "action": "query_tasks|update_comment|create_issue|update_task", "details": {}, "confidence": 0.95}]
+        where index is the command number and details holds the action-specific details.
+        """) + ACTION_DETAILS,
+    fields=[("commands", "Commands")]
+)
+
+TRANSCRIPT_PROMPT = PromptTemplate(
+    "transcript",
+    SYSTEM_MESSAGE,
+    instructions=textwrap.dedent("""
+        Parse the Teams meeting transcript in the next message for Jira task management actions.
+
+        Return a JSON array of action objects with the following structure:
+        [{"action": "query_tasks|update_comment|create_issue|update_task", "details": {}, "confidence": 0.95}]
+        where details holds the action-specific details.
+        """) + ACTION_DETAILS,
+    fields=[("transcript", "Transcript"), ("project_key", "Project"), ("part", "Part")],
+    truncatable="transcript"
+)
 
 class CommandService:
     def __init__(self, token: str):
-        self.api_key = os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
-            raise ValueError("OPENAI_API_KEY environment variable is not set")
-        
-        self.base_url = "https://api.openai.com/v1"
-        self.headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        # Fails fast when the configured provider is missing credentials
+        self.llm = get_llm_provider()
         self.jira_service = JiraService(token)
+        self.command_prompt_version = prompt_version(COMMAND_PROMPT.version, *command_cascade.tiers)
 
     async def parse_command(
         self,
@@ -25,20 +88,51 @@ class CommandService:
         context: Optional[Dict[str, Any]] = None
     ) -> CommandResponse:
         """
-        Parse a command from transcribed text using OpenAI
+        Parse a command from transcribed text, using the LLM only when the local fast path is unsure
         """
-        # Construct the prompt for OpenAI
-        prompt = self._build_command_prompt(text, project_key, context)
+        fast_result = fast_parser.parse(text, project_key)
+        if fast_result is not None:
+            return fast_result.to_command_response()
         
-        # Call OpenAI API
-        response = await self._call_openai(prompt)
+        key = parse_cache_key("command_response", self.command_prompt_version, text, project_key, context)
+        parsed_response = await parse_cache.get_or_parse(
+            key,
+            lambda: self._parse_with_llm(text, project_key, context)
+        )
+        return CommandResponse(**parsed_response)
+
+    async def _parse_with_llm(
+        self,
+        text: str,
+        project_key: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Ask the LLM to parse a command, returning the validated response as a dict.
+
+        With micro-batching enabled, concurrent commands share one request.
+        """
+        if command_batcher.enabled:
+            return await command_batcher.submit((self, text, project_key, context))
+        return await self._parse_single(text, project_key, context)
+
+    async def _parse_single(
+        self,
+        text: str,
+        project_key: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse one command with its own LLM request
+        """
+        # Construct the prompt for the LLM
+        prompt = self._build_command_prompt(text, project_key, context)
         
-        # Parse the response
-        try:
-            parsed_response = json.loads(response)
-            return CommandResponse(**parsed_response)
-        except json.JSONDecodeError:
-            raise Exception("Failed to parse OpenAI response as JSON")
+        # Call the LLM, escalating to larger models when the answer is unsure
+        return await command_cascade.run(
+            lambda model: self._call_llm(prompt, model),
+            validate_command_response
+        )
 
     async def execute_command(self, command: CommandResponse) -> Dict[str, Any]:
         """
@@ -72,126 +166,212 @@ class CommandService:
         else:
             raise ValueError(f"Unknown action: {action}")
 
+    async def execute_commands(
+        self,
+        commands: List[CommandResponse],
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> List[CommandExecutionResult]:
+        """
+        Execute many parsed commands, returning one result per command in order.
+
+        create_issue commands go through Jira's bulk-create endpoint; the rest
+        run with bounded concurrency.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(commands)
+        creates = []
+        others = []
+        for index, command in enumerate(commands):
+            if command.action != "create_issue":
+                others.append((index, command))
+                continue
+            try:
+                creates.append((index, TaskCreate(**command.details)))
+            except Exception as e:
+                results[index] = error_result(e)
+
+        async def run_creates():
+            if not creates:
+                return
+            created = await self.jira_service.create_tasks_bulk(
+                [task for _, task in creates],
+                max_concurrency
+            )
+            for (index, _), result in zip(creates, created):
+                results[index] = result
+
+        async def run_others():
+            other_results = await gather_bounded(
+                [lambda command=command: self.execute_command(command) for _, command in others],
+                max_concurrency
+            )
+            for (index, _), result in zip(others, other_results):
+                results[index] = result
+
+        await asyncio.gather(run_creates(), run_others())
+        return [self._execution_result(result) for result in results]
+
+    def _execution_result(self, result: Dict[str, Any]) -> CommandExecutionResult:
+        """
+        Convert a batch result into a CommandExecutionResult
+        """
+        data = result["data"]
+        if data is not None and not isinstance(data, dict):
+            data = {"items": jsonable_encoder(data)}
+        return CommandExecutionResult(success=result["success"], message=result["message"], data=data)
+
     async def parse_transcript(
         self,
         transcript: str,
         project_key: Optional[str] = None
     ) -> TranscriptParseResponse:
         """
-        Parse a Teams meeting transcript for actions using OpenAI
+        Parse a Teams meeting transcript for actions using the LLM.
+
+        Long transcripts are split on speaker turns into overlapping,
+        token-budgeted windows that are parsed concurrently and then merged.
+        """
+        chunks = chunk_transcript(transcript)
+        results = await map_chunks(
+            chunks,
+            lambda chunk, index: self._parse_transcript_chunk(chunk, project_key, index, len(chunks))
+        )
+        return TranscriptParseResponse(actions=merge_actions(results))
+
+    async def stream_transcript(
+        self,
+        transcript: str,
+        project_key: Optional[str] = None
+    ) -> AsyncIterator[CommandResponse]:
+        """
+        Parse a Teams meeting transcript, yielding each command as soon as
+        the LLM finishes writing it
+        """
+        chunks = chunk_transcript(transcript)
+        async for command in stream_chunks(
+            chunks,
+            lambda chunk, index: self._stream_transcript_chunk(chunk, project_key, index, len(chunks))
+        ):
+            yield command
+
+    async def _stream_transcript_chunk(
+        self,
+        transcript: str,
+        project_key: Optional[str],
+        index: int,
+        total: int
+    ) -> AsyncIterator[CommandResponse]:
+        """
+        Stream one window of a transcript, yielding commands as their objects close
+        """
+        prompt = self._build_transcript_prompt(transcript, project_key, index, total)
+        parser = JsonArrayStream()
+        try:
+            async for content in self._stream_llm(prompt):
+                for action in parser.feed(content):
+                    yield CommandResponse(**action)
+            parser.close()
+        except (json.JSONDecodeError, ValueError) as e:
+            raise Exception(f"Failed to parse LLM response as JSON: {str(e)}")
+
+    async def _parse_transcript_chunk(
+        self,
+        transcript: str,
+        project_key: Optional[str],
+        index: int,
+        total: int
+    ) -> List[CommandResponse]:
         """
-        # Construct the prompt for OpenAI
-        prompt = self._build_transcript_prompt(transcript, project_key)
+        Parse one window of a transcript into commands
+        """
+        # Construct the prompt for the LLM
+        prompt = self._build_transcript_prompt(transcript, project_key, index, total)
         
-        # Call OpenAI API
-        response = await self._call_openai(prompt)
+        # Call the LLM
+        response = await self._call_llm(prompt)
         
         # Parse the response
         try:
             parsed_response = json.loads(response)
-            return TranscriptParseResponse(actions=parsed_response)
+            return [CommandResponse(**action) for action in parsed_response]
         except json.JSONDecodeError:
-            raise Exception("Failed to parse OpenAI response as JSON")
-
-    async def _call_openai(self, prompt: str) -> str:
-        """
-        Call the OpenAI API with the given prompt
-        """
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}/chat/completions"
-            
-            data = {
-                "model": "gpt-4",
-                "messages": [
-                    {"role": "system", "content": "You are a helpful assistant that parses commands for Jira task management."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.2
-            }
-            
-            async with session.post(url, headers=self.headers, json=data) as response:
-                if response.status >= 400:
-                    error_text = await response.text()
-                    raise Exception(f"OpenAI API error: {error_text}")
-                
-                result = await response.json()
-                return result["choices"][0]["message"]["content"]
+            raise Exception("Failed to parse LLM response as JSON")
+
+    async def _call_llm(self, prompt: CompiledPrompt, model: Optional[str] = None) -> str:
+        """
+        Run a prompt through the LLM provider, using the largest configured model unless one is given
+        """
+        return await llm.complete(prompt, model or command_cascade.top_model, temperature=0.2)
+
+    async def _stream_llm(self, prompt: CompiledPrompt) -> AsyncIterator[str]:
+        """
+        Stream a prompt through the LLM provider, yielding content deltas
+        """
+        async for content in llm.stream(prompt, command_cascade.top_model, temperature=0.2):
+            yield content
 
     def _build_command_prompt(
         self,
         text: str,
         project_key: Optional[str] = None,
         context: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """
-        Build a prompt for OpenAI to parse a command
-        """
-        prompt = f"""
-        Parse the following command for Jira task management:
-        
-        Command: {text}
+    ) -> CompiledPrompt:
         """
-        
-        if project_key:
-            prompt += f"\nProject: {project_key}"
-        
-        if context:
-            prompt += f"\nContext: {json.dumps(context, indent=2)}"
-        
-        prompt += """
-        
-        Return a JSON object with the following structure:
-        {
-            "action": "query_tasks|update_comment|create_issue|update_task",
-            "details": {
-                // Action-specific details
-            },
-            "confidence": 0.95
-        }
-        
-        For query_tasks, details should include: project_key, status (optional), assignee (optional)
-        For update_comment, details should include: task_id, comment
-        For create_issue, details should include: project_key, summary, description (optional), assignee (optional)
-        For update_task, details should include: task_id, summary (optional), description (optional), status (optional), assignee (optional)
+        Build a prompt for the LLM to parse a command
         """
-        
-        return prompt
+        return COMMAND_PROMPT.render(text=text, project_key=project_key, context=context)
 
     def _build_transcript_prompt(
         self,
         transcript: str,
-        project_key: Optional[str] = None
-    ) -> str:
-        """
-        Build a prompt for OpenAI to parse a Teams meeting transcript
-        """
-        prompt = f"""
-        Parse the following Teams meeting transcript for Jira task management actions:
-        
-        Transcript:
-        {transcript}
+        project_key: Optional[str] = None,
+        index: int = 0,
+        total: int = 1
+    ) -> CompiledPrompt:
         """
-        
-        if project_key:
-            prompt += f"\nProject: {project_key}"
-        
-        prompt += """
-        
-        Return a JSON array of action objects with the following structure:
-        [
-            {
-                "action": "query_tasks|update_comment|create_issue|update_task",
-                "details": {
-                    // Action-specific details
-                },
-                "confidence": 0.95
-            }
-        ]
-        
-        For query_tasks, details should include: project_key, status (optional), assignee (optional)
-        For update_comment, details should include: task_id, comment
-        For create_issue, details should include: project_key, summary, description (optional), assignee (optional)
-        For update_task, details should include: task_id, summary (optional), description (optional), status (optional), assignee (optional)
+        Build a prompt for the LLM to parse a Teams meeting transcript or one part of it
         """
-        
-        return prompt 
\ No newline at end of file
+        part = None
+        if total > 1:
+            part = f"{index + 1} of {total} of a longer transcript; it may start or end mid-conversation"
+        return TRANSCRIPT_PROMPT.render(transcript=transcript, project_key=project_key, part=part)
+
+def validate_command_response(content: str) -> Tuple[Dict[str, Any], str, float]:
+    """
+    Validate an LLM answer, returning the command as a dict, its action and confidence.
+
+    Unknown actions or missing details count as zero confidence, so a cheaper
+    model's incomplete answer is escalated while the last tier's is kept.
+    """
+    try:
+        command = CommandResponse(**json.loads(content))
+    except json.JSONDecodeError:
+        raise InvalidParse("Failed to parse LLM response as JSON")
+    except Exception as e:
+        raise InvalidParse(f"Invalid command from the LLM: {str(e)}")
+    return command.dict(), command.action, required_confidence(command.action, command.details, command.confidence)
+
+def _describe_command(text: str, project_key: Optional[str], context: Optional[Dict[str, Any]]) -> str:
+    description = text
+    if project_key:
+        description += f" [project: {project_key}]"
+    if context:
+        description += f" [context: {compact_json(context)}]"
+    return description
+
+async def _parse_command_batch(
+    requests: List[Tuple[CommandService, str, Optional[str], Optional[Dict[str, Any]]]]
+) -> List[Any]:
+    """
+    Parse a batch of commands with one numbered LLM request
+    """
+    service = requests[0][0]
+    return await parse_numbered_batch(
+        requests,
+        describe=lambda request: _describe_command(*request[1:]),
+        complete=lambda commands, model: service._call_llm(COMMAND_BATCH_PROMPT.render(commands=commands), model),
+        validate=validate_command_response,
+        cascade=command_cascade,
+        parse_single=lambda request: request[0]._parse_single(*request[1:])
+    )
+
+command_batcher = MicroBatcher(_parse_command_batch)
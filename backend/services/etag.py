@@ -0,0 +1,35 @@
+import json
+import hashlib
+from typing import Any
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# Clients may keep the body but must revalidate it with If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+def compute_etag(content: Any) -> str:
+    """
+    Compute a strong ETag from the JSON encoding of a response body
+    """
+    body = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag == etag or tag == f"W/{etag}" for tag in candidates)
+
+def etag_response(request: Request, content: Any) -> Response:
+    """
+    Return the content as JSON with an ETag, or a 304 if the client already has it
+    """
+    content = jsonable_encoder(content)
+    etag = compute_etag(content)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=content, headers=headers)
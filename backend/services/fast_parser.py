@@ -0,0 +1,291 @@
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+from ..models.commands import CommandResponse
+
+ISSUE_KEY = r"(?P<issue_key>[A-Za-z][A-Za-z0-9]+-\d+)"
+# Project keys never contain a hyphen; a word followed by -123 is an issue key
+PROJECT_KEY = r"(?P<project>[A-Za-z][A-Za-z0-9_]+)\b(?!-)"
+POLITE = r"^(?:(?:hey|ok|okay|please|can you|could you)[,\s]+)*"
+SELF_ASSIGNEES = ("me", "myself")
+
+KNOWN_STATUSES = {
+    "to do": "To Do",
+    "todo": "To Do",
+    "open": "To Do",
+    "backlog": "Backlog",
+    "in progress": "In Progress",
+    "progress": "In Progress",
+    "started": "In Progress",
+    "in review": "In Review",
+    "review": "In Review",
+    "code review": "In Review",
+    "blocked": "Blocked",
+    "done": "Done",
+    "complete": "Done",
+    "completed": "Done",
+    "closed": "Done",
+    "resolved": "Done"
+}
+
+ISSUE_TYPES = {
+    "task": "Task",
+    "tasks": "Task",
+    "bug": "Bug",
+    "bugs": "Bug",
+    "story": "Story",
+    "stories": "Story",
+    "issue": "Task",
+    "ticket": "Task",
+    "epic": "Epic",
+    "epics": "Epic"
+}
+
+COMMENT_PATTERN = re.compile(
+    POLITE + r"(?:add\s+(?:a\s+)?comment\s+(?:to|on)|comment\s+on|leave\s+(?:a\s+)?comment\s+on)\s+"
+    + ISSUE_KEY + r"\s*(?:saying|that says|that|with|:|,)?\s*(?P<payload>.+?)$",
+    re.IGNORECASE | re.DOTALL
+)
+STATUS_PATTERN = re.compile(
+    POLITE + r"(?:move|transition|set|change|update|put)\s+" + ISSUE_KEY
+    + r"(?:'s)?(?:\s+status)?\s+(?:to|into|as)\s+(?P<status>[\w\s]+?)$",
+    re.IGNORECASE
+)
+MARK_PATTERN = re.compile(
+    POLITE + r"mark\s+" + ISSUE_KEY + r"\s+as\s+(?P<status>[\w\s]+?)$",
+    re.IGNORECASE
+)
+ASSIGN_PATTERN = re.compile(
+    POLITE + r"assign\s+" + ISSUE_KEY + r"\s+to\s+(?P<assignee>[\w.@\s-]+?)$",
+    re.IGNORECASE
+)
+CREATE_PATTERN = re.compile(
+    POLITE + r"(?:create|add|open|make|file|raise)\s+(?:a\s+|an\s+)?(?:new\s+)?(?P<type>task|bug|story|issue|ticket|epic)"
+    + r"(?:\s+(?:in|for|under)\s+(?:project\s+)?" + PROJECT_KEY + r")?"
+    + r"\s*(?:called|titled|named|saying|for|to|:|,)\s*(?P<summary>.+?)$",
+    re.IGNORECASE | re.DOTALL
+)
+SEARCH_PATTERN = re.compile(
+    POLITE + r"(?:find|show|list|search(?:\s+for)?|get|what are)\s+(?:me\s+)?(?:all\s+)?(?:the\s+)?(?P<mine>my\s+)?"
+    + r"(?:(?P<priority>highest|high|medium|low|lowest)\s+priority\s+)?"
+    + r"(?:(?P<status>open|done|closed|blocked|in progress|to do|in review)\s+)?"
+    + r"(?P<type>tasks|bugs|issues|stories|tickets|epics)"
+    + r"(?:\s+(?:in|for)\s+(?:project\s+)?" + PROJECT_KEY + r")?"
+    + r"(?:\s+(?:assigned\s+to|for)\s+(?P<assignee>[\w.@\s-]+?))?$",
+    re.IGNORECASE
+)
+
+DEFAULT_MIN_CONFIDENCE = float(os.getenv("FAST_PARSE_MIN_CONFIDENCE", "0.9"))
+
+@dataclass
+class ParsedCommand:
+    """
+    Structured command recognised by the local grammar
+    """
+    kind: str  # create, comment, update, search
+    confidence: float
+    issue_key: Optional[str] = None
+    project_key: Optional[str] = None
+    summary: Optional[str] = None
+    comment: Optional[str] = None
+    issue_type: Optional[str] = None
+    status: Optional[str] = None
+    assignee: Optional[str] = None
+    priority: Optional[str] = None
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+    def to_jira_action(self) -> "JiraAction":
+        """
+        Convert to the JiraAction schema used by CommandParser
+        """
+        # Imported here because command_parser uses this module
+        from .command_parser import JiraAction
+        if self.kind == "search":
+            return JiraAction(action_type="search", jql=self.to_jql())
+        return JiraAction(
+            action_type=self.kind,
+            project_key=self.project_key,
+            issue_key=self.issue_key,
+            summary=self.summary,
+            comment=self.comment,
+            issue_type=self.issue_type,
+            fields=self.fields or None
+        )
+
+    def to_command_response(self) -> CommandResponse:
+        """
+        Convert to the CommandResponse schema used by CommandService
+        """
+        if self.kind == "create":
+            action, details = "create_issue", {"project_key": self.project_key, "summary": self.summary}
+        elif self.kind == "comment":
+            action, details = "update_comment", {"task_id": self.issue_key, "comment": self.comment}
+        elif self.kind == "update":
+            action, details = "update_task", {"task_id": self.issue_key, **self.fields}
+        else:
+            action, details = "query_tasks", {"project_key": self.project_key}
+            if self.status:
+                details["status"] = self.status
+            if self.assignee:
+                details["assignee"] = "currentUser()" if self.assignee.lower() in SELF_ASSIGNEES else self.assignee
+        return CommandResponse(action=action, details=details, confidence=self.confidence)
+
+    def to_jql(self) -> str:
+        clauses = []
+        if self.project_key:
+            clauses.append(f"project = {self.project_key}")
+        if self.issue_type:
+            clauses.append(f"type = {self.issue_type}")
+        if self.priority:
+            clauses.append(f"priority = {self.priority}")
+        if self.status:
+            clauses.append(f'status = "{self.status}"')
+        if self.assignee:
+            assignee = "currentUser()" if self.assignee.lower() in SELF_ASSIGNEES else f'"{self.assignee}"'
+            clauses.append(f"assignee = {assignee}")
+        return " AND ".join(clauses)
+
+QUOTES = {'"': '"', "'": "'", "“": "”"}
+
+def _clean_payload(text: str) -> str:
+    text = text.strip().rstrip(".")
+    if len(text) >= 2 and QUOTES.get(text[0]) == text[-1]:
+        # Quoted payloads are used verbatim
+        return text[1:-1].strip()
+    return text[:1].upper() + text[1:]
+
+def _resolve_project(spoken: Optional[str], context_key: Optional[str]) -> Tuple[Optional[str], float]:
+    """
+    Pick the project key and how sure we are of it.
+
+    A spoken key is trusted when it was transcribed in capitals or matches the
+    project context; a lowercase word after "in" may just be ordinary speech.
+    """
+    if spoken is None:
+        # Without any project the command cannot be executed as-is
+        return (context_key.upper(), 1.0) if context_key else (None, 0.5)
+    if spoken.isupper() or (context_key and spoken.upper() == context_key.upper()):
+        return spoken.upper(), 1.0
+    return spoken.upper(), 0.7
+
+def _normalize_status(text: str) -> Optional[str]:
+    return KNOWN_STATUSES.get(" ".join(text.lower().split()))
+
+class FastCommandParser:
+    """
+    Rule-based parser for common, tightly structured voice commands.
+
+    Recognises issue keys, verbs, statuses and quoted payloads locally so the
+    LLM is only called when the grammar is unsure.
+    """
+
+    def __init__(self, min_confidence: float = DEFAULT_MIN_CONFIDENCE):
+        self.min_confidence = min_confidence
+        self.hits = 0
+        self.low_confidence = 0
+        self.misses = 0
+
+    def match(self, text: str, project_key: Optional[str] = None) -> Optional[ParsedCommand]:
+        """
+        Match text against the grammar, returning a command with its confidence
+        """
+        text = " ".join(text.strip().split()).rstrip(".")
+        if not text:
+            return None
+
+        match = COMMENT_PATTERN.match(text)
+        if match:
+            comment = _clean_payload(match.group("payload"))
+            return ParsedCommand(
+                kind="comment",
+                issue_key=match.group("issue_key").upper(),
+                comment=comment,
+                confidence=0.97 if comment else 0.3
+            )
+
+        match = STATUS_PATTERN.match(text) or MARK_PATTERN.match(text)
+        if match:
+            status = _normalize_status(match.group("status"))
+            return ParsedCommand(
+                kind="update",
+                issue_key=match.group("issue_key").upper(),
+                status=status or match.group("status").strip().title(),
+                fields={"status": status or match.group("status").strip().title()},
+                # Unknown status names are left to the LLM to interpret
+                confidence=0.96 if status else 0.6
+            )
+
+        match = ASSIGN_PATTERN.match(text)
+        if match:
+            assignee = match.group("assignee").strip()
+            return ParsedCommand(
+                kind="update",
+                issue_key=match.group("issue_key").upper(),
+                assignee=assignee,
+                fields={"assignee": {"name": assignee}},
+                # Assigning to the speaker needs their account id, which only the LLM path looks up
+                confidence=0.5 if assignee.lower() in SELF_ASSIGNEES else 0.92
+            )
+
+        match = CREATE_PATTERN.match(text)
+        if match:
+            project, project_confidence = _resolve_project(match.group("project"), project_key)
+            summary = _clean_payload(match.group("summary"))
+            return ParsedCommand(
+                kind="create",
+                project_key=project,
+                summary=summary,
+                issue_type=ISSUE_TYPES[match.group("type").lower()],
+                confidence=min(0.95, project_confidence) if summary else 0.3
+            )
+
+        match = SEARCH_PATTERN.match(text)
+        if match:
+            project, project_confidence = _resolve_project(match.group("project"), project_key)
+            issue_type = match.group("type").lower()
+            status = match.group("status")
+            assignee = match.group("assignee").strip() if match.group("assignee") else None
+            confidence = min(0.93, project_confidence)
+            if match.group("mine"):
+                # "my bugs" are the speaker's; "my bugs assigned to Sam" contradicts itself
+                if assignee and assignee.lower() not in SELF_ASSIGNEES:
+                    confidence = 0.5
+                assignee = assignee or "me"
+            return ParsedCommand(
+                kind="search",
+                project_key=project,
+                issue_type=ISSUE_TYPES.get(issue_type) if issue_type not in ("issues", "tickets") else None,
+                priority=match.group("priority").title() if match.group("priority") else None,
+                status=_normalize_status(status) if status else None,
+                assignee=assignee,
+                confidence=confidence
+            )
+
+        return None
+
+    def parse(self, text: str, project_key: Optional[str] = None) -> Optional[ParsedCommand]:
+        """
+        Get a confidently parsed command, or None when the LLM should decide
+        """
+        command = self.match(text, project_key)
+        if command is None:
+            self.misses += 1
+            return None
+        if command.confidence < self.min_confidence:
+            self.low_confidence += 1
+            return None
+        self.hits += 1
+        return command
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.low_confidence + self.misses
+        return {
+            "hits": self.hits,
+            "low_confidence": self.low_confidence,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "min_confidence": self.min_confidence
+        }
+
+fast_parser = FastCommandParser()
@@ -0,0 +1,150 @@
+import os
+import asyncio
+import aiohttp
+from typing import Optional, Dict, Any
+
+class HttpPool:
+    """
+    Shared aiohttp session with a bounded, keep-alive connection pool.
+
+    One pool is opened per upstream host for the lifetime of the app; services
+    borrow its session instead of opening a ClientSession per call.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+        dns_cache_ttl: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None
+    ):
+        prefix = f"{name.upper()}_HTTP"
+        self.name = name
+        self.limit = limit or int(os.getenv(f"{prefix}_POOL_LIMIT", "100"))
+        self.limit_per_host = limit_per_host or int(os.getenv(f"{prefix}_POOL_LIMIT_PER_HOST", "20"))
+        self.keepalive_timeout = keepalive_timeout or float(os.getenv(f"{prefix}_KEEPALIVE_TIMEOUT", "30"))
+        self.dns_cache_ttl = dns_cache_ttl or int(os.getenv(f"{prefix}_DNS_CACHE_TTL", "300"))
+        self.connect_timeout = connect_timeout or float(os.getenv(f"{prefix}_CONNECT_TIMEOUT", "5"))
+        self.total_timeout = total_timeout or float(os.getenv(f"{prefix}_TOTAL_TIMEOUT", "30"))
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = asyncio.Lock()
+        self.requests = 0
+        self.request_errors = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.prewarmed = 0
+        self.prewarm_error: Optional[str] = None
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self.requests += 1
+
+        async def on_request_exception(session, context, params):
+            self.request_errors += 1
+
+        async def on_connection_create_end(session, context, params):
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.connections_reused += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace
+
+    async def start(self) -> aiohttp.ClientSession:
+        """
+        Open the pooled session if it is not already open
+        """
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                    use_dns_cache=True
+                )
+                timeout = aiohttp.ClientTimeout(
+                    total=self.total_timeout,
+                    connect=self.connect_timeout
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=timeout,
+                    trace_configs=[self._trace_config()]
+                )
+            return self._session
+
+    async def prewarm(self, url: str, connections: int = 1) -> int:
+        """
+        Open keep-alive connections to `url` ahead of the first real request.
+
+        DNS, TCP and TLS setup happen here instead of on a user's request.
+        Any response counts, since only the connection matters; failures are
+        recorded rather than raised. Returns the number of connections warmed.
+        """
+        session = await self.start()
+
+        async def warm() -> bool:
+            try:
+                async with session.head(url, allow_redirects=False) as response:
+                    await response.read()
+                return True
+            except Exception as e:
+                self.prewarm_error = f"{type(e).__name__}: {str(e)}"
+                return False
+
+        results = await asyncio.gather(*(warm() for _ in range(connections)))
+        warmed = sum(results)
+        self.prewarmed += warmed
+        return warmed
+
+    async def session(self) -> aiohttp.ClientSession:
+        """
+        Get the pooled session, opening it lazily when used outside the app lifespan
+        """
+        if self._session is None or self._session.closed:
+            return await self.start()
+        return self._session
+
+    async def close(self):
+        """
+        Close the pooled session and release its connections
+        """
+        async with self._lock:
+            if self._session is not None and not self._session.closed:
+                await self._session.close()
+            self._session = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics
+        """
+        stats = {
+            "name": self.name,
+            "open": self._session is not None and not self._session.closed,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "requests": self.requests,
+            "request_errors": self.request_errors,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "prewarmed": self.prewarmed,
+            "prewarm_error": self.prewarm_error
+        }
+        if stats["open"]:
+            connector = self._session.connector
+            stats["idle_connections"] = sum(len(conns) for conns in connector._conns.values())
+            stats["active_connections"] = len(connector._acquired)
+        return stats
+
+# Shared pool for Jira REST traffic, opened and closed by the app lifespan
+jira_http_pool = HttpPool("jira")
@@ -0,0 +1,35 @@
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional
+from .ttl_cache import TTLCache
+
+# Short-lived issue snapshots for reads; every write to an issue drops its entry
+issue_snapshot_cache = TTLCache(
+    ttl=float(os.getenv("ISSUE_CACHE_TTL", "30")),
+    max_entries=int(os.getenv("ISSUE_CACHE_MAX_ENTRIES", "2000"))
+)
+
+def issue_cache_key(site: str, issue_key: str) -> str:
+    return f"issue:{site}:{issue_key.upper()}"
+
+async def get_issue_snapshot(
+    site: str,
+    issue_key: str,
+    loader: Callable[[], Awaitable[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """
+    Get an issue snapshot, fetching it through `loader` on a miss
+    """
+    return await issue_snapshot_cache.get_or_load(issue_cache_key(site, issue_key), loader)
+
+def peek_issue_snapshot(site: str, issue_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a fresh cached snapshot without fetching
+    """
+    entry = issue_snapshot_cache.get(issue_cache_key(site, issue_key))
+    return entry.value if entry is not None else None
+
+def invalidate_issue(site: str, issue_key: str):
+    """
+    Drop the cached snapshot after a write to the issue
+    """
+    issue_snapshot_cache.invalidate(issue_cache_key(site, issue_key))
@@ -1,7 +1,34 @@
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import AsyncIterator, List, Dict, Any, Optional
 from jira import JIRA
 import os
+import json
 from .command_parser import JiraAction
+from .jira_executor import run_blocking
+from .project_cache import get_cached_projects, project_cache, project_cache_key
+from .issue_cache import get_issue_snapshot, peek_issue_snapshot, invalidate_issue
+from .jira_prefetch import (
+    find_lookup_issue_keys,
+    find_project_keys,
+    get_prefetched,
+    peek_prefetched,
+    invalidate_prefetched,
+    start_prefetch
+)
+from .batch_executor import (
+    BULK_CREATE_LIMIT,
+    DEFAULT_BATCH_CONCURRENCY,
+    chunked,
+    group_by,
+    gather_bounded,
+    success_result,
+    error_result
+)
+from .jira_search import SEARCH_FIELDS, DEFAULT_PAGE_SIZE, paginate_issues, summarize_issue
+
+# Fields kept in issue snapshots for reads that cannot be avoided
+SNAPSHOT_FIELDS = "summary,status,assignee,issuetype,project"
+DEFAULT_ISSUE_TYPE = "Task"
 
 class JiraClient:
     def __init__(self):
@@ -14,27 +41,66 @@ class JiraClient:
             
         self.client = JIRA(
             server=self.server_url,
-            basic_auth=(self.email, self.api_token)
+            basic_auth=(self.email, self.api_token),
+            # Throttled requests are retried by the Jira scheduler, not inside worker threads
+            max_retries=0
         )
     
+    async def _run(self, func, *args, **kwargs):
+        """
+        Run a blocking python-jira call off the event loop
+        """
+        return await run_blocking(self.server_url, func, *args, **kwargs)
+    
     async def get_projects(self) -> List[Dict[str, Any]]:
         """
-        Get list of accessible Jira projects
+        Get list of accessible Jira projects, served from the project cache
         """
         try:
-            projects = self.client.projects()
-            return [
-                {
-                    "id": project.id,
-                    "key": project.key,
-                    "name": project.name,
-                    "description": getattr(project, "description", None)
-                }
-                for project in projects
-            ]
+            return await get_cached_projects(self.server_url, self.email, self._fetch_projects)
         except Exception as e:
             raise Exception(f"Failed to fetch projects: {str(e)}")
     
+    async def _fetch_projects(self) -> List[Dict[str, Any]]:
+        """
+        Fetch the project list from Jira
+        """
+        projects = await self._run(self.client.projects)
+        return [
+            {
+                "id": project.id,
+                "key": project.key,
+                "name": project.name,
+                "description": getattr(project, "description", None)
+            }
+            for project in projects
+        ]
+    
+    def prefetch(self, text: str, project_key: Optional[str] = None) -> asyncio.Task:
+        """
+        Speculatively fetch what executing a command about `text` will need.
+
+        Meant to run while the LLM parses the same text: issue snapshots and
+        transitions for the issue keys it mentions, and metadata for the
+        projects it names, land in the caches that execute_action reads.
+        Issues that are only commented on are skipped, since adding a comment
+        reads neither.
+        """
+        issue_keys = find_lookup_issue_keys(text)
+        entry = project_cache.get(project_cache_key(self.server_url, self.email))
+        known = [project["key"] for project in entry.value] if entry is not None else []
+        project_keys = find_project_keys(text, known + [key.rsplit("-", 1)[0] for key in issue_keys])
+        if project_key and project_key.upper() not in project_keys:
+            project_keys.insert(0, project_key.upper())
+        
+        lookups = []
+        for issue_key in issue_keys:
+            lookups.append(lambda issue_key=issue_key: self.get_issue_snapshot(issue_key))
+            lookups.append(lambda issue_key=issue_key: self.get_transitions(issue_key))
+        for key in project_keys:
+            lookups.append(lambda key=key: self.get_project(key))
+        return start_prefetch(lookups)
+    
     async def execute_action(self, action: JiraAction) -> Dict[str, Any]:
         """
         Execute a Jira action and return the result
@@ -54,24 +120,106 @@ class JiraClient:
         except Exception as e:
             raise Exception(f"Failed to execute action: {str(e)}")
     
-    async def _create_issue(self, action: JiraAction) -> Dict[str, Any]:
+    async def execute_actions(
+        self,
+        actions: List[JiraAction],
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> List[Dict[str, Any]]:
         """
-        Create a new Jira issue
+        Execute many actions, returning one result per action in input order.
+
+        Create actions are grouped by project and sent through Jira's bulk-create
+        endpoint; the remaining actions run with bounded concurrency.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(actions)
+        others = []
+        for index, action in enumerate(actions):
+            if action.action_type != "create":
+                others.append((index, action))
+            elif not action.project_key:
+                results[index] = error_result(ValueError("Project key is required for creating issues"))
+        
+        async def run_creates():
+            groups = group_by(
+                actions,
+                lambda action: action.project_key if action.action_type == "create" else None
+            )
+            groups.pop(None, None)
+            chunks = [chunk for group in groups.values() for chunk in chunked(group, BULK_CREATE_LIMIT)]
+            chunk_results = await gather_bounded(
+                [lambda chunk=chunk: self._bulk_create([action for _, action in chunk]) for chunk in chunks],
+                max_concurrency
+            )
+            for chunk, chunk_result in zip(chunks, chunk_results):
+                for position, (index, _) in enumerate(chunk):
+                    if chunk_result["success"]:
+                        results[index] = chunk_result["data"][position]
+                    else:
+                        results[index] = chunk_result
+        
+        async def run_others():
+            other_results = await gather_bounded(
+                [lambda action=action: self.execute_action(action) for _, action in others],
+                max_concurrency
+            )
+            for (index, _), result in zip(others, other_results):
+                results[index] = result
+        
+        await asyncio.gather(run_creates(), run_others())
+        return results
+    
+    async def _bulk_create(self, actions: List[JiraAction]) -> List[Dict[str, Any]]:
+        """
+        Create up to BULK_CREATE_LIMIT issues in a single Jira round-trip
+        """
+        created = await self._run(
+            self.client.create_issues,
+            field_list=[self._issue_fields(action) for action in actions],
+            prefetch=False
+        )
+        results = []
+        for item in created:
+            if item["status"] == "Success":
+                issue = item["issue"]
+                results.append(success_result({"key": issue.key, "self": issue.self, "id": issue.id}))
+            else:
+                results.append(error_result(Exception(str(item["error"]))))
+        return results
+    
+    def _issue_fields(self, action: JiraAction) -> Dict[str, Any]:
+        """
+        Build the Jira fields for a create action
         """
-        if not action.project_key:
-            raise ValueError("Project key is required for creating issues")
-            
         issue_dict = {
             "project": {"key": action.project_key},
             "summary": action.summary,
             "description": action.description,
-            "issuetype": {"name": "Task"}
+            "issuetype": {"name": self._issue_type(action.project_key)}
         }
         
         if action.fields:
             issue_dict.update(action.fields)
+        
+        return issue_dict
+    
+    def _issue_type(self, project_key: Optional[str]) -> str:
+        """
+        Pick the issue type for new issues, using prefetched project metadata if present
+        """
+        project = peek_prefetched("project", self.server_url, project_key) if project_key else None
+        if not project or DEFAULT_ISSUE_TYPE in project["issue_types"]:
+            return DEFAULT_ISSUE_TYPE
+        # Projects without a Task type fall back to their first standard type
+        return project["issue_types"][0] if project["issue_types"] else DEFAULT_ISSUE_TYPE
+    
+    async def _create_issue(self, action: JiraAction) -> Dict[str, Any]:
+        """
+        Create a new Jira issue
+        """
+        if not action.project_key:
+            raise ValueError("Project key is required for creating issues")
             
-        new_issue = self.client.create_issue(fields=issue_dict)
+        new_issue = await self._run(self.client.create_issue, fields=self._issue_fields(action))
         return {
             "key": new_issue.key,
             "self": new_issue.self,
@@ -85,17 +233,50 @@ class JiraClient:
         if not action.issue_key:
             raise ValueError("Issue key is required for updates")
             
-        issue = self.client.issue(action.issue_key)
+        if not action.fields:
+            # Nothing to write, so this is a genuine read
+            snapshot = await self.get_issue_snapshot(action.issue_key)
+            return {
+                "key": snapshot["key"],
+                "self": snapshot["self"],
+                "id": snapshot["id"]
+            }
+        
+        # Write straight to PUT /issue/{key} without fetching the issue first
+        snapshot = peek_issue_snapshot(self.server_url, action.issue_key)
+        fields = dict(action.fields)
+        # Status cannot be set through the edit endpoint; it needs a workflow transition
+        status = fields.pop("status", None)
+        
+        async def write():
+            if fields:
+                await self._run(self._put_issue_fields, action.issue_key, fields)
+            if status:
+                await self._transition_issue(action.issue_key, status)
+        
+        if snapshot is None:
+            # The edit endpoint returns no body, so look the id up alongside the write
+            snapshot, _ = await asyncio.gather(self.get_issue_snapshot(action.issue_key), write())
+        else:
+            await write()
+        invalidate_issue(self.server_url, action.issue_key)
         
-        if action.fields:
-            issue.update(fields=action.fields)
-            
         return {
-            "key": issue.key,
-            "self": issue.self,
-            "id": issue.id
+            "key": action.issue_key,
+            "self": snapshot["self"],
+            "id": snapshot["id"]
         }
     
+    def _put_issue_fields(self, issue_key: str, fields: Dict[str, Any]):
+        """
+        Edit fields with PUT /issue/{key} on python-jira's authenticated session.
+        
+        python-jira only exposes edits on a fetched Issue resource, so this is
+        the one place that reaches into its session to write without the fetch.
+        """
+        url = self.client._get_url(f"issue/{issue_key}")
+        self.client._session.put(url, data=json.dumps({"fields": fields}))
+    
     async def _add_comment(self, action: JiraAction) -> Dict[str, Any]:
         """
         Add a comment to a Jira issue
@@ -106,8 +287,9 @@ class JiraClient:
         if not action.comment:
             raise ValueError("Comment text is required")
             
-        issue = self.client.issue(action.issue_key)
-        comment = issue.add_comment(action.comment)
+        # POST /issue/{key}/comment directly; python-jira accepts the key as-is
+        comment = await self._run(self.client.add_comment, action.issue_key, action.comment)
+        invalidate_issue(self.server_url, action.issue_key)
         
         return {
             "id": comment.id,
@@ -115,6 +297,68 @@ class JiraClient:
             "created": comment.created
         }
     
+    async def _transition_issue(self, issue_key: str, status: Any):
+        """
+        Move an issue to a status through the matching workflow transition
+        """
+        name = status.get("name", "") if isinstance(status, dict) else str(status)
+        transitions = await self.get_transitions(issue_key)
+        transition = next(
+            (
+                transition for transition in transitions
+                if name.lower() in (transition["name"].lower(), transition["to"].lower())
+            ),
+            None
+        )
+        if transition is None:
+            raise ValueError(f"No transition to '{name}' is available for {issue_key}")
+        await self._run(self.client.transition_issue, issue_key, transition["id"])
+        # The new status has its own set of transitions
+        invalidate_prefetched("transitions", self.server_url, issue_key)
+    
+    async def get_transitions(self, issue_key: str) -> List[Dict[str, Any]]:
+        """
+        Get the workflow transitions available to an issue, from the prefetch cache if warm
+        """
+        async def fetch_transitions() -> List[Dict[str, Any]]:
+            transitions = await self._run(self.client.transitions, issue_key)
+            return [
+                {
+                    "id": transition["id"],
+                    "name": transition["name"],
+                    "to": transition.get("to", {}).get("name", "")
+                }
+                for transition in transitions
+            ]
+        
+        return await get_prefetched("transitions", self.server_url, issue_key, fetch_transitions)
+    
+    async def get_project(self, project_key: str) -> Dict[str, Any]:
+        """
+        Get a project's metadata, from the prefetch cache if warm
+        """
+        async def fetch_project() -> Dict[str, Any]:
+            project = await self._run(self.client.project, project_key)
+            issue_types = project.raw.get("issueTypes", [])
+            return {
+                "id": project.id,
+                "key": project.key,
+                "name": project.name,
+                "issue_types": [issue_type["name"] for issue_type in issue_types if not issue_type.get("subtask")]
+            }
+        
+        return await get_prefetched("project", self.server_url, project_key, fetch_project)
+    
+    async def get_issue_snapshot(self, issue_key: str) -> Dict[str, Any]:
+        """
+        Get a short-lived cached snapshot of an issue's key fields
+        """
+        async def fetch_issue() -> Dict[str, Any]:
+            issue = await self._run(self.client.issue, issue_key, fields=SNAPSHOT_FIELDS)
+            return issue.raw
+        
+        return await get_issue_snapshot(self.server_url, issue_key, fetch_issue)
+    
     async def _search_issues(self, action: JiraAction) -> List[Dict[str, Any]]:
         """
         Search for Jira issues using JQL
@@ -122,13 +366,21 @@ class JiraClient:
         if not action.jql:
             raise ValueError("JQL query is required for search")
             
-        issues = self.client.search_issues(action.jql)
-        return [
-            {
-                "key": issue.key,
-                "summary": issue.fields.summary,
-                "status": issue.fields.status.name,
-                "assignee": issue.fields.assignee.displayName if issue.fields.assignee else None
-            }
-            for issue in issues
-        ] 
\ No newline at end of file
+        return [issue async for issue in self.iter_issues(action.jql)]
+    
+    async def iter_issues(self, jql: str, page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream issues matching a JQL query page by page with field projection
+        """
+        async def fetch_page(start_at: int, next_page_token: Optional[str], max_results: int) -> Dict[str, Any]:
+            return await self._run(
+                self.client.search_issues,
+                jql,
+                startAt=start_at,
+                maxResults=max_results,
+                fields=SEARCH_FIELDS,
+                json_result=True
+            )
+        
+        async for issue in paginate_issues(fetch_page, page_size):
+            yield summarize_issue(issue) 
\ No newline at end of file
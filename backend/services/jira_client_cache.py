@@ -0,0 +1,111 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+@dataclass
+class CachedClient:
+    client: Any
+    user_id: str
+    expires_at: float
+
+class JiraClientCache:
+    """
+    Bounded cache of authenticated Jira clients keyed by session token.
+
+    Entries expire with the stored Jira access token (minus a safety margin)
+    or after `max_ttl`, whichever comes first, and are dropped for a user
+    whenever their Jira tokens are refreshed. Safe to use from worker threads.
+    """
+
+    def __init__(self, max_entries: int = 500, max_ttl: float = 900, expiry_margin: float = 60):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self.expiry_margin = expiry_margin
+        self._entries: "OrderedDict[str, CachedClient]" = OrderedDict()
+        self._keys_by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _key(self, token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Any]:
+        """
+        Get the cached client for a session token, or None on a miss
+        """
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() >= entry.expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.client
+
+    def put(self, token: str, user_id: str, client: Any, token_expires_at: Optional[float] = None):
+        """
+        Cache a client until its Jira access token is about to expire
+        """
+        expires_at = time.time() + self.max_ttl
+        if token_expires_at:
+            expires_at = min(expires_at, token_expires_at - self.expiry_margin)
+        key = self._key(token)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = CachedClient(client=client, user_id=user_id, expires_at=expires_at)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: str):
+        """
+        Drop every cached client for a user, e.g. after their Jira tokens refresh
+        """
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._keys_by_user.get(entry.user_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_user[entry.user_id]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+jira_client_cache = JiraClientCache(
+    max_entries=int(os.getenv("JIRA_CLIENT_CACHE_MAX_ENTRIES", "500")),
+    max_ttl=float(os.getenv("JIRA_CLIENT_CACHE_MAX_TTL", "900"))
+)
@@ -0,0 +1,63 @@
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Any, TypeVar
+from urllib.parse import urlparse
+from jira.exceptions import JIRAError
+from .jira_scheduler import RETRYABLE_STATUSES, is_idempotent, jira_scheduler, retryable_error
+
+T = TypeVar("T")
+
+# One bounded thread pool per Jira host so a slow site cannot starve the others
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+def get_executor(server_url: str) -> ThreadPoolExecutor:
+    """
+    Get the thread pool used for blocking python-jira calls against a host
+    """
+    host = urlparse(server_url or "").netloc or server_url or "default"
+    with _executors_lock:
+        executor = _executors.get(host)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("JIRA_CLIENT_MAX_WORKERS", "16")),
+                thread_name_prefix=f"jira-{host}"
+            )
+            _executors[host] = executor
+        return executor
+
+def _call_translating_errors(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    try:
+        return func(*args, **kwargs)
+    except JIRAError as e:
+        if e.status_code in RETRYABLE_STATUSES:
+            headers = e.response.headers if e.response is not None else {}
+            request = getattr(e.response, "request", None)
+            # python-jira hides which method a call sends, so it is read off the failed request
+            if e.status_code == 429 or is_idempotent(getattr(request, "method", None)):
+                raise retryable_error(e.status_code, str(e), headers.get("Retry-After")) from e
+        raise
+
+async def run_blocking(server_url: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a synchronous Jira call in the host's thread pool without blocking the event loop.
+
+    Calls go through the Jira request scheduler so throttled responses are
+    paced and retried centrally.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor(server_url)
+    call = partial(_call_translating_errors, func, *args, **kwargs)
+    return await jira_scheduler.run(server_url, lambda: loop.run_in_executor(executor, call))
+
+def shutdown_executors():
+    """
+    Shut down all per-host thread pools
+    """
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=False)
+        _executors.clear()
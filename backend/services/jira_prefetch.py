@@ -0,0 +1,108 @@
+import os
+import re
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from .ttl_cache import TTLCache
+
+# Speech-to-text often lowercases keys, so match either case and normalise
+ISSUE_KEY_PATTERN = re.compile(r"\b([A-Za-z][A-Za-z0-9]+)-(\d+)\b")
+WORD_PATTERN = re.compile(r"\b[A-Za-z][A-Za-z0-9]+\b")
+# Adding a comment posts straight to the issue without reading it or its workflow
+COMMENT_TARGET_PATTERN = re.compile(r"\bcomment\s+(?:(?:to|on)\s+)?[A-Za-z][A-Za-z0-9]+-\d+\b", re.IGNORECASE)
+
+MAX_PREFETCH_ISSUES = int(os.getenv("JIRA_PREFETCH_MAX_ISSUES", "5"))
+MAX_PREFETCH_PROJECTS = int(os.getenv("JIRA_PREFETCH_MAX_PROJECTS", "3"))
+
+# Speculative lookups only need to outlive the LLM call that runs alongside them
+prefetch_cache = TTLCache(
+    ttl=float(os.getenv("JIRA_PREFETCH_TTL", "15")),
+    max_entries=int(os.getenv("JIRA_PREFETCH_MAX_ENTRIES", "2000"))
+)
+
+_tasks: Set[asyncio.Task] = set()
+_counters = {"started": 0, "lookups": 0, "errors": 0}
+
+def find_issue_keys(text: str, limit: int = MAX_PREFETCH_ISSUES) -> List[str]:
+    """
+    Find issue keys such as PROJ-123 in order of first mention
+    """
+    keys: List[str] = []
+    for match in ISSUE_KEY_PATTERN.finditer(text or ""):
+        key = match.group(0).upper()
+        if key not in keys:
+            keys.append(key)
+        if len(keys) >= limit:
+            break
+    return keys
+
+def find_lookup_issue_keys(text: str, limit: int = MAX_PREFETCH_ISSUES) -> List[str]:
+    """
+    Find the issue keys whose snapshot and transitions a command will read, skipping comment targets
+    """
+    return find_issue_keys(COMMENT_TARGET_PATTERN.sub(" ", text or ""), limit)
+
+def find_project_keys(text: str, known: Iterable[str], limit: int = MAX_PREFETCH_PROJECTS) -> List[str]:
+    """
+    Find mentions of known project keys, including the prefixes of issue keys
+    """
+    known_keys = {key.upper() for key in known}
+    keys: List[str] = []
+    candidates = [match.group(1) for match in ISSUE_KEY_PATTERN.finditer(text or "")]
+    candidates += WORD_PATTERN.findall(text or "")
+    for candidate in candidates:
+        key = candidate.upper()
+        if key in known_keys and key not in keys:
+            keys.append(key)
+        if len(keys) >= limit:
+            break
+    return keys
+
+def prefetch_key(kind: str, site: str, key: str) -> str:
+    return f"{kind}:{site}:{key.upper()}"
+
+async def get_prefetched(
+    kind: str,
+    site: str,
+    key: str,
+    loader: Callable[[], Awaitable[Any]]
+) -> Any:
+    """
+    Get a speculatively fetched value, joining an in-flight prefetch or loading it on a miss
+    """
+    return await prefetch_cache.get_or_load(prefetch_key(kind, site, key), loader)
+
+def peek_prefetched(kind: str, site: str, key: str) -> Optional[Any]:
+    """
+    Get a fresh prefetched value without fetching
+    """
+    entry = prefetch_cache.get(prefetch_key(kind, site, key))
+    return entry.value if entry is not None else None
+
+def invalidate_prefetched(kind: str, site: str, key: str):
+    prefetch_cache.invalidate(prefetch_key(kind, site, key))
+
+def start_prefetch(lookups: List[Callable[[], Awaitable[Any]]]) -> asyncio.Task:
+    """
+    Run lookups concurrently in the background.
+
+    Prefetching is speculative: failures are counted and dropped, and the
+    caller never has to await the returned task.
+    """
+    _counters["started"] += 1
+    _counters["lookups"] += len(lookups)
+
+    async def run():
+        results = await asyncio.gather(*(lookup() for lookup in lookups), return_exceptions=True)
+        _counters["errors"] += sum(1 for result in results if isinstance(result, Exception))
+
+    task = asyncio.ensure_future(run())
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+def prefetch_stats() -> Dict[str, Any]:
+    return {
+        **_counters,
+        "in_flight": len(_tasks),
+        "cache": prefetch_cache.stats()
+    }
@@ -0,0 +1,310 @@
+import os
+import re
+import time
+import random
+import asyncio
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+from urllib.parse import urlparse
+
+T = TypeVar("T")
+
+class RetryableError(Exception):
+    """
+    An upstream failure worth retrying, optionally with a server-provided delay
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class RateLimited(RetryableError):
+    """
+    Jira answered 429 Too Many Requests
+    """
+
+# Statuses that mean "slow down" rather than "this request is wrong"
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+# Methods that can be resent after a 5xx; a POST that timed out at the gateway may already have been applied
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+def is_idempotent(method: Optional[str]) -> bool:
+    return (method or "").upper() in IDEMPOTENT_METHODS
+
+# Atlassian Cloud's API gateway serves every tenant from one host; the cloud id in the path names the site
+CLOUD_SITE_PATH = re.compile(r"^/ex/jira/([^/]+)")
+
+def site_key(url: Optional[str]) -> str:
+    """
+    Name the Jira site a URL belongs to: its host, plus the cloud id for gateway URLs
+    """
+    parsed = urlparse(url or "")
+    host = parsed.netloc or url or "default"
+    match = CLOUD_SITE_PATH.match(parsed.path)
+    return f"{host}/ex/jira/{match.group(1)}" if match else host
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def retryable_error(status: int, message: str, retry_after: Optional[str] = None) -> RetryableError:
+    """
+    Build the retryable error for an HTTP status in RETRYABLE_STATUSES
+    """
+    error_class = RateLimited if status == 429 else RetryableError
+    return error_class(message, parse_retry_after(retry_after))
+
+class TokenBucket:
+    """
+    Token bucket whose refill rate backs off on throttling and recovers on success
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.max_rate = rate
+        self.min_rate = max(rate * 0.1, 0.1)
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + self.max_rate * 0.02)
+
+    def on_throttled(self):
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * 0.7)
+        self.tokens = min(self.tokens, 0)
+
+class SiteScheduler:
+    """
+    Schedules requests to one Jira site.
+
+    Requests pass a token bucket, a pause window set by Retry-After and an
+    AIMD concurrency limit: the limit grows while latency stays under target
+    and halves on throttling or upstream errors.
+    """
+
+    def __init__(
+        self,
+        site: str,
+        rate: float,
+        burst: float,
+        min_concurrency: int,
+        max_concurrency: int,
+        target_latency: float,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float
+    ):
+        self.site = site
+        self.bucket = TokenBucket(rate, burst)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.concurrency_limit = float(max_concurrency)
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.queued = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._wait_times: Deque[float] = deque(maxlen=1000)
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self.retries = 0
+
+    async def _acquire(self) -> float:
+        started = time.monotonic()
+        self.queued += 1
+        try:
+            while True:
+                pause = self.paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+                await self._acquire_slot()
+                break
+            try:
+                await self.bucket.acquire()
+            except BaseException:
+                self._release()
+                raise
+        finally:
+            self.queued -= 1
+        waited = time.monotonic() - started
+        self._wait_times.append(waited)
+        return waited
+
+    async def _acquire_slot(self):
+        while self.in_flight >= int(self.concurrency_limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Pass on a wake-up this caller can no longer use
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def _release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        free = int(self.concurrency_limit) - self.in_flight
+        while self._waiters and free > 0:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def _on_success(self, latency: float):
+        if latency <= self.target_latency:
+            # Additive increase: roughly one extra slot per window of requests
+            self.concurrency_limit = min(
+                self.max_concurrency,
+                self.concurrency_limit + 1 / max(self.concurrency_limit, 1)
+            )
+            self._wake()
+        else:
+            self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit * 0.9)
+        self.bucket.on_success()
+
+    def _on_error(self, error: RetryableError):
+        self.errors += 1
+        self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit / 2)
+        if isinstance(error, RateLimited):
+            self.throttled += 1
+            self.bucket.on_throttled()
+        if error.retry_after:
+            self.paused_until = max(self.paused_until, time.monotonic() + error.retry_after)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps retries from many callers from synchronising
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def run(self, call: Callable[[], Awaitable[T]], idempotent: bool = True) -> T:
+        """
+        Run a request, retrying failures; non-idempotent requests are only retried on 429
+        """
+        attempt = 0
+        while True:
+            await self._acquire()
+            self.requests += 1
+            started = time.monotonic()
+            try:
+                result = await call()
+            except RetryableError as e:
+                self._on_error(e)
+                # A 429 was refused before any work was done, so it is always safe to resend
+                if attempt >= self.max_retries or not (idempotent or isinstance(e, RateLimited)):
+                    raise
+                error = e
+            else:
+                self._on_success(time.monotonic() - started)
+                return result
+            finally:
+                self._release()
+
+            if not error.retry_after:
+                await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+            self.retries += 1
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self._wait_times)
+        return {
+            "site": self.site,
+            "queue_depth": self.queued,
+            "in_flight": self.in_flight,
+            "concurrency_limit": round(self.concurrency_limit, 2),
+            "rate_per_second": round(self.bucket.rate, 2),
+            "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 3),
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "retries": self.retries,
+            "wait_ms_avg": round(sum(waits) / len(waits) * 1000, 3) if waits else 0.0,
+            "wait_ms_p95": round(waits[int(len(waits) * 0.95) - 1] * 1000, 3) if waits else 0.0,
+            "wait_ms_max": round(waits[-1] * 1000, 3) if waits else 0.0
+        }
+
+class JiraScheduler:
+    """
+    Central scheduler for outbound Jira traffic, one SiteScheduler per site
+    """
+
+    def __init__(self):
+        self.rate = float(os.getenv("JIRA_RATE_LIMIT_RPS", "10"))
+        self.burst = float(os.getenv("JIRA_RATE_LIMIT_BURST", "20"))
+        self.min_concurrency = int(os.getenv("JIRA_MIN_CONCURRENCY", "1"))
+        self.max_concurrency = int(os.getenv("JIRA_MAX_CONCURRENCY", "16"))
+        self.target_latency = float(os.getenv("JIRA_TARGET_LATENCY_MS", "1500")) / 1000
+        self.max_retries = int(os.getenv("JIRA_MAX_RETRIES", "4"))
+        self.backoff_base = float(os.getenv("JIRA_BACKOFF_BASE", "0.5"))
+        self.backoff_max = float(os.getenv("JIRA_BACKOFF_MAX", "30"))
+        self._sites: Dict[str, SiteScheduler] = {}
+
+    def site(self, url: str) -> SiteScheduler:
+        """
+        Get the scheduler for the site of a Jira URL
+        """
+        site = site_key(url)
+        scheduler = self._sites.get(site)
+        if scheduler is None:
+            scheduler = SiteScheduler(
+                site,
+                rate=self.rate,
+                burst=self.burst,
+                min_concurrency=self.min_concurrency,
+                max_concurrency=self.max_concurrency,
+                target_latency=self.target_latency,
+                max_retries=self.max_retries,
+                backoff_base=self.backoff_base,
+                backoff_max=self.backoff_max
+            )
+            self._sites[site] = scheduler
+        return scheduler
+
+    async def run(self, url: str, call: Callable[[], Awaitable[T]], idempotent: bool = True) -> T:
+        """
+        Run a Jira request through the site's rate limits, retrying throttled calls
+        """
+        return await self.site(url).run(call, idempotent)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"sites": [scheduler.stats() for scheduler in self._sites.values()]}
+
+jira_scheduler = JiraScheduler()
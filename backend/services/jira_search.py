@@ -0,0 +1,47 @@
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, Optional
+
+# Only the fields the search endpoints return are requested from Jira
+SEARCH_FIELDS = "summary,status,assignee"
+DEFAULT_PAGE_SIZE = 100
+
+FetchPage = Callable[[int, Optional[str], int], Awaitable[Dict[str, Any]]]
+
+async def paginate_issues(
+    fetch_page: FetchPage,
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Walk Jira search pages lazily, yielding raw issues as each page arrives.
+
+    fetch_page(start_at, next_page_token, max_results) returns one search
+    response; both startAt/total and nextPageToken/isLast paging are handled.
+    """
+    start_at = 0
+    next_page_token = None
+    while True:
+        page = await fetch_page(start_at, next_page_token, page_size)
+        issues = page.get("issues", [])
+        for issue in issues:
+            yield issue
+
+        next_page_token = page.get("nextPageToken")
+        start_at += len(issues)
+        if not issues or page.get("isLast"):
+            return
+        if next_page_token is None and start_at >= page.get("total", 0):
+            return
+
+def summarize_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce a raw Jira issue to the projected search fields
+    """
+    fields = issue.get("fields") or {}
+    status = fields.get("status") or {}
+    assignee = fields.get("assignee") or {}
+    return {
+        "id": issue.get("id"),
+        "key": issue.get("key"),
+        "summary": fields.get("summary"),
+        "status": status.get("name"),
+        "assignee": assignee.get("displayName")
+    }
@@ -1,29 +1,66 @@
-import aiohttp
-from typing import List, Optional
-from ..models.jira import Project, Task, Comment
+import os
+from typing import AsyncIterator, List, Optional
+from ..models.jira import Project, Task, Comment, TaskCreate
+from .http_pool import HttpPool, jira_http_pool
+from .issue_cache import invalidate_issue
+from .jira_scheduler import RETRYABLE_STATUSES, is_idempotent, jira_scheduler, retryable_error
+from .project_cache import get_cached_projects
+from .batch_executor import (
+    BULK_CREATE_LIMIT,
+    DEFAULT_BATCH_CONCURRENCY,
+    chunked,
+    group_by,
+    gather_bounded,
+    split_bulk_response
+)
+from .jira_search import SEARCH_FIELDS, DEFAULT_PAGE_SIZE, paginate_issues, summarize_issue
 
 class JiraService:
-    def __init__(self, token: str):
+    def __init__(self, token: str, pool: Optional[HttpPool] = None):
         self.token = token
-        self.base_url = "https://api.atlassian.com/ex/jira"
+        self.base_url = os.getenv("JIRA_API_BASE_URL", "https://api.atlassian.com/ex/jira")
+        self.pool = pool or jira_http_pool
         self.headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
 
     async def _make_request(self, method: str, endpoint: str, **kwargs) -> dict:
-        """Make an HTTP request to the Jira API"""
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}{endpoint}"
-            async with session.request(method, url, headers=self.headers, **kwargs) as response:
-                if response.status >= 400:
-                    error_text = await response.text()
-                    raise Exception(f"Jira API error: {error_text}")
-                return await response.json()
+        """Make an HTTP request to the Jira API through the rate-limit scheduler"""
+        return await jira_scheduler.run(
+            # The full URL, so a gateway base URL without the cloud id still names the tenant
+            f"{self.base_url}{endpoint}",
+            lambda: self._send_request(method, endpoint, **kwargs),
+            idempotent=is_idempotent(method)
+        )
+
+    async def _send_request(self, method: str, endpoint: str, **kwargs) -> dict:
+        """Send one HTTP request to the Jira API using the shared connection pool"""
+        session = await self.pool.session()
+        url = f"{self.base_url}{endpoint}"
+        async with session.request(method, url, headers=self.headers, **kwargs) as response:
+            if response.status in RETRYABLE_STATUSES:
+                error_text = await response.text()
+                raise retryable_error(
+                    response.status,
+                    f"Jira API error: {error_text}",
+                    response.headers.get("Retry-After")
+                )
+            if response.status >= 400:
+                error_text = await response.text()
+                raise Exception(f"Jira API error: {error_text}")
+            if response.status == 204:
+                # Writes such as PUT /issue/{key} return no body
+                return {}
+            return await response.json()
 
     async def get_projects(self) -> List[Project]:
-        """Get all projects the user has access to"""
-        response = await self._make_request("GET", "/rest/api/3/project")
+        """Get all projects the user has access to, served from the project cache"""
+        response = await get_cached_projects(
+            self.base_url,
+            self.token,
+            lambda: self._make_request("GET", "/rest/api/3/project")
+        )
         return [Project(**project) for project in response]
 
     async def get_tasks(
@@ -33,26 +70,44 @@ class JiraService:
         assignee: Optional[str] = None
     ) -> List[Task]:
         """Get tasks from a specific project with optional filters"""
+        return [task async for task in self.iter_tasks(project_key, status, assignee)]
+
+    async def iter_tasks(
+        self,
+        project_key: str,
+        status: Optional[str] = None,
+        assignee: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> AsyncIterator[Task]:
+        """Stream tasks page by page, requesting only the summary fields"""
         jql = f"project = {project_key}"
         if status:
-            jql += f" AND status = {status}"
+            jql += f" AND status = \"{status}\""
         if assignee:
-            jql += f" AND assignee = {assignee}"
+            # currentUser() is a JQL function, not a user name, so it stays unquoted
+            jql += " AND assignee = currentUser()" if assignee == "currentUser()" else f" AND assignee = \"{assignee}\""
 
-        response = await self._make_request(
-            "GET",
-            f"/rest/api/3/search?jql={jql}"
-        )
-        return [Task(**issue) for issue in response["issues"]]
+        async def fetch_page(start_at: int, next_page_token: Optional[str], max_results: int) -> dict:
+            params = {"jql": jql, "fields": SEARCH_FIELDS, "maxResults": max_results}
+            if next_page_token:
+                params["nextPageToken"] = next_page_token
+            else:
+                params["startAt"] = start_at
+            return await self._make_request("GET", "/rest/api/3/search", params=params)
+
+        async for issue in paginate_issues(fetch_page, page_size):
+            yield Task(**summarize_issue(issue))
 
     async def add_comment(self, task_id: str, body: str) -> dict:
         """Add a comment to a specific task"""
         data = {"body": body}
-        return await self._make_request(
+        result = await self._make_request(
             "POST",
             f"/rest/api/3/issue/{task_id}/comment",
             json=data
         )
+        invalidate_issue(self.base_url, task_id)
+        return result
 
     async def create_task(self, task: Task) -> dict:
         """Create a new task in the specified project"""
@@ -73,6 +128,42 @@ class JiraService:
             json=data
         )
 
+    async def create_tasks_bulk(
+        self,
+        tasks: List[TaskCreate],
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> List[dict]:
+        """Create many tasks through the bulk endpoint, grouped by project, 50 per call"""
+        results: List[Optional[dict]] = [None] * len(tasks)
+        groups = group_by(tasks, lambda task: task.project_key)
+        chunks = [chunk for group in groups.values() for chunk in chunked(group, BULK_CREATE_LIMIT)]
+
+        async def create_chunk(chunk) -> List[dict]:
+            data = {"issueUpdates": [{"fields": self._create_fields(task)} for _, task in chunk]}
+            response = await self._make_request("POST", "/rest/api/3/issue/bulk", json=data)
+            return split_bulk_response(len(chunk), response)
+
+        chunk_results = await gather_bounded(
+            [lambda chunk=chunk: create_chunk(chunk) for chunk in chunks],
+            max_concurrency
+        )
+        for chunk, chunk_result in zip(chunks, chunk_results):
+            for position, (index, _) in enumerate(chunk):
+                results[index] = chunk_result["data"][position] if chunk_result["success"] else chunk_result
+        return results
+
+    def _create_fields(self, task: TaskCreate) -> dict:
+        """Build the Jira fields for a new task"""
+        fields = {
+            "project": {"key": task.project_key},
+            "summary": task.summary,
+            "description": task.description,
+            "issuetype": {"name": task.issue_type}
+        }
+        if task.assignee:
+            fields["assignee"] = {"name": task.assignee}
+        return fields
+
     async def update_task(self, task_id: str, task: Task) -> dict:
         """Update an existing task"""
         data = {
@@ -84,8 +175,10 @@ class JiraService:
         if task.assignee:
             data["fields"]["assignee"] = {"name": task.assignee}
 
-        return await self._make_request(
+        result = await self._make_request(
             "PUT",
             f"/rest/api/3/issue/{task_id}",
             json=data
-        ) 
\ No newline at end of file
+        )
+        invalidate_issue(self.base_url, task_id)
+        return result 
\ No newline at end of file
@@ -0,0 +1,72 @@
+import json
+from typing import Any, Dict, List
+
+class JsonArrayStream:
+    """
+    Incremental parser for a streamed JSON array of objects.
+
+    Text is fed as it arrives; every top-level object is returned as soon as
+    its closing brace is seen. Anything before the opening bracket, such as a
+    Markdown code fence, is ignored.
+    """
+
+    def __init__(self):
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._buffer: List[str] = []
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Consume more text, returning the objects it completed
+        """
+        objects = []
+        for char in text:
+            if self._finished:
+                break
+            if not self._started:
+                if char == "[":
+                    self._started = True
+                continue
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._buffer = [char]
+                elif char == "]":
+                    self._finished = True
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    objects.append(json.loads("".join(self._buffer)))
+                    self._buffer = []
+        return objects
+
+    def close(self):
+        """
+        Check the stream ended on a complete array
+        """
+        if not self._started:
+            raise ValueError("No JSON array in response")
+        if self._depth or not self._finished:
+            raise ValueError("Response ended before the JSON array was complete")
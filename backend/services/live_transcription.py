@@ -0,0 +1,250 @@
+import os
+import json
+import asyncio
+import aiohttp
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional
+from urllib.parse import urlencode
+from .http_pool import HttpPool
+
+DEEPGRAM_LIVE_URL = os.getenv("DEEPGRAM_LIVE_URL", "wss://api.deepgram.com/v1/listen")
+# Audio frames buffered per session before the client's reads are paused
+LIVE_AUDIO_QUEUE_FRAMES = int(os.getenv("LIVE_AUDIO_QUEUE_FRAMES", "50"))
+# Final transcripts buffered for a client that is not reading
+LIVE_MAX_PENDING_TRANSCRIPTS = int(os.getenv("LIVE_MAX_PENDING_TRANSCRIPTS", "200"))
+# Deepgram closes live connections that see no audio for about ten seconds
+LIVE_KEEPALIVE_SECONDS = float(os.getenv("LIVE_KEEPALIVE_SECONDS", "8"))
+
+def encode_options(options: Dict[str, Any]) -> str:
+    """
+    Encode Deepgram options as a query string, skipping unset values
+    """
+    return urlencode({
+        key: str(value).lower() if isinstance(value, bool) else value
+        for key, value in options.items()
+        if value is not None
+    })
+
+def transcript_message(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Turn a Deepgram live message into the message sent to the client, or None to skip it
+    """
+    kind = result.get("type")
+    if kind == "Results":
+        alternative = result["channel"]["alternatives"][0]
+        if not alternative.get("transcript"):
+            return None
+        return {
+            "type": "transcript",
+            "transcript": alternative["transcript"],
+            "confidence": alternative.get("confidence"),
+            "is_final": bool(result.get("is_final")),
+            "speech_final": bool(result.get("speech_final")),
+            "start": result.get("start"),
+            "duration": result.get("duration")
+        }
+    if kind == "UtteranceEnd":
+        return {"type": "utterance_end", "last_word_end": result.get("last_word_end")}
+    return None
+
+class SlowConsumer(Exception):
+    """
+    A client that stopped reading transcripts
+    """
+
+class TranscriptOutbox:
+    """
+    Transcripts waiting for a client that reads slower than they arrive.
+
+    Final transcripts are always kept. A newer interim transcript replaces an
+    unsent one, because it covers the same audio.
+    """
+
+    def __init__(self, max_pending: int = LIVE_MAX_PENDING_TRANSCRIPTS):
+        self.max_pending = max_pending
+        self._items: Deque[Dict[str, Any]] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.replaced_interims = 0
+
+    def put(self, message: Dict[str, Any]):
+        last = self._items[-1] if self._items else None
+        if (
+            message["type"] == "transcript" and not message["is_final"]
+            and last is not None and last["type"] == "transcript" and not last["is_final"]
+        ):
+            self._items[-1] = message
+            self.replaced_interims += 1
+        else:
+            if len(self._items) >= self.max_pending:
+                raise SlowConsumer(f"Client fell {len(self._items)} transcripts behind")
+            self._items.append(message)
+        self._ready.set()
+
+    def close(self):
+        self._closed = True
+        self._ready.set()
+
+    async def get(self) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next message; None once closed and drained
+        """
+        while not self._items:
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        return self._items.popleft()
+
+class DeepgramLiveSession:
+    """
+    One Deepgram live connection held open for a client's streaming session.
+
+    Audio frames go through a bounded queue drained by a background sender,
+    so a client that sends faster than Deepgram accepts is made to wait.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        options: Dict[str, Any],
+        pool: HttpPool,
+        url: str = DEEPGRAM_LIVE_URL,
+        max_queued_frames: int = LIVE_AUDIO_QUEUE_FRAMES,
+        keepalive: float = LIVE_KEEPALIVE_SECONDS
+    ):
+        self.api_key = api_key
+        self.options = options
+        self.pool = pool
+        self.base_url = url
+        self.keepalive = keepalive
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued_frames)
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._sender: Optional[asyncio.Task] = None
+        self.frames_sent = 0
+        self.bytes_sent = 0
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}?{encode_options(self.options)}"
+
+    async def connect(self):
+        """
+        Open the live connection and start sending queued audio
+        """
+        session = await self.pool.session()
+        self._ws = await session.ws_connect(self.url, headers={"Authorization": f"Token {self.api_key}"})
+        self._sender = asyncio.create_task(self._send_loop())
+
+    async def send_audio(self, frame: bytes):
+        """
+        Queue an audio frame, waiting while the queue is full
+        """
+        await self._queue.put(frame)
+
+    async def finish(self):
+        """
+        Ask Deepgram to flush its final transcripts and close the stream
+        """
+        await self._queue.put(None)
+
+    async def _send_loop(self):
+        while True:
+            try:
+                frame = await asyncio.wait_for(self._queue.get(), timeout=self.keepalive)
+            except asyncio.TimeoutError:
+                await self._ws.send_str(json.dumps({"type": "KeepAlive"}))
+                continue
+            if frame is None:
+                await self._ws.send_str(json.dumps({"type": "CloseStream"}))
+                return
+            await self._ws.send_bytes(frame)
+            self.frames_sent += 1
+            self.bytes_sent += len(frame)
+
+    async def results(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield interim and final transcripts until Deepgram closes the stream
+        """
+        async for message in self._ws:
+            if message.type == aiohttp.WSMsgType.TEXT:
+                result = transcript_message(json.loads(message.data))
+                if result is not None:
+                    yield result
+            elif message.type == aiohttp.WSMsgType.ERROR:
+                raise Exception(f"Deepgram live connection failed: {str(self._ws.exception())}")
+        if self._sender is not None and self._sender.done() and not self._sender.cancelled():
+            error = self._sender.exception()
+            if error is not None:
+                raise Exception(f"Deepgram live connection failed: {str(error)}")
+
+    async def close(self):
+        if self._sender is not None:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+
+async def relay_live_transcription(
+    session: DeepgramLiveSession,
+    receive_audio: Callable[[], Awaitable[Optional[bytes]]],
+    send_message: Callable[[Dict[str, Any]], Awaitable[None]]
+) -> Dict[str, Any]:
+    """
+    Pump client audio to Deepgram and transcripts back to the client.
+
+    `receive_audio` returns the next frame, or None when the client has
+    finished talking. Returns once every transcript has been delivered.
+    """
+    outbox = TranscriptOutbox()
+    transcripts = 0
+
+    async def pump_audio():
+        while True:
+            frame = await receive_audio()
+            if frame is None:
+                break
+            await session.send_audio(frame)
+        await session.finish()
+
+    async def pump_results():
+        try:
+            async for message in session.results():
+                outbox.put(message)
+        finally:
+            outbox.close()
+
+    async def deliver():
+        nonlocal transcripts
+        while True:
+            message = await outbox.get()
+            if message is None:
+                return
+            await send_message(message)
+            transcripts += 1
+
+    tasks = [asyncio.create_task(coroutine) for coroutine in (pump_audio(), pump_results(), deliver())]
+    delivery = tasks[2]
+    try:
+        pending = set(tasks)
+        while not delivery.done():
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+    finally:
+        # Deepgram may close before the client stops sending
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await session.close()
+
+    return {
+        "frames": session.frames_sent,
+        "bytes": session.bytes_sent,
+        "transcripts": transcripts,
+        "replaced_interims": outbox.replaced_interims
+    }
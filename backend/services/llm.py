@@ -0,0 +1,291 @@
+import os
+import re
+import json
+import random
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+from .http_pool import HttpPool
+from .tokens import CHARS_PER_TOKEN, count_tokens
+from .prompt_compiler import CompiledPrompt, token_usage
+from .fast_parser import fast_parser
+
+# Completions can take far longer than Jira calls
+openai_http_pool = HttpPool("openai", total_timeout=float(os.getenv("OPENAI_HTTP_TOTAL_TIMEOUT", "120")))
+
+@dataclass
+class LLMResponse:
+    content: str
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+
+class LLMProvider:
+    """
+    Chat-completion backend used by the command parsers
+    """
+    name = "base"
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int] = None
+    ) -> LLMResponse:
+        raise NotImplementedError
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Yield the completion as content deltas
+        """
+        raise NotImplementedError
+        yield
+
+class OpenAIProvider(LLMProvider):
+    """
+    OpenAI chat completions over the shared keep-alive connection pool
+    """
+    name = "openai"
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, pool: Optional[HttpPool] = None):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not self.api_key:
+            raise ValueError("OPENAI_API_KEY environment variable is not set")
+        self.base_url = (base_url or os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")).rstrip("/")
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        self.pool = pool or openai_http_pool
+
+    def _request(self, messages, model, temperature, max_tokens) -> Dict[str, Any]:
+        data = {"model": model, "messages": messages, "temperature": temperature}
+        if max_tokens:
+            data["max_tokens"] = max_tokens
+        return data
+
+    async def complete(self, messages, model, temperature, max_tokens=None) -> LLMResponse:
+        session = await self.pool.session()
+        url = f"{self.base_url}/chat/completions"
+        data = self._request(messages, model, temperature, max_tokens)
+        async with session.post(url, headers=self.headers, json=data) as response:
+            if response.status >= 400:
+                error_text = await response.text()
+                raise Exception(f"OpenAI API error: {error_text}")
+
+            result = await response.json()
+            usage = result.get("usage") or {}
+            return LLMResponse(
+                content=result["choices"][0]["message"]["content"],
+                prompt_tokens=usage.get("prompt_tokens"),
+                completion_tokens=usage.get("completion_tokens")
+            )
+
+    async def stream(self, messages, model, temperature, max_tokens=None) -> AsyncIterator[str]:
+        session = await self.pool.session()
+        url = f"{self.base_url}/chat/completions"
+        data = {**self._request(messages, model, temperature, max_tokens), "stream": True}
+        async with session.post(url, headers=self.headers, json=data) as response:
+            if response.status >= 400:
+                error_text = await response.text()
+                raise Exception(f"OpenAI API error: {error_text}")
+
+            # Server-sent events: one "data: {...}" line per delta
+            async for line in response.content:
+                line = line.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    break
+                content = json.loads(payload)["choices"][0]["delta"].get("content")
+                if content:
+                    yield content
+
+# Labels used by the parsing prompt templates for their per-request fields
+PROMPT_FIELDS = ("Command", "Parse this command", "Project", "Project context", "Context", "Transcript", "Part", "Commands")
+FIELD_LINE = re.compile(r"^(?P<label>" + "|".join(re.escape(label) for label in PROMPT_FIELDS) + r"):[ \t]*(?P<value>.*)$")
+NUMBERED_LINE = re.compile(r"^(?P<number>\d+)\.\s+(?P<command>.+)$")
+BATCH_PROJECT = re.compile(r"\s*\[project: (?P<project>[^\]]+)\]")
+BATCH_CONTEXT = re.compile(r"\s*\[context: .*\]$")
+
+class LocalLLMProvider(LLMProvider):
+    """
+    Offline stand-in that answers parsing prompts without a network.
+
+    Completions come from a canned table keyed by command text, or are
+    derived from the rule-based fast parser. Latency is simulated as a fixed
+    time to first token plus generation at `tokens_per_second`.
+    """
+    name = "local"
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        tokens_per_second: float = 0.0,
+        canned: Optional[Dict[str, Any]] = None
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self.canned = canned or {}
+        self.requests = 0
+
+    @classmethod
+    def from_env(cls) -> "LocalLLMProvider":
+        canned = {}
+        path = os.getenv("LOCAL_LLM_CANNED_PATH")
+        if path:
+            with open(path, encoding="utf-8") as f:
+                canned = json.load(f)
+        return cls(
+            latency=float(os.getenv("LOCAL_LLM_LATENCY_MS", "0")) / 1000,
+            jitter=float(os.getenv("LOCAL_LLM_JITTER_MS", "0")) / 1000,
+            tokens_per_second=float(os.getenv("LOCAL_LLM_TOKENS_PER_SECOND", "0")),
+            canned=canned
+        )
+
+    async def _first_token_delay(self):
+        delay = self.latency + (random.uniform(-self.jitter, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def complete(self, messages, model, temperature, max_tokens=None) -> LLMResponse:
+        self.requests += 1
+        content = self.respond(messages)
+        completion_tokens = count_tokens(content)
+        await self._first_token_delay()
+        if self.tokens_per_second:
+            await asyncio.sleep(completion_tokens / self.tokens_per_second)
+        return LLMResponse(
+            content=content,
+            prompt_tokens=sum(count_tokens(message["content"]) for message in messages),
+            completion_tokens=completion_tokens
+        )
+
+    async def stream(self, messages, model, temperature, max_tokens=None) -> AsyncIterator[str]:
+        self.requests += 1
+        content = self.respond(messages)
+        await self._first_token_delay()
+        for start in range(0, len(content), CHARS_PER_TOKEN):
+            if self.tokens_per_second:
+                await asyncio.sleep(1 / self.tokens_per_second)
+            yield content[start:start + CHARS_PER_TOKEN]
+
+    def respond(self, messages: List[Dict[str, str]]) -> str:
+        """
+        Build the completion for a parsing prompt
+        """
+        instructions = messages[0]["content"]
+        fields = self._fields(messages[-1]["content"])
+        project_key = fields.get("Project") or fields.get("Project context")
+        jira_actions = '"action_type"' in instructions
+
+        if "Commands" in fields:
+            results = []
+            for line in fields["Commands"].splitlines():
+                match = NUMBERED_LINE.match(line.strip())
+                if not match:
+                    continue
+                command = BATCH_CONTEXT.sub("", match.group("command"))
+                project = BATCH_PROJECT.search(command)
+                command = BATCH_PROJECT.sub("", command)
+                result = self._parse(command, project.group("project") if project else project_key, jira_actions)
+                results.append({"index": int(match.group("number")), **result})
+            return json.dumps(results)
+
+        if "Transcript" in fields:
+            results = []
+            for line in fields["Transcript"].splitlines():
+                # Drop speaker labels such as "Alice:" or "[00:01] Bob:"
+                command = line.split(":", 1)[1] if re.match(r"^[\[\]\d:. ]*[A-Z][\w .'-]*:\s", line) else line
+                result = self._parse(command.strip(), project_key, jira_actions, fallback=False)
+                if result is not None:
+                    results.append(result)
+            return json.dumps(results)
+
+        command = fields.get("Command") or fields.get("Parse this command") or messages[-1]["content"]
+        return json.dumps(self._parse(command, project_key, jira_actions))
+
+    def _fields(self, content: str) -> Dict[str, str]:
+        fields: Dict[str, str] = {}
+        label = None
+        for line in content.splitlines():
+            match = FIELD_LINE.match(line)
+            if match:
+                label = match.group("label")
+                fields[label] = match.group("value")
+            elif label is not None:
+                fields[label] = f"{fields[label]}\n{line}" if fields[label] else line
+        return fields
+
+    def _parse(self, command: str, project_key: Optional[str], jira_actions: bool, fallback: bool = True) -> Optional[Dict[str, Any]]:
+        canned = self.canned.get(command.strip())
+        if canned is not None:
+            return canned
+
+        parsed = fast_parser.match(command, project_key)
+        if parsed is not None:
+            if jira_actions:
+                return {**parsed.to_jira_action().dict(exclude_none=True), "confidence": parsed.confidence}
+            return parsed.to_command_response().dict()
+        if not fallback:
+            return None
+        # Unrecognised commands become a low-confidence search
+        if jira_actions:
+            return {"action_type": "search", "jql": f'text ~ "{command}"', "confidence": 0.3}
+        return {"action": "query_tasks", "details": {"project_key": project_key}, "confidence": 0.3}
+
+_provider: Optional[LLMProvider] = None
+
+def get_llm_provider() -> LLMProvider:
+    """
+    Get the configured provider: LLM_PROVIDER=openai (default) or local
+    """
+    global _provider
+    if _provider is None:
+        name = os.getenv("LLM_PROVIDER", "openai").lower()
+        if name == "local":
+            _provider = LocalLLMProvider.from_env()
+        elif name == "openai":
+            _provider = OpenAIProvider()
+        else:
+            raise ValueError(f"Unknown LLM provider: {name}")
+    return _provider
+
+def set_llm_provider(provider: Optional[LLMProvider]):
+    """
+    Replace the provider, e.g. with a LocalLLMProvider in tests and benchmarks
+    """
+    global _provider
+    _provider = provider
+
+async def complete(prompt: CompiledPrompt, model: str, temperature: float) -> str:
+    """
+    Run a compiled prompt through the provider, recording token usage
+    """
+    response = await get_llm_provider().complete(prompt.messages, model, temperature, prompt.max_output_tokens)
+    token_usage.record(
+        prompt,
+        response.prompt_tokens,
+        response.completion_tokens if response.completion_tokens is not None else count_tokens(response.content)
+    )
+    return response.content
+
+async def stream(prompt: CompiledPrompt, model: str, temperature: float) -> AsyncIterator[str]:
+    """
+    Stream a compiled prompt through the provider, recording token usage at the end
+    """
+    streamed = []
+    async for content in get_llm_provider().stream(prompt.messages, model, temperature, prompt.max_output_tokens):
+        streamed.append(content)
+        yield content
+    # Streamed responses carry no usage block, so count the output locally
+    token_usage.record(prompt, None, count_tokens("".join(streamed)))
@@ -0,0 +1,179 @@
+import os
+import json
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Sequence, Set, Tuple, TypeVar
+from .model_cascade import ModelCascade
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_BATCH_WINDOW_MS = float(os.getenv("PARSE_BATCH_WINDOW_MS", "0"))
+DEFAULT_MAX_BATCH_SIZE = int(os.getenv("PARSE_BATCH_MAX_SIZE", "10"))
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Collects concurrent requests for a short window and processes them together.
+
+    The first request in an empty batch starts a `window_ms` timer; the batch
+    is flushed when the timer fires or `max_batch` requests are waiting.
+    `process` receives the items in arrival order and returns one result per
+    item, or an exception instance to fail just that item. A batch-wide
+    failure is raised to every waiter.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[List[T]], Awaitable[Sequence[Any]]],
+        window_ms: float = DEFAULT_BATCH_WINDOW_MS,
+        max_batch: int = DEFAULT_MAX_BATCH_SIZE
+    ):
+        self.process = process
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0 and self.max_batch > 1
+
+    async def submit(self, item: T) -> R:
+        """
+        Add an item to the current batch and wait for its result
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]):
+        try:
+            results = await self.process([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Batch returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # Cancelled mid-batch: cancel the waiters rather than leave them hanging
+            for _, future in batch:
+                future.cancel()
+            raise
+
+        for (_, future), result in zip(batch, results):
+            # Waiters that gave up have cancelled their futures
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch
+        }
+
+def number_commands(commands: Sequence[str]) -> str:
+    """
+    Render commands as a numbered list, one per line, starting at 1
+    """
+    return "\n".join(f"{number}. {' '.join(command.split())}" for number, command in enumerate(commands, 1))
+
+async def parse_numbered_batch(
+    requests: Sequence[T],
+    describe: Callable[[T], str],
+    complete: Callable[[str, str], Awaitable[str]],
+    validate: Callable[[str], Tuple[Dict[str, Any], str, float]],
+    cascade: ModelCascade,
+    parse_single: Callable[[T], Awaitable[Dict[str, Any]]]
+) -> List[Any]:
+    """
+    Parse a batch of commands with one numbered LLM request.
+
+    `complete(commands, model)` answers the numbered list of described
+    commands on the cascade's first tier. Each answer goes through the same
+    `validate` and acceptance rule as a single parse on that tier; commands
+    the model skipped or answered invalidly, and unsure answers a larger
+    tier could improve, are retried on their own.
+    """
+    if len(requests) == 1:
+        return [await parse_single(requests[0])]
+
+    content = await complete(number_commands([describe(request) for request in requests]), cascade.tiers[0])
+    try:
+        parsed = split_batch_response(content, len(requests))
+    except ValueError:
+        # Includes json.JSONDecodeError
+        parsed = [None] * len(requests)
+
+    results: List[Any] = []
+    retries = []
+    for index, item in enumerate(parsed):
+        try:
+            result, action_type, confidence = validate(json.dumps(item))
+            if not cascade.accepts(0, action_type, confidence):
+                raise ValueError(f"Unsure {action_type} answer")
+            results.append(result)
+        except Exception:
+            results.append(None)
+            retries.append(index)
+
+    retried = await asyncio.gather(
+        *(parse_single(requests[index]) for index in retries),
+        return_exceptions=True
+    )
+    for index, result in zip(retries, retried):
+        results[index] = result
+    return results
+
+def split_batch_response(content: str, count: int) -> List[Optional[Dict[str, Any]]]:
+    """
+    Map a JSON array answer to a numbered prompt back onto its commands.
+
+    Objects are matched by their "index" field (1-based), falling back to
+    position; commands the model skipped come back as None.
+    """
+    parsed = json.loads(content)
+    if not isinstance(parsed, list):
+        raise ValueError("Batch response is not a JSON array")
+    results: List[Optional[Dict[str, Any]]] = [None] * count
+    for position, item in enumerate(parsed):
+        if not isinstance(item, dict):
+            continue
+        item = dict(item)
+        index = item.pop("index", None)
+        slot = index - 1 if isinstance(index, int) else position
+        if 0 <= slot < count and results[slot] is None:
+            results[slot] = item
+    return results
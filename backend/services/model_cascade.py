@@ -0,0 +1,169 @@
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+# Minimum confidence to accept a cheaper model's answer, per action type.
+# Covers both the CommandService and CommandParser action vocabularies.
+DEFAULT_THRESHOLDS = {
+    "create_issue": 0.85,
+    "create": 0.85,
+    "update_task": 0.85,
+    "update": 0.85,
+    "update_comment": 0.8,
+    "comment": 0.8,
+    "query_tasks": 0.75,
+    "search": 0.75
+}
+
+# Fields each action needs before a cheaper model's answer can be accepted,
+# for both vocabularies: CommandParser checks the action, CommandService its details
+REQUIRED_FIELDS = {
+    "create_issue": ["project_key", "summary"],
+    "create": ["project_key", "summary"],
+    "update_task": ["task_id"],
+    "update": ["issue_key", "fields"],
+    "update_comment": ["task_id", "comment"],
+    "comment": ["issue_key", "comment"],
+    "query_tasks": ["project_key"],
+    "search": ["jql"]
+}
+
+def required_confidence(action_type: str, values: Dict[str, Any], confidence: float) -> float:
+    """
+    Get an answer's confidence, or zero for unknown action types or missing required fields
+    """
+    required = REQUIRED_FIELDS.get(action_type)
+    if required is None or any(not values.get(name) for name in required):
+        return 0.0
+    return confidence
+
+def parse_thresholds(value: str) -> Dict[str, float]:
+    """
+    Parse "action=threshold" pairs separated by commas
+    """
+    thresholds = {}
+    for pair in value.split(","):
+        if "=" in pair:
+            action, threshold = pair.split("=", 1)
+            thresholds[action.strip()] = float(threshold)
+    return thresholds
+
+class InvalidParse(Exception):
+    """
+    A model answer that failed schema validation
+    """
+
+class TierStats:
+    def __init__(self, model: str):
+        self.model = model
+        self.calls = 0
+        self.accepted = 0
+        self.escalated = 0
+        self.errors = 0
+        self._latencies: Deque[float] = deque(maxlen=1000)
+
+    def observe(self, latency: float):
+        self.calls += 1
+        self._latencies.append(latency)
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        return {
+            "model": self.model,
+            "calls": self.calls,
+            "accepted": self.accepted,
+            "escalated": self.escalated,
+            "errors": self.errors,
+            "escalation_rate": round(self.escalated / self.calls, 4) if self.calls else 0.0,
+            "latency_ms_p50": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else 0.0,
+            "latency_ms_p95": round(latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000, 1) if latencies else 0.0
+        }
+
+class ModelCascade:
+    """
+    Tries models from cheapest to largest, escalating uncertain answers.
+
+    Each tier's answer is validated; it is accepted when its confidence meets
+    the threshold for its action type. Invalid answers, low confidence and
+    errors move on to the next tier. The last tier's valid answer is always
+    accepted.
+    """
+
+    def __init__(
+        self,
+        tiers: List[str],
+        thresholds: Optional[Dict[str, float]] = None,
+        default_threshold: float = 0.8
+    ):
+        if not tiers:
+            raise ValueError("A model cascade needs at least one model")
+        self.tiers = tiers
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self.default_threshold = default_threshold
+        self._stats = [TierStats(model) for model in tiers]
+        self.requests = 0
+
+    @classmethod
+    def from_env(cls, default_model: str) -> "ModelCascade":
+        tiers = [model.strip() for model in os.getenv("PARSE_MODEL_TIERS", default_model).split(",") if model.strip()]
+        return cls(
+            tiers,
+            thresholds=parse_thresholds(os.getenv("PARSE_CASCADE_THRESHOLDS", "")),
+            default_threshold=float(os.getenv("PARSE_CASCADE_THRESHOLD", "0.8"))
+        )
+
+    @property
+    def top_model(self) -> str:
+        return self.tiers[-1]
+
+    def threshold(self, action_type: Optional[str]) -> float:
+        return self.thresholds.get(action_type or "", self.default_threshold)
+
+    def accepts(self, tier: int, action_type: Optional[str], confidence: float) -> bool:
+        """
+        Whether a valid answer from the model at index `tier` stands or escalates
+        """
+        return tier == len(self.tiers) - 1 or confidence >= self.threshold(action_type)
+
+    async def run(
+        self,
+        call: Callable[[str], Awaitable[str]],
+        validate: Callable[[str], Tuple[Dict[str, Any], str, float]]
+    ) -> Dict[str, Any]:
+        """
+        Get an accepted answer.
+
+        `call` runs the prompt on a model and returns its text; `validate`
+        turns the text into (result, action type, confidence) or raises.
+        """
+        self.requests += 1
+        for index, model in enumerate(self.tiers):
+            stats = self._stats[index]
+            last = index == len(self.tiers) - 1
+            started = time.monotonic()
+            try:
+                result, action_type, confidence = validate(await call(model))
+            except Exception:
+                stats.observe(time.monotonic() - started)
+                stats.errors += 1
+                if last:
+                    raise
+                stats.escalated += 1
+                continue
+            stats.observe(time.monotonic() - started)
+            if self.accepts(index, action_type, confidence):
+                stats.accepted += 1
+                return result
+            stats.escalated += 1
+
+    def stats(self) -> Dict[str, Any]:
+        # Every request starts at the first tier, so its escalations count requests
+        escalated = self._stats[0].escalated
+        return {
+            "tiers": [tier.stats() for tier in self._stats],
+            "requests": self.requests,
+            "escalation_rate": round(escalated / self.requests, 4) if self.requests else 0.0,
+            "thresholds": self.thresholds,
+            "default_threshold": self.default_threshold
+        }
@@ -0,0 +1,59 @@
+import os
+import json
+import hashlib
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, Optional
+from .tiered_cache import TieredCache
+
+def normalize_transcript(text: str) -> str:
+    """
+    Normalise transcribed text for cache lookups.
+
+    Unicode forms, whitespace and trailing sentence punctuation are
+    normalised; case is kept because it ends up in summaries and comments.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    return " ".join(text.split()).rstrip(".!?").strip()
+
+def prompt_version(*parts: str) -> str:
+    """
+    Short fingerprint of a prompt, so editing the prompt invalidates old results
+    """
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()[:12]
+
+def parse_cache_key(
+    namespace: str,
+    version: str,
+    text: str,
+    project_key: Optional[str] = None,
+    context: Optional[Dict[str, Any]] = None
+) -> str:
+    raw = json.dumps(
+        [namespace, version, normalize_transcript(text), (project_key or "").upper(), context or {}],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class ParseCache(TieredCache):
+    """
+    Cache of LLM parse results keyed on normalised text, project and prompt version.
+
+    Concurrent parses of the same text share one LLM call.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, db_path: Optional[str] = None, db_max_entries: int = 100000):
+        super().__init__("parse_results", ttl, max_entries, db_path, db_max_entries)
+
+    async def get_or_parse(self, key: str, parse: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get a cached parse result, calling `parse` only when no tier has it
+        """
+        return await self.get_or_load(key, parse)
+
+parse_cache = ParseCache(
+    ttl=float(os.getenv("PARSE_CACHE_TTL", "86400")),
+    max_entries=int(os.getenv("PARSE_CACHE_MAX_ENTRIES", "5000")),
+    db_path=os.getenv("PARSE_CACHE_DB_PATH") or None,
+    db_max_entries=int(os.getenv("PARSE_CACHE_DB_MAX_ENTRIES", "100000"))
+)
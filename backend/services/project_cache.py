@@ -0,0 +1,28 @@
+import os
+import hashlib
+from typing import Any, Awaitable, Callable, List
+from .ttl_cache import TTLCache
+
+# Project listings barely change, so serve them from memory per user and site
+project_cache = TTLCache(
+    ttl=float(os.getenv("PROJECT_CACHE_TTL", "300")),
+    stale_ttl=float(os.getenv("PROJECT_CACHE_STALE_TTL", "900")),
+    max_entries=int(os.getenv("PROJECT_CACHE_MAX_ENTRIES", "1000"))
+)
+
+def project_cache_key(site: str, credential: str) -> str:
+    """
+    Build a per-user, per-site key without keeping raw credentials in memory
+    """
+    digest = hashlib.sha256(f"{site}|{credential}".encode("utf-8")).hexdigest()
+    return f"projects:{digest}"
+
+async def get_cached_projects(
+    site: str,
+    credential: str,
+    loader: Callable[[], Awaitable[List[Any]]]
+) -> List[Any]:
+    """
+    Get the project list for a user and site, loading it on a cache miss
+    """
+    return await project_cache.get_or_load(project_cache_key(site, credential), loader)
@@ -0,0 +1,155 @@
+import os
+import json
+import textwrap
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .parse_cache import prompt_version
+from .tokens import CHARS_PER_TOKEN, TOKENS_PER_MESSAGE, TOKENS_PER_REPLY, count_tokens
+
+CONTEXT_WINDOW = int(os.getenv("PROMPT_CONTEXT_WINDOW", "8192"))
+MAX_OUTPUT_TOKENS = int(os.getenv("PROMPT_MAX_OUTPUT_TOKENS", "1500"))
+
+class PromptTooLarge(Exception):
+    """
+    The fixed part of a prompt does not fit the input token budget
+    """
+
+@dataclass
+class CompiledPrompt:
+    name: str
+    messages: List[Dict[str, str]]
+    tokens_in: int
+    max_output_tokens: int
+    truncated: bool = False
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), sort_keys=True, default=str)
+
+class PromptTemplate:
+    """
+    A chat prompt split into a static prefix and a variable suffix.
+
+    The system message and instructions are compiled once into a byte-stable
+    first message so providers can cache the prefix; per-request fields are
+    rendered compactly into the last message. Rendering checks the token
+    budget, dropping `droppable` fields and then truncating the `truncatable`
+    one before giving up with PromptTooLarge.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        system: str,
+        instructions: str = "",
+        fields: Sequence[Tuple[str, str]] = (),
+        truncatable: Optional[str] = None,
+        droppable: Sequence[str] = (),
+        max_output_tokens: int = MAX_OUTPUT_TOKENS,
+        context_window: int = CONTEXT_WINDOW
+    ):
+        self.name = name
+        self.fields = list(fields)
+        self.truncatable = truncatable
+        self.droppable = list(droppable)
+        self.max_output_tokens = max_output_tokens
+        self.max_input_tokens = context_window - max_output_tokens
+        instructions = textwrap.dedent(instructions).strip()
+        self.prefix = f"{system.strip()}\n\n{instructions}" if instructions else system.strip()
+        self.prefix_tokens = count_tokens(self.prefix) + TOKENS_PER_MESSAGE
+        self.version = prompt_version(self.prefix, str(self.fields))
+
+    def _render_suffix(self, values: Dict[str, Any]) -> str:
+        lines = []
+        for key, label in self.fields:
+            value = values.get(key)
+            if value is None or value == "" or value == {}:
+                continue
+            text = value if isinstance(value, str) else compact_json(value)
+            # Multi-line values go on their own lines after the label
+            lines.append(f"{label}:\n{text}" if "\n" in text else f"{label}: {text}")
+        return "\n".join(lines)
+
+    def _count(self, suffix: str) -> int:
+        return self.prefix_tokens + count_tokens(suffix) + TOKENS_PER_MESSAGE + TOKENS_PER_REPLY
+
+    def render(self, **values: Any) -> CompiledPrompt:
+        """
+        Render the prompt for one request within the input token budget
+        """
+        values = dict(values)
+        truncated = False
+        suffix = self._render_suffix(values)
+        tokens = self._count(suffix)
+
+        for key in self.droppable:
+            if tokens <= self.max_input_tokens:
+                break
+            if values.get(key) is not None:
+                values[key] = None
+                truncated = True
+                suffix = self._render_suffix(values)
+                tokens = self._count(suffix)
+
+        text = values.get(self.truncatable) if self.truncatable else None
+        while tokens > self.max_input_tokens and isinstance(text, str) and text:
+            excess = tokens - self.max_input_tokens
+            text = text[:max(0, len(text) - excess * CHARS_PER_TOKEN - 1)].rstrip()
+            values[self.truncatable] = text
+            truncated = True
+            suffix = self._render_suffix(values)
+            tokens = self._count(suffix)
+
+        if tokens > self.max_input_tokens:
+            raise PromptTooLarge(
+                f"Prompt '{self.name}' needs {tokens} tokens, over the budget of {self.max_input_tokens}"
+            )
+
+        return CompiledPrompt(
+            name=self.name,
+            messages=[
+                {"role": "system", "content": self.prefix},
+                {"role": "user", "content": suffix}
+            ],
+            tokens_in=tokens,
+            max_output_tokens=self.max_output_tokens,
+            truncated=truncated
+        )
+
+class TokenUsage:
+    """
+    Per-prompt token accounting for LLM calls
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._prompts: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, prompt: CompiledPrompt, tokens_in: Optional[int], tokens_out: int):
+        """
+        Record one call; `tokens_in` is the provider's count when it reports one
+        """
+        with self._lock:
+            usage = self._prompts.setdefault(prompt.name, {
+                "calls": 0,
+                "tokens_in": 0,
+                "tokens_out": 0,
+                "truncated": 0
+            })
+            usage["calls"] += 1
+            usage["tokens_in"] += tokens_in if tokens_in is not None else prompt.tokens_in
+            usage["tokens_out"] += tokens_out
+            usage["truncated"] += int(prompt.truncated)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                name: {
+                    **usage,
+                    "avg_tokens_in": round(usage["tokens_in"] / usage["calls"], 1),
+                    "avg_tokens_out": round(usage["tokens_out"] / usage["calls"], 1)
+                }
+                for name, usage in self._prompts.items()
+            }
+
+token_usage = TokenUsage()
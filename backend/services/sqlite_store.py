@@ -0,0 +1,80 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, List, Optional
+
+class SQLiteKeyValueStore:
+    """
+    Small JSON key-value table in a local SQLite file.
+
+    Used as the persistent tier behind in-memory caches. Entries older than
+    `ttl` seconds are ignored on read and removed by `prune`.
+    """
+
+    def __init__(self, path: str, table: str, ttl: float, max_entries: int = 100000):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_stored_at ON {table} (stored_at)")
+        self.prune()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value FROM {self.table} WHERE key = ? AND stored_at >= ?",
+                (key, time.time() - self.ttl)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any):
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time())
+            )
+
+    def values(self) -> List[Any]:
+        """
+        Every unexpired value, oldest first
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT value FROM {self.table} WHERE stored_at >= ? ORDER BY stored_at",
+                (time.time() - self.ttl,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def delete(self, key: str):
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def prune(self):
+        """
+        Drop expired entries and the oldest ones past the size bound
+        """
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE stored_at < ?", (time.time() - self.ttl,))
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key NOT IN "
+                f"(SELECT key FROM {self.table} ORDER BY stored_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,76 @@
+import json
+from typing import AsyncIterator, Any
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+# Keep proxies from buffering or caching event streams
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+def _encode_line(item: Any) -> bytes:
+    return (json.dumps(jsonable_encoder(item)) + "\n").encode("utf-8")
+
+async def _ndjson_lines(first: Any, items: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    yield _encode_line(first)
+    try:
+        async for item in items:
+            yield _encode_line(item)
+    except Exception as e:
+        # Headers are already sent, so report upstream failures in-band
+        yield _encode_line({"error": str(e)})
+
+async def _empty() -> AsyncIterator[bytes]:
+    return
+    yield
+
+async def ndjson_response(items: AsyncIterator[Any]) -> StreamingResponse:
+    """
+    Stream an async iterator to the client as newline-delimited JSON.
+
+    The first item is fetched before the response starts so errors on the
+    first upstream page still surface as a normal HTTP error.
+    """
+    try:
+        first = await items.__anext__()
+    except StopAsyncIteration:
+        return StreamingResponse(_empty(), media_type=NDJSON_MEDIA_TYPE)
+    return StreamingResponse(_ndjson_lines(first, items), media_type=NDJSON_MEDIA_TYPE)
+
+
+_NOTHING = object()
+
+def _encode_event(event: str, data: Any) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n".encode("utf-8")
+
+async def _sse_events(first: Any, items: AsyncIterator[Any], event: str) -> AsyncIterator[bytes]:
+    count = 0
+    if first is not _NOTHING:
+        yield _encode_event(event, first)
+        count = 1
+        try:
+            async for item in items:
+                yield _encode_event(event, item)
+                count += 1
+        except Exception as e:
+            yield _encode_event("error", {"error": str(e)})
+            return
+    yield _encode_event("done", {"count": count})
+
+async def sse_response(items: AsyncIterator[Any], event: str = "message") -> StreamingResponse:
+    """
+    Stream an async iterator to the client as Server-Sent Events.
+
+    Each item is sent as one `event` as soon as it is produced, followed by a
+    final `done` event with the item count. As with NDJSON, the first item is
+    awaited before the response starts so early failures are HTTP errors.
+    """
+    try:
+        first = await items.__anext__()
+    except StopAsyncIteration:
+        first = _NOTHING
+    return StreamingResponse(
+        _sse_events(first, items, event),
+        media_type=SSE_MEDIA_TYPE,
+        headers=SSE_HEADERS
+    )
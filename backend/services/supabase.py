@@ -1 +1,57 @@
- 
\ No newline at end of file
+import os
+import asyncio
+from typing import Any, Optional
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from supabase import create_client, Client
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+def create_supabase_client() -> Client:
+    """
+    Build a Supabase client from SUPABASE_URL and SUPABASE_KEY
+    """
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_KEY")
+    if not supabase_url or not supabase_key:
+        raise ValueError("Supabase URL and key must be set in environment variables")
+    return create_client(supabase_url, supabase_key)
+
+def get_supabase_client() -> Client:
+    """
+    Get the worker's shared Supabase client, built once by the client registry
+    """
+    # Imported here because the registry imports this module to build the client
+    from .client_registry import client_registry
+    return client_registry.get("supabase")
+
+async def get_user(token: str) -> Optional[Any]:
+    """
+    Resolve a Supabase access token to its user, or None when the token is not valid.
+
+    Raises ClientUnavailable when Supabase is not configured.
+    """
+    supabase = get_supabase_client()
+    try:
+        # The Supabase client is synchronous; keep the round-trip off the event loop
+        response = await asyncio.to_thread(supabase.auth.get_user, token)
+    except Exception:
+        return None
+    return getattr(response, "user", None)
+
+async def current_user(token: str = Depends(oauth2_scheme)) -> Any:
+    """
+    FastAPI dependency that verifies the bearer token with Supabase on every request
+    """
+    from .client_registry import ClientUnavailable
+    try:
+        user = await get_user(token)
+    except ClientUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
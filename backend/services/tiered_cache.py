@@ -0,0 +1,88 @@
+import sqlite3
+from typing import Any, Awaitable, Callable, Dict, Optional
+from .ttl_cache import TTLCache
+from .sqlite_store import SQLiteKeyValueStore
+
+# Prune the disk tier once per this many writes
+PRUNE_EVERY = 500
+
+class TieredCache:
+    """
+    Bounded in-memory LRU with a TTL in front of an optional SQLite tier.
+
+    Results survive restarts when a database path is given. Concurrent
+    loads of the same key share one call.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        ttl: float,
+        max_entries: int,
+        db_path: Optional[str] = None,
+        db_max_entries: int = 100000
+    ):
+        self.memory = TTLCache(ttl=ttl, max_entries=max_entries)
+        self.store = SQLiteKeyValueStore(db_path, table, ttl, db_max_entries) if db_path else None
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_errors = 0
+        self._writes = 0
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get a cached value, calling `loader` only when no tier has it.
+
+        Values must be JSON-serialisable.
+        """
+        async def load():
+            value = self._disk_get(key)
+            if value is not None:
+                self.disk_hits += 1
+                return value
+            self.misses += 1
+            value = await loader()
+            self._disk_set(key, value)
+            return value
+
+        return await self.memory.get_or_load(key, load)
+
+    def _disk_get(self, key: str) -> Optional[Any]:
+        if self.store is None:
+            return None
+        try:
+            return self.store.get(key)
+        except sqlite3.Error:
+            # The disk tier is best effort; fall back to loading
+            self.disk_errors += 1
+            return None
+
+    def _disk_set(self, key: str, value: Any):
+        if self.store is None:
+            return
+        try:
+            self.store.set(key, value)
+            self._writes += 1
+            if self._writes % PRUNE_EVERY == 0:
+                self.store.prune()
+        except sqlite3.Error:
+            self.disk_errors += 1
+
+    def clear(self):
+        self.memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        memory = self.memory.stats()
+        memory_hits = memory["hits"]
+        hits = memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "entries": memory["entries"],
+            "max_entries": memory["max_entries"],
+            "memory_hits": memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "disk_enabled": self.store is not None,
+            "disk_errors": self.disk_errors
+        }
@@ -0,0 +1,35 @@
+import math
+
+try:
+    import tiktoken
+except ImportError:  # Optional: exact counts when installed, estimates otherwise
+    tiktoken = None
+
+# English text averages about four characters per GPT token
+CHARS_PER_TOKEN = 4
+# Chat formatting adds a few tokens per message and per reply
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+_encoding = None
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of model tokens in a piece of text
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def count_tokens(text: str) -> int:
+    """
+    Count model tokens, exactly with tiktoken if it is installed
+    """
+    global _encoding
+    if not text:
+        return 0
+    if tiktoken is None:
+        return estimate_tokens(text)
+    if _encoding is None:
+        _encoding = tiktoken.get_encoding("cl100k_base")
+    return len(_encoding.encode(text))
@@ -0,0 +1,187 @@
+import os
+import re
+import json
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, Iterable, List, Sequence, TypeVar
+from .tokens import estimate_tokens
+
+T = TypeVar("T")
+
+DEFAULT_CHUNK_TOKENS = int(os.getenv("TRANSCRIPT_CHUNK_TOKENS", "3000"))
+DEFAULT_OVERLAP_TOKENS = int(os.getenv("TRANSCRIPT_CHUNK_OVERLAP_TOKENS", "200"))
+DEFAULT_PARSE_CONCURRENCY = int(os.getenv("TRANSCRIPT_PARSE_CONCURRENCY", "4"))
+
+# "Alice:", "[00:12:03] Bob Smith:" or "00:12 Carol -" at the start of a line
+SPEAKER_TURN = re.compile(r"^\s*(?:\[?\d{1,2}(?::\d{2}){1,2}(?:\.\d+)?\]?\s*)?[A-Z][\w.'-]*(?: [A-Z][\w.'-]*){0,3}\s*[:\-]\s")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+def split_turns(transcript: str) -> List[str]:
+    """
+    Split a transcript into speaker turns.
+
+    Lines that start with a speaker label open a new turn; other lines belong
+    to the current one. A transcript without labels is one turn per line.
+    """
+    lines = [line.strip() for line in transcript.splitlines() if line.strip()]
+    if not any(SPEAKER_TURN.match(line) for line in lines):
+        return lines
+
+    turns: List[str] = []
+    for line in lines:
+        if SPEAKER_TURN.match(line) or not turns:
+            turns.append(line)
+        else:
+            turns[-1] += " " + line
+    return turns
+
+def _split_oversized(text: str, max_tokens: int) -> List[str]:
+    """
+    Split a turn that exceeds the budget on sentences, then on words
+    """
+    pieces: List[str] = []
+    current = ""
+    for sentence in SENTENCE_END.split(text):
+        words = [sentence] if estimate_tokens(sentence) <= max_tokens else sentence.split()
+        for part in words:
+            candidate = f"{current} {part}".strip()
+            if current and estimate_tokens(candidate) > max_tokens:
+                pieces.append(current)
+                current = part
+            else:
+                current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+def chunk_transcript(
+    transcript: str,
+    max_tokens: int = DEFAULT_CHUNK_TOKENS,
+    overlap_tokens: int = DEFAULT_OVERLAP_TOKENS
+) -> List[str]:
+    """
+    Pack speaker turns into windows of at most `max_tokens`.
+
+    Each window repeats the last turns of the previous one, up to
+    `overlap_tokens`, so an action spoken across a boundary keeps its context.
+    """
+    units: List[str] = []
+    for turn in split_turns(transcript):
+        if estimate_tokens(turn) > max_tokens:
+            units.extend(_split_oversized(turn, max_tokens))
+        else:
+            units.append(turn)
+
+    chunks: List[str] = []
+    window: List[str] = []
+    size = 0
+    for unit in units:
+        tokens = estimate_tokens(unit)
+        if window and size + tokens > max_tokens:
+            chunks.append("\n".join(window))
+            overlap: List[str] = []
+            overlap_size = 0
+            for previous in reversed(window):
+                previous_tokens = estimate_tokens(previous)
+                if overlap_size + previous_tokens > overlap_tokens or overlap_size + previous_tokens + tokens > max_tokens:
+                    break
+                overlap.insert(0, previous)
+                overlap_size += previous_tokens
+            window, size = overlap, overlap_size
+        window.append(unit)
+        size += tokens
+    if window:
+        chunks.append("\n".join(window))
+    return chunks
+
+async def map_chunks(
+    chunks: Sequence[str],
+    parse: Callable[[str, int], Awaitable[List[T]]],
+    max_concurrency: int = DEFAULT_PARSE_CONCURRENCY
+) -> List[List[T]]:
+    """
+    Parse chunks concurrently, at most `max_concurrency` at a time, keeping chunk order
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(index: int, chunk: str) -> List[T]:
+        async with semaphore:
+            return await parse(chunk, index)
+
+    return await asyncio.gather(*(run(index, chunk) for index, chunk in enumerate(chunks)))
+
+async def stream_chunks(
+    chunks: Sequence[str],
+    stream: Callable[[str, int], AsyncIterator[T]],
+    max_concurrency: int = DEFAULT_PARSE_CONCURRENCY,
+    key: Callable[[T], Hashable] = None
+) -> AsyncIterator[T]:
+    """
+    Stream items from concurrently parsed chunks as soon as any chunk yields them.
+
+    Items arrive in completion order rather than chunk order. Repeats from
+    overlapping windows are dropped, and a failing chunk cancels the rest.
+    """
+    key = key or action_fingerprint
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+
+    async def run(index: int, chunk: str):
+        try:
+            async with semaphore:
+                async for item in stream(chunk, index):
+                    await queue.put(item)
+            await queue.put(finished)
+        except Exception as e:
+            await queue.put(e)
+
+    tasks = [asyncio.create_task(run(index, chunk)) for index, chunk in enumerate(chunks)]
+    seen = set()
+    remaining = len(tasks)
+    try:
+        while remaining:
+            item = await queue.get()
+            if item is finished:
+                remaining -= 1
+                continue
+            if isinstance(item, Exception):
+                raise item
+            fingerprint = key(item)
+            if fingerprint not in seen:
+                seen.add(fingerprint)
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(re.sub(r"[^\w\s-]", "", value.lower()).split())
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    return value
+
+def action_fingerprint(action: Any) -> Hashable:
+    """
+    Identity of an action for de-duplication, ignoring case, punctuation and confidence
+    """
+    data = dict(action)
+    data.pop("confidence", None)
+    return json.dumps(_normalize(data), sort_keys=True, default=str)
+
+def merge_actions(results: Iterable[List[T]], key: Callable[[T], Hashable] = action_fingerprint) -> List[T]:
+    """
+    Concatenate per-chunk actions in order, dropping repeats from overlapping windows
+    """
+    seen = set()
+    merged: List[T] = []
+    for actions in results:
+        for action in actions:
+            fingerprint = key(action)
+            if fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+            merged.append(action)
+    return merged
@@ -4,33 +4,65 @@ from deepgram import Deepgram
 import os
 import json
 from datetime import datetime
+from fastapi import UploadFile
+from .transcription_service import deepgram_listen, transcription_result
+from .transcription_cache import cached_transcription, digest_bytes, digest_upload
+from .audio_upload import UploadTooLarge, iter_upload
+from .audio_preprocess import AUDIO_PREPROCESS, preprocess_audio
 
 class TranscriptionService:
     def __init__(self):
         self.deepgram_api_key = os.getenv("DEEPGRAM_API_KEY")
         self.dg_client = Deepgram(self.deepgram_api_key)
         
+    def _options(self, language: str) -> dict:
+        return {
+            "smart_format": True,
+            "model": "nova",
+            "language": language,
+            "punctuate": True,
+            "utterances": True
+        }
+    
     async def transcribe_audio(self, audio_data: bytes, language: str = "en-US") -> str:
         """
         Transcribe audio data using Deepgram
         """
         try:
-            source = {"buffer": audio_data, "mimetype": "audio/wav"}
-            response = await self.dg_client.transcription.prerecorded(
-                source,
-                {
-                    "smart_format": True,
-                    "model": "nova",
-                    "language": language,
-                    "punctuate": True,
-                    "utterances": True
-                }
-            )
-            
-            # Extract the transcript from the response
-            transcript = response["results"]["channels"][0]["alternatives"][0]["transcript"]
-            return transcript
+            options = self._options(language)
+            
+            async def transcribe():
+                audio, mimetype = audio_data, "audio/wav"
+                if AUDIO_PREPROCESS:
+                    audio, mimetype = await asyncio.to_thread(preprocess_audio, audio)
+                source = {"buffer": audio, "mimetype": mimetype}
+                response = await self.dg_client.transcription.prerecorded(source, options)
+                return transcription_result(response, language)
+            
+            # Identical audio reuses its earlier transcript
+            result = await cached_transcription(digest_bytes(audio_data), options, transcribe)
+            return result["transcript"]
+            
+        except Exception as e:
+            raise Exception(f"Transcription failed: {str(e)}")
+    
+    async def transcribe_upload(self, audio_file: UploadFile, language: str = "en-US") -> str:
+        """
+        Transcribe an uploaded file, streaming it to Deepgram instead of reading it into memory
+        """
+        try:
+            options = self._options(language)
+            chunks = iter_upload(audio_file)
+            
+            async def transcribe():
+                response = await deepgram_listen(chunks, audio_file.content_type, options, self.deepgram_api_key)
+                return transcription_result(response, language)
+            
+            result = await cached_transcription(await digest_upload(audio_file), options, transcribe)
+            return result["transcript"]
             
+        except UploadTooLarge:
+            raise
         except Exception as e:
             raise Exception(f"Transcription failed: {str(e)}")
     
@@ -111,7 +143,8 @@ class TranscriptionService:
                     
                 cleaned_lines.append(line.strip())
             
-            return " ".join(cleaned_lines)
+            # One utterance per line so long transcripts can be split on turns
+            return "\n".join(cleaned_lines)
             
         except Exception as e:
             raise Exception(f"Failed to process Teams transcript: {str(e)}") 
\ No newline at end of file
@@ -0,0 +1,115 @@
+import os
+import json
+import hashlib
+import tempfile
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import UploadFile
+from .tiered_cache import TieredCache
+from .audio_upload import UPLOAD_CHUNK_BYTES, iter_file, limit_stream
+from .audio_preprocess import AUDIO_PREPROCESS
+
+# Bump when the cached result shape changes
+CACHE_VERSION = "1"
+# Raw bodies are spooled while hashing; past this size the spool moves to a temp file
+SPOOL_MEMORY_BYTES = 1024 * 1024
+
+def audio_hasher():
+    return hashlib.sha256()
+
+def digest_bytes(data: bytes) -> str:
+    hasher = audio_hasher()
+    view = memoryview(data)
+    for start in range(0, len(view), UPLOAD_CHUNK_BYTES):
+        hasher.update(view[start:start + UPLOAD_CHUNK_BYTES])
+    return hasher.hexdigest()
+
+async def digest_upload(file: UploadFile, chunk_size: int = UPLOAD_CHUNK_BYTES) -> str:
+    """
+    Hash an upload chunk by chunk, leaving it rewound for the transcription request
+    """
+    hasher = audio_hasher()
+    await file.seek(0)
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        hasher.update(chunk)
+    await file.seek(0)
+    return hasher.hexdigest()
+
+async def digest_file(path: str) -> str:
+    hasher = audio_hasher()
+    async for chunk in iter_file(path):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+async def spool_stream(chunks: AsyncIterator[bytes]) -> Tuple[Any, str]:
+    """
+    Hash a body of unknown length while spooling it, since it cannot be read twice.
+
+    Returns the rewound spool and the digest. The upload size limit applies
+    while spooling.
+    """
+    hasher = audio_hasher()
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+    try:
+        async for chunk in limit_stream(chunks):
+            hasher.update(chunk)
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool, hasher.hexdigest()
+
+async def iter_spool(spool: Any, chunk_size: int = UPLOAD_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """
+    Stream a spool back out, closing it when done
+    """
+    try:
+        spool.seek(0)
+        while True:
+            chunk = spool.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        spool.close()
+
+def transcription_cache_key(digest: str, options: Dict[str, Any]) -> str:
+    """
+    Key a transcription by the audio's content hash and every option that changes the result
+    """
+    raw = json.dumps([CACHE_VERSION, digest, options], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class TranscriptionCache(TieredCache):
+    """
+    Transcripts keyed by a hash of the audio bytes and the transcription options.
+
+    Re-uploads of the same recording, whether from retries or from other
+    users, come back with the original transcript, confidence and language
+    without another Deepgram call.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, db_path: Optional[str] = None, db_max_entries: int = 10000):
+        super().__init__("transcriptions", ttl, max_entries, db_path, db_max_entries)
+
+transcription_cache = TranscriptionCache(
+    ttl=float(os.getenv("TRANSCRIPTION_CACHE_TTL", "604800")),
+    max_entries=int(os.getenv("TRANSCRIPTION_CACHE_MAX_ENTRIES", "200")),
+    db_path=os.getenv("TRANSCRIPTION_CACHE_DB_PATH") or None,
+    db_max_entries=int(os.getenv("TRANSCRIPTION_CACHE_DB_MAX_ENTRIES", "10000"))
+)
+
+async def cached_transcription(
+    digest: str,
+    options: Dict[str, Any],
+    transcribe: Callable[[], Awaitable[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """
+    Get the transcription of audio with this digest, calling `transcribe` on a miss
+    """
+    # Preprocessing changes what Deepgram hears, so it is part of the key
+    key = transcription_cache_key(digest, {**options, "preprocess": AUDIO_PREPROCESS})
+    return await transcription_cache.get_or_load(key, transcribe)
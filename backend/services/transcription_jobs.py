@@ -0,0 +1,240 @@
+import os
+import time
+import uuid
+import asyncio
+import tempfile
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from fastapi import UploadFile
+from .sqlite_store import SQLiteKeyValueStore
+from .audio_upload import iter_upload, limit_stream
+from .client_registry import client_registry
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+FINISHED = {COMPLETED, FAILED}
+
+class JobQueueFull(Exception):
+    """
+    Too many transcription jobs are waiting for a worker
+    """
+
+async def transcribe_job_audio(path: str, language: Optional[str], content_type: Optional[str]) -> Dict[str, Any]:
+    # Jobs are for long recordings, so they are cut at pauses and transcribed in parallel
+    return await client_registry.get("deepgram").transcribe_long(path, language, content_type or "audio/wav")
+
+class TranscriptionJobs:
+    """
+    Runs transcriptions in the background on a fixed number of workers.
+
+    Submitting spools the audio to disk and returns a job id at once, so
+    request latency no longer depends on recording length and the worker
+    count caps concurrent Deepgram calls. Job state lives in SQLite and the
+    audio stays on disk until its job finishes, so queued and interrupted
+    jobs are picked up again after a restart.
+    """
+
+    def __init__(
+        self,
+        transcribe: Callable[[str, Optional[str], Optional[str]], Awaitable[Dict[str, Any]]],
+        db_path: str,
+        audio_dir: str,
+        workers: int,
+        max_queued: int,
+        ttl: float
+    ):
+        self.transcribe = transcribe
+        self.db_path = db_path
+        self.audio_dir = audio_dir
+        self.workers = workers
+        self.max_queued = max_queued
+        self.ttl = ttl
+        self.store: Optional[SQLiteKeyValueStore] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._watchers: Dict[str, List[asyncio.Queue]] = {}
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.recovered = 0
+        self.rejected = 0
+
+    async def start(self):
+        """
+        Open the job store, re-queue unfinished jobs and start the workers
+        """
+        if self._tasks:
+            return
+        os.makedirs(self.audio_dir, exist_ok=True)
+        self.store = SQLiteKeyValueStore(self.db_path, "transcription_jobs", self.ttl)
+        self._queue = asyncio.Queue()
+        live = set()
+        for job in self.store.values():
+            live.add(job["id"])
+            if job["status"] in FINISHED:
+                continue
+            if os.path.exists(self._audio_path(job["id"])):
+                self._save({**job, "status": QUEUED, "started_at": None})
+                self._queue.put_nowait(job["id"])
+                self.recovered += 1
+            else:
+                self._save({**job, "status": FAILED, "error": "Audio was lost before the job ran", "finished_at": time.time()})
+        # Audio left behind by jobs that have since expired
+        for name in os.listdir(self.audio_dir):
+            if name not in live:
+                self._remove_audio(name)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self):
+        """
+        Stop the workers; jobs they were running stay unfinished and resume on the next start
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.running = 0
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    async def submit_upload(self, file: UploadFile, language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Queue an uploaded file for transcription
+        """
+        return await self.submit(iter_upload(file), file.content_type, language, file.filename)
+
+    async def submit(
+        self,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str] = None,
+        language: Optional[str] = None,
+        filename: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Spool audio to disk and queue it, returning the new job
+        """
+        if self.store is None:
+            raise Exception("Transcription jobs are not running")
+        if self._queue.qsize() >= self.max_queued:
+            self.rejected += 1
+            raise JobQueueFull(f"{self.max_queued} transcription jobs are already waiting")
+
+        job_id = uuid.uuid4().hex
+        path = self._audio_path(job_id)
+        size = 0
+        try:
+            with open(path, "wb") as f:
+                async for chunk in limit_stream(chunks):
+                    await asyncio.to_thread(f.write, chunk)
+                    size += len(chunk)
+        except BaseException:
+            self._remove_audio(job_id)
+            raise
+
+        now = time.time()
+        job = {
+            "id": job_id,
+            "status": QUEUED,
+            "filename": filename,
+            "content_type": content_type,
+            "language": language,
+            "size": size,
+            "created_at": now,
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None
+        }
+        self._save(job)
+        self._queue.put_nowait(job_id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if self.store is None:
+            return None
+        return self.store.get(job_id)
+
+    async def watch(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the job now and after every change until it finishes
+        """
+        updates: asyncio.Queue = asyncio.Queue()
+        self._watchers.setdefault(job_id, []).append(updates)
+        try:
+            job = self.get(job_id)
+            while job is not None:
+                yield job
+                if job["status"] in FINISHED:
+                    break
+                job = await updates.get()
+        finally:
+            watchers = self._watchers.get(job_id, [])
+            if updates in watchers:
+                watchers.remove(updates)
+            if not watchers:
+                self._watchers.pop(job_id, None)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        job = self.get(job_id)
+        if job is None or job["status"] in FINISHED:
+            return
+        job = self._save({**job, "status": RUNNING, "started_at": time.time()})
+        self.running += 1
+        try:
+            result = await self.transcribe(self._audio_path(job_id), job["language"], job["content_type"])
+        except Exception as e:
+            self.failed += 1
+            self._save({**job, "status": FAILED, "error": str(e), "finished_at": time.time()})
+        else:
+            self.completed += 1
+            self._save({**job, "status": COMPLETED, "result": result, "finished_at": time.time()})
+        finally:
+            self.running -= 1
+        # Only finished jobs give up their audio; cancelled ones resume after a restart
+        self._remove_audio(job_id)
+
+    def _save(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        self.store.set(job["id"], job)
+        for updates in self._watchers.get(job["id"], []):
+            updates.put_nowait(job)
+        return job
+
+    def _audio_path(self, job_id: str) -> str:
+        return os.path.join(self.audio_dir, job_id)
+
+    def _remove_audio(self, job_id: str):
+        try:
+            os.remove(self._audio_path(job_id))
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_queued": self.max_queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "recovered": self.recovered,
+            "rejected": self.rejected
+        }
+
+transcription_jobs = TranscriptionJobs(
+    transcribe=transcribe_job_audio,
+    db_path=os.getenv("TRANSCRIPTION_JOB_DB_PATH") or os.path.join(tempfile.gettempdir(), "transcription_jobs.db"),
+    audio_dir=os.getenv("TRANSCRIPTION_JOB_AUDIO_DIR") or os.path.join(tempfile.gettempdir(), "transcription_jobs"),
+    workers=int(os.getenv("TRANSCRIPTION_JOB_WORKERS", "2")),
+    max_queued=int(os.getenv("TRANSCRIPTION_JOB_MAX_QUEUED", "100")),
+    ttl=float(os.getenv("TRANSCRIPTION_JOB_TTL", "86400"))
+)
@@ -1,10 +1,73 @@
 import os
+import asyncio
 import aiohttp
-from typing import Optional, Dict, Any
+from typing import AsyncIterator, Optional, Dict, Any
 from fastapi import UploadFile
 from ..models.transcription import TranscriptionResponse
 import json
 from deepgram import Deepgram
+from .http_pool import HttpPool
+from .live_transcription import DeepgramLiveSession, encode_options
+from .audio_upload import UploadTooLarge, iter_file, iter_upload
+from .audio_preprocess import AUDIO_PREPROCESS, prepare_audio, preprocess_audio, read_wav_head, replay_stream
+from .audio_split import SPLIT_CONCURRENCY, SPLIT_WINDOW_SECONDS, detected_language, split_wav_stream, stitch_transcripts
+from .transcription_cache import (
+    cached_transcription,
+    digest_bytes,
+    digest_file,
+    digest_upload,
+    iter_spool,
+    spool_stream
+)
+
+# Keep-alive connections to Deepgram; audio uploads and live sessions outlast Jira calls
+deepgram_http_pool = HttpPool("deepgram", total_timeout=float(os.getenv("DEEPGRAM_HTTP_TOTAL_TIMEOUT", "300")))
+
+async def deepgram_listen(
+    audio: Any,
+    content_type: Optional[str],
+    options: Dict[str, Any],
+    api_key: Optional[str] = None,
+    base_url: Optional[str] = None,
+    preprocess: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    POST audio to the prerecorded /listen API over the shared Deepgram pool.
+
+    `audio` may be bytes or an async iterator of chunks; iterators are sent
+    with chunked transfer encoding so only one chunk is held at once. WAV
+    audio is downmixed, resampled and trimmed first when AUDIO_PREPROCESS
+    is on, or when `preprocess` says so.
+    """
+    if AUDIO_PREPROCESS if preprocess is None else preprocess:
+        audio, content_type, options = await prepare_audio(audio, content_type, options)
+    api_key = api_key or os.getenv("DEEPGRAM_API_KEY")
+    base_url = base_url or os.getenv("DEEPGRAM_API_URL", "https://api.deepgram.com/v1")
+    session = await deepgram_http_pool.session()
+    url = f"{base_url}/listen?{encode_options(options)}"
+    headers = {"Authorization": f"Token {api_key}", "Content-Type": content_type or "audio/wav"}
+    try:
+        async with session.post(url, headers=headers, data=audio) as response:
+            if response.status >= 400:
+                error_text = await response.text()
+                raise Exception(f"Deepgram API error: {error_text}")
+            return await response.json()
+    except aiohttp.ClientConnectionError as e:
+        # Limits on bodies of unknown length trip mid-upload, inside aiohttp's writer
+        if isinstance(e.__cause__, UploadTooLarge):
+            raise e.__cause__
+        raise
+
+def transcription_result(response: Dict[str, Any], language: str) -> Dict[str, Any]:
+    """
+    Pick the transcript, confidence and language out of a Deepgram response
+    """
+    channel = response["results"]["channels"][0]
+    return {
+        "transcript": channel["alternatives"][0]["transcript"],
+        "confidence": channel["alternatives"][0]["confidence"],
+        "language": channel.get("detected_language", language)
+    }
 
 class TranscriptionService:
     def __init__(self):
@@ -12,6 +75,7 @@ class TranscriptionService:
         if not self.api_key:
             raise ValueError("Missing Deepgram API key")
         self.client = Deepgram(self.api_key)
+        self.base_url = os.getenv("DEEPGRAM_API_URL", "https://api.deepgram.com/v1")
         
         # Default transcription options
         self.default_options = {
@@ -23,39 +87,198 @@ class TranscriptionService:
     
     async def transcribe_audio(self, audio_data: bytes, language: Optional[str] = None) -> Dict[str, Any]:
         """
-        Transcribe audio data using Deepgram
+        Transcribe audio data using Deepgram, reusing the transcript of identical audio
         """
         try:
-            options = self.default_options.copy()
-            if language:
-                options["language"] = language
-                
-            response = await self.client.transcription.prerecorded(
-                audio_data,
-                options
-            )
+            options = self._options(language)
+            
+            async def transcribe() -> Dict[str, Any]:
+                audio = audio_data
+                if AUDIO_PREPROCESS:
+                    audio, _ = await asyncio.to_thread(preprocess_audio, audio)
+                response = await self.client.transcription.prerecorded(
+                    audio,
+                    options
+                )
+                return transcription_result(response, options["language"])
             
-            return {
-                "transcript": response["results"]["channels"][0]["alternatives"][0]["transcript"],
-                "confidence": response["results"]["channels"][0]["alternatives"][0]["confidence"],
-                "language": response["results"]["channels"][0]["detected_language"]
-            }
+            return await cached_transcription(digest_bytes(audio_data), options, transcribe)
             
         except Exception as e:
             raise Exception(f"Failed to transcribe audio: {str(e)}")
     
-    async def transcribe_file(self, file_path: str, language: Optional[str] = None) -> Dict[str, Any]:
+    async def transcribe_upload(self, file: UploadFile, language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Transcribe an uploaded file, streaming it to Deepgram chunk by chunk
+        """
+        options = self._options(language)
+        chunks = iter_upload(file)
+        digest = await digest_upload(file)
+        return await cached_transcription(digest, options, lambda: self._transcribe(chunks, file.content_type, options))
+    
+    async def transcribe_file(
+        self,
+        file_path: str,
+        language: Optional[str] = None,
+        content_type: str = "audio/wav"
+    ) -> Dict[str, Any]:
+        """
+        Transcribe audio from a file using Deepgram, streaming it from disk
+        """
+        try:
+            options = self._options(language)
+            digest = await digest_file(file_path)
+            return await cached_transcription(
+                digest,
+                options,
+                lambda: self._transcribe(iter_file(file_path), content_type, options)
+            )
+        except UploadTooLarge:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to transcribe file: {str(e)}")
+    
+    async def transcribe_chunks(
+        self,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str] = None,
+        language: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Transcribe audio from a file using Deepgram
+        Transcribe audio arriving as chunks, such as a raw request body.
+
+        The body is hashed while it is spooled, then streamed to Deepgram
+        from the spool only if the same audio has not been transcribed before.
+        """
+        options = self._options(language)
+        spool, digest = await spool_stream(chunks)
+        try:
+            return await cached_transcription(digest, options, lambda: self._transcribe(iter_spool(spool), content_type, options))
+        finally:
+            spool.close()
+    
+    async def transcribe_long(
+        self,
+        file_path: str,
+        language: Optional[str] = None,
+        content_type: str = "audio/wav",
+        window_seconds: float = SPLIT_WINDOW_SECONDS,
+        concurrency: int = SPLIT_CONCURRENCY
+    ) -> Dict[str, Any]:
+        """
+        Transcribe a long recording as windows cut at pauses, several at a time.
+
+        Wall-clock time approaches that of one window instead of growing with
+        the recording. The result carries word and utterance timestamps on the
+        recording's own timeline. Audio that is not PCM WAV cannot be cut and
+        is sent in one request.
         """
         try:
-            with open(file_path, "rb") as audio:
-                audio_data = audio.read()
-                return await self.transcribe_audio(audio_data, language)
-                
+            options = {**self._options(language), "punctuate": True, "utterances": True}
+            digest = await digest_file(file_path)
+            return await cached_transcription(
+                digest,
+                {**options, "split_seconds": window_seconds},
+                lambda: self._transcribe_split(iter_file(file_path), content_type, options, window_seconds, concurrency)
+            )
+        except UploadTooLarge:
+            raise
         except Exception as e:
             raise Exception(f"Failed to transcribe file: {str(e)}")
     
+    async def _transcribe_split(
+        self,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str],
+        options: Dict[str, Any],
+        window_seconds: float,
+        concurrency: int
+    ) -> Dict[str, Any]:
+        head, ended, is_wav = await read_wav_head(chunks)
+        audio = replay_stream(head, chunks, ended)
+        if not is_wav:
+            response = await self._post_audio(audio, content_type, options)
+            parts = [(0.0, response)]
+        else:
+            parts = await self._transcribe_windows(split_wav_stream(audio, window_seconds), options, concurrency)
+        result = stitch_transcripts(parts)
+        return {**result.dict(), "language": detected_language(parts, options["language"]), "windows": len(parts)}
+    
+    async def _transcribe_windows(self, windows: AsyncIterator[Any], options: Dict[str, Any], concurrency: int) -> list:
+        # Acquiring before each window is cut also bounds how many windows sit in memory
+        slots = asyncio.Semaphore(concurrency)
+        tasks = []
+        
+        async def transcribe(window) -> tuple:
+            try:
+                # Windows are already mono 16 kHz; trimming silence would shift their timestamps
+                response = await deepgram_listen(window.audio, "audio/wav", options, self.api_key, self.base_url, preprocess=False)
+                return window.offset, response
+            finally:
+                slots.release()
+        
+        try:
+            await slots.acquire()
+            async for window in windows:
+                tasks.append(asyncio.create_task(transcribe(window)))
+                await slots.acquire()
+            slots.release()
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    
+    def _options(self, language: Optional[str]) -> Dict[str, Any]:
+        options = self.default_options.copy()
+        if language:
+            options["language"] = language
+        return options
+    
+    async def _transcribe(
+        self,
+        audio: Any,
+        content_type: Optional[str],
+        options: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        result = await self._post_audio(audio, content_type, options)
+        return transcription_result(result, options["language"])
+    
+    async def _post_audio(
+        self,
+        audio: Any,
+        content_type: Optional[str],
+        options: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return await deepgram_listen(audio, content_type, options, self.api_key, self.base_url)
+    
+    def live_session(
+        self,
+        language: Optional[str] = None,
+        encoding: Optional[str] = None,
+        sample_rate: Optional[int] = None,
+        channels: Optional[int] = None
+    ) -> DeepgramLiveSession:
+        """
+        Create a Deepgram live session returning interim and final transcripts.
+
+        Encoding and sample rate are only needed for raw audio; containerised
+        audio such as WebM from a browser recorder is detected by Deepgram.
+        """
+        options = {
+            "model": self.default_options["model"],
+            "language": language or self.default_options["language"],
+            "smart_format": True,
+            "punctuate": True,
+            "interim_results": True,
+            "utterance_end_ms": 1000,
+            "encoding": encoding,
+            "sample_rate": sample_rate,
+            "channels": channels
+        }
+        return DeepgramLiveSession(self.api_key, options, deepgram_http_pool)
+    
     def get_supported_languages(self) -> list:
         """
         Get list of supported languages for transcription
@@ -81,35 +304,18 @@ class TranscriptionService:
         language: str = "en"
     ) -> TranscriptionResponse:
         """
-        Transcribe an audio file using Deepgram
+        Transcribe an audio file using Deepgram, streaming the upload in chunks
         """
-        async with aiohttp.ClientSession() as session:
-            # Read the file content
-            content = await file.read()
-            
-            # Prepare the request
-            url = f"{self.base_url}/listen?language={language}&model=nova"
-            
-            # Make the request to Deepgram
-            async with session.post(
-                url,
-                headers=self.headers,
-                data=content
-            ) as response:
-                if response.status >= 400:
-                    error_text = await response.text()
-                    raise Exception(f"Deepgram API error: {error_text}")
-                
-                result = await response.json()
-                
-                # Extract the transcription from the response
-                transcript = result["results"]["channels"][0]["alternatives"][0]
-                
-                return TranscriptionResponse(
-                    text=transcript["transcript"],
-                    confidence=transcript["confidence"],
-                    language=language
-                )
+        options = {"language": language, "model": "nova"}
+        chunks = iter_upload(file)
+        digest = await digest_upload(file)
+        result = await cached_transcription(digest, options, lambda: self._transcribe(chunks, file.content_type, options))
+        
+        return TranscriptionResponse(
+            text=result["transcript"],
+            confidence=result["confidence"],
+            language=language
+        )
 
     async def transcribe_stream(
         self,
@@ -119,25 +325,21 @@ class TranscriptionService:
         """
         Transcribe streaming audio data using Deepgram
         """
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.base_url}/listen?language={language}&model=nova&encoding=linear16&sample_rate=16000"
-            
-            async with session.post(
-                url,
-                headers=self.headers,
-                data=audio_chunk
-            ) as response:
-                if response.status >= 400:
-                    error_text = await response.text()
-                    raise Exception(f"Deepgram API error: {error_text}")
-                
-                result = await response.json()
-                
-                # Extract the transcription from the response
-                transcript = result["results"]["channels"][0]["alternatives"][0]
-                
-                return TranscriptionResponse(
-                    text=transcript["transcript"],
-                    confidence=transcript["confidence"],
-                    language=language
-                ) 
\ No newline at end of file
+        result = await deepgram_listen(
+            audio_chunk,
+            "application/octet-stream",
+            {"language": language, "model": "nova", "encoding": "linear16", "sample_rate": 16000},
+            self.api_key,
+            self.base_url,
+            # Raw PCM chunks are already in the format preprocessing produces
+            preprocess=False
+        )
+        
+        # Extract the transcription from the response
+        transcript = result["results"]["channels"][0]["alternatives"][0]
+        
+        return TranscriptionResponse(
+            text=transcript["transcript"],
+            confidence=transcript["confidence"],
+            language=language
+        )
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+class _LoadCancelled(Exception):
+    """
+    The shared load a waiter joined was cancelled before it finished
+    """
+
+@dataclass
+class CacheEntry:
+    value: Any
+    stored_at: float
+
+class TTLCache:
+    """
+    Bounded LRU cache with a freshness TTL and a stale-while-revalidate window.
+
+    Within `ttl` an entry is served as-is. Between `ttl` and `ttl + stale_ttl`
+    it is still served, but a single background refresh is started. Older
+    entries are reloaded inline. Concurrent loads of the same key share one
+    upstream call.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0.0, max_entries: int = 1000):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Get a fresh entry, or None if missing or older than the TTL
+        """
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry.stored_at >= self.ttl:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: Hashable, value: Any) -> CacheEntry:
+        """
+        Store a value, evicting the least recently used entries past the bound
+        """
+        entry = CacheEntry(value=value, stored_at=time.monotonic())
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get a cached value, loading or refreshing it through `loader` as needed
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.stored_at
+            if age < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._inflight:
+                    task = asyncio.create_task(self._load(key, loader))
+                    self._refresh_tasks.add(task)
+                    task.add_done_callback(self._refresh_done)
+                return entry.value
+
+        self.misses += 1
+        return await self._load(key, loader)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except _LoadCancelled:
+                # Only the leader was cancelled, not this caller: load the value itself
+                return await self._load(key, loader)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not logged as lost
+            future.exception()
+            raise
+        except BaseException:
+            # Cancelled: release the coalesced waiters instead of leaving them hanging.
+            # An exception rather than future.cancel() lets them tell this apart from their own cancellation.
+            future.set_exception(_LoadCancelled())
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _refresh_done(self, task: asyncio.Task):
+        self._refresh_tasks.discard(task)
+        if not task.cancelled():
+            # A failed background refresh keeps serving the stale entry
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses
+        }
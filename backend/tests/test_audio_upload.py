@@ -0,0 +1,103 @@
+import os
+import tempfile
+import tracemalloc
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+from backend.services.audio_upload import UploadTooLarge, iter_upload, limit_stream
+from backend.services.transcription_service import TranscriptionService, deepgram_http_pool
+
+UPLOAD_BYTES = 32 * 1024 * 1024
+
+class FakeListen:
+    """Prerecorded /listen endpoint that counts the bytes it receives"""
+
+    def __init__(self):
+        self.requests = 0
+        self.received = 0
+        self.chunked = None
+
+    async def handler(self, request):
+        self.requests += 1
+        self.chunked = request.headers.get("Transfer-Encoding") == "chunked"
+        async for chunk in request.content.iter_chunked(64 * 1024):
+            self.received += len(chunk)
+        return web.json_response({
+            "results": {"channels": [{"alternatives": [{"transcript": "hello", "confidence": 0.9}]}]}
+        })
+
+@pytest_asyncio.fixture
+async def deepgram(monkeypatch):
+    fake = FakeListen()
+    app = web.Application(client_max_size=0)
+    app.router.add_post("/v1/listen", fake.handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    monkeypatch.setenv("DEEPGRAM_API_KEY", "key")
+    monkeypatch.setenv("DEEPGRAM_API_URL", f"http://127.0.0.1:{port}/v1")
+    yield fake
+    await deepgram_http_pool.close()
+    await runner.cleanup()
+
+def spooled_upload(size: int) -> UploadFile:
+    """An upload as Starlette hands it over: spooled, rolled over to disk"""
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    block = os.urandom(1024 * 1024)
+    for _ in range(size // len(block)):
+        spool.write(block)
+    spool.seek(0)
+    return UploadFile(file=spool, filename="meeting.wav", headers=Headers({"content-type": "audio/wav"}))
+
+@pytest.mark.asyncio
+async def test_large_upload_streams_with_constant_memory(deepgram):
+    upload = spooled_upload(UPLOAD_BYTES)
+    service = TranscriptionService()
+
+    tracemalloc.start()
+    result = await service.transcribe_upload(upload, "en-US")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert result["transcript"] == "hello"
+    assert deepgram.received == UPLOAD_BYTES
+    assert deepgram.chunked
+    assert peak < UPLOAD_BYTES / 4
+
+@pytest.mark.asyncio
+async def test_oversized_upload_is_rejected_before_sending(deepgram):
+    upload = spooled_upload(2 * 1024 * 1024)
+
+    with pytest.raises(UploadTooLarge):
+        async for _ in iter_upload(upload, max_bytes=1024 * 1024):
+            pass
+    with pytest.raises(UploadTooLarge):
+        await TranscriptionService().transcribe_chunks(iter_upload(upload, max_bytes=1024 * 1024))
+
+    assert deepgram.requests == 0
+
+@pytest.mark.asyncio
+async def test_body_of_unknown_length_fails_past_the_limit():
+    async def body():
+        for _ in range(4):
+            yield b"\x00" * 1024
+
+    received = []
+    with pytest.raises(UploadTooLarge):
+        async for chunk in limit_stream(body(), max_bytes=3000):
+            received.append(chunk)
+
+    assert len(received) == 2
+
+@pytest.mark.asyncio
+async def test_limit_tripped_mid_upload_surfaces_as_too_large(deepgram):
+    async def body():
+        for _ in range(4):
+            yield b"\x00" * 1024
+
+    with pytest.raises(UploadTooLarge):
+        await TranscriptionService().transcribe_chunks(limit_stream(body(), max_bytes=3000), "audio/wav")
@@ -0,0 +1,69 @@
+import pytest
+from backend.services.batch_executor import split_bulk_response
+from backend.services.command_parser import JiraAction
+from backend.services.jira_client import JiraClient
+
+class RecordingJira:
+    """Stand-in for jira.JIRA that records bulk and single calls"""
+
+    def __init__(self):
+        self.bulk_calls = []
+
+    def create_issues(self, field_list, prefetch=True):
+        self.bulk_calls.append(field_list)
+        return [
+            {
+                "status": "Success",
+                "issue": type("Issue", (), {"key": f"{fields['project']['key']}-{n}", "self": "", "id": str(n)}),
+                "error": None
+            }
+            for n, fields in enumerate(field_list)
+        ]
+
+    def add_comment(self, key, body):
+        raise Exception(f"Issue {key} does not exist")
+
+def make_client() -> JiraClient:
+    client = JiraClient.__new__(JiraClient)
+    client.server_url = "https://example.atlassian.net"
+    client.email = "bot@example.com"
+    client.client = RecordingJira()
+    return client
+
+@pytest.mark.asyncio
+async def test_creates_are_bulked_per_project_in_chunks_of_fifty():
+    client = make_client()
+    actions = [JiraAction(action_type="create", project_key="PROJ", summary=f"Task {n}") for n in range(60)]
+    actions += [JiraAction(action_type="create", project_key="OPS", summary="Ops task")]
+
+    results = await client.execute_actions(actions)
+
+    assert [len(call) for call in client.client.bulk_calls] == [50, 10, 1]
+    assert all(result["success"] for result in results)
+    assert results[-1]["data"]["key"] == "OPS-0"
+
+@pytest.mark.asyncio
+async def test_failed_actions_are_reported_per_action():
+    client = make_client()
+    actions = [
+        JiraAction(action_type="comment", issue_key="PROJ-404", comment="Hi"),
+        JiraAction(action_type="create", summary="No project"),
+        JiraAction(action_type="create", project_key="PROJ", summary="Ok")
+    ]
+
+    results = await client.execute_actions(actions)
+
+    assert [result["success"] for result in results] == [False, False, True]
+    assert "PROJ-404" in results[0]["message"]
+
+def test_split_bulk_response_maps_failures_by_element():
+    response = {
+        "issues": [{"id": "1", "key": "PROJ-1", "self": ""}, {"id": "3", "key": "PROJ-3", "self": ""}],
+        "errors": [{"failedElementNumber": 1, "elementErrors": {"errors": {"summary": "required"}}}]
+    }
+
+    results = split_bulk_response(3, response)
+
+    assert [result["success"] for result in results] == [True, False, True]
+    assert results[2]["data"]["key"] == "PROJ-3"
+    assert "summary: required" in results[1]["message"]
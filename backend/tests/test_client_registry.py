@@ -0,0 +1,124 @@
+import threading
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from fastapi import HTTPException
+from backend.services.client_registry import ClientRegistry, ClientUnavailable, use_client, client_registry
+from backend.services.http_pool import HttpPool
+
+class Upstream:
+    """Counts requests so tests can tell warm-up traffic from real calls"""
+
+    def __init__(self):
+        self.requests = 0
+
+    async def handler(self, request):
+        self.requests += 1
+        return web.json_response({"ok": True})
+
+@pytest_asyncio.fixture
+async def upstream():
+    fake = Upstream()
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", fake.handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    fake.url = f"http://127.0.0.1:{port}"
+    yield fake
+    await runner.cleanup()
+
+def counting_factory():
+    calls = {"count": 0}
+
+    def build():
+        calls["count"] += 1
+        return object()
+
+    return build, calls
+
+def test_clients_are_built_once_across_threads():
+    registry = ClientRegistry()
+    build, calls = counting_factory()
+    registry.register("deepgram", build)
+    clients = []
+
+    threads = [threading.Thread(target=lambda: clients.append(registry.get("deepgram"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls["count"] == 1
+    assert all(client is clients[0] for client in clients)
+
+@pytest.mark.asyncio
+async def test_missing_configuration_does_not_stop_startup():
+    registry = ClientRegistry()
+    build, _ = counting_factory()
+    registry.register("jira", build)
+
+    def broken():
+        raise ValueError("Missing required Jira credentials")
+
+    registry.register("supabase", broken)
+    await registry.start(prewarm_connections=0)
+
+    stats = registry.stats()
+    assert stats["started"]
+    assert stats["clients"]["jira"] == {"ready": True, "error": None}
+    assert "credentials" in stats["clients"]["supabase"]["error"]
+    with pytest.raises(ClientUnavailable):
+        registry.get("supabase")
+
+def test_dependency_answers_503_for_unavailable_clients():
+    def broken():
+        raise ValueError("Missing Deepgram API key")
+
+    client_registry.register("broken", broken)
+    try:
+        with pytest.raises(HTTPException) as error:
+            use_client("broken")()
+        assert error.value.status_code == 503
+    finally:
+        client_registry._factories.pop("broken")
+
+@pytest.mark.asyncio
+async def test_pools_are_prewarmed_and_closed(upstream):
+    registry = ClientRegistry()
+    pool = HttpPool("test", keepalive_timeout=30)
+    registry.add_pool("test", pool, lambda: upstream.url)
+    build, _ = counting_factory()
+    registry.register("test", build)
+
+    await registry.start(prewarm_connections=2)
+    warm = registry.stats()["pools"]["test"]
+    session = await pool.session()
+    async with session.get(f"{upstream.url}/v1/projects") as response:
+        await response.json()
+    used = pool.stats()
+    await registry.close()
+
+    assert warm["prewarmed"] == 2 and warm["connections_created"] == 2
+    assert warm["idle_connections"] == 2
+    # The first real request rides a warmed connection
+    assert used["connections_created"] == 2 and used["connections_reused"] == 1
+    assert upstream.requests == 3
+    assert not pool.stats()["open"]
+    assert not registry.stats()["clients"]["test"]["ready"]
+
+@pytest.mark.asyncio
+async def test_unreachable_upstream_is_reported_not_raised():
+    registry = ClientRegistry()
+    pool = HttpPool("test", connect_timeout=1)
+    # Nothing listens on port 9 locally
+    registry.add_pool("test", pool, lambda: "http://127.0.0.1:9")
+
+    await registry.start(prewarm_connections=1)
+    stats = registry.stats()["pools"]["test"]
+    await registry.close()
+
+    assert stats["prewarmed"] == 0
+    assert stats["prewarm_error"]
@@ -0,0 +1,68 @@
+import pytest
+from backend.services.fast_parser import FastCommandParser
+
+@pytest.fixture
+def parser():
+    return FastCommandParser(min_confidence=0.9)
+
+def test_comment_command(parser):
+    action = parser.parse("Add a comment to PROJ-123 saying the bug is fixed").to_jira_action()
+
+    assert action.action_type == "comment"
+    assert action.issue_key == "PROJ-123"
+    assert action.comment == "The bug is fixed"
+
+def test_quoted_comment_is_used_verbatim(parser):
+    response = parser.parse('comment on proj-7: "ship it tomorrow"').to_command_response()
+
+    assert response.action == "update_comment"
+    assert response.details == {"task_id": "PROJ-7", "comment": "ship it tomorrow"}
+
+def test_status_update(parser):
+    action = parser.parse("Move PROJ-456 to in progress.").to_jira_action()
+
+    assert action.action_type == "update"
+    assert action.fields == {"status": "In Progress"}
+
+def test_create_uses_project_context(parser):
+    action = parser.parse("Create a bug called Login button is broken", "WEB").to_jira_action()
+
+    assert action.project_key == "WEB"
+    assert action.summary == "Login button is broken"
+    assert action.issue_type == "Bug"
+
+def test_search_builds_jql(parser):
+    action = parser.parse("Find all high priority bugs in PROJECT").to_jira_action()
+
+    assert action.jql == "project = PROJECT AND type = Bug AND priority = High"
+
+def test_my_issues_are_assigned_to_the_current_user(parser):
+    parsed = parser.parse("show my bugs", "WEB")
+
+    assert parsed.to_jira_action().jql == "project = WEB AND type = Bug AND assignee = currentUser()"
+    assert parsed.to_command_response().details["assignee"] == "currentUser()"
+    assert parser.parse("find my bugs assigned to Sam", "WEB") is None
+
+def test_assigning_to_me_is_left_to_the_llm(parser):
+    assert parser.parse("assign WEB-1 to me") is None
+
+    action = parser.parse("assign WEB-1 to Sam").to_jira_action()
+    assert action.fields == {"assignee": {"name": "Sam"}}
+
+def test_issue_keys_are_not_taken_as_projects(parser):
+    action = parser.parse("add a task for WEB-12 to fix flaky test", "WEB").to_jira_action()
+
+    assert action.project_key == "WEB"
+    assert parser.parse("add a task for WEB-12 to fix flaky test") is None
+    assert parser.parse("find bugs in WEB-12") is None
+
+def test_unsure_commands_fall_back_to_llm(parser):
+    assert parser.parse("Move PROJ-1 to the column Sam mentioned") is None
+    assert parser.parse("create a task called Write docs") is None
+    assert parser.parse("find bugs in login") is None
+    assert parser.parse("what did we decide about the release?") is None
+
+    stats = parser.stats()
+    assert stats["hits"] == 0
+    assert stats["low_confidence"] == 3
+    assert stats["misses"] == 1
@@ -0,0 +1,179 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+import requests
+from jira import JIRA
+from backend.services.command_parser import JiraAction
+from backend.services.issue_cache import issue_cache_key, issue_snapshot_cache
+from backend.services.jira_client import JiraClient
+from backend.services.project_cache import project_cache
+
+SLOW_CALL_SECONDS = 0.2
+
+class SlowJira:
+    """Synchronous stand-in for jira.JIRA with a slow network round-trip"""
+
+    def search_issues(self, jql, startAt=0, maxResults=50, fields=None, json_result=False):
+        time.sleep(SLOW_CALL_SECONDS)
+        return {
+            "startAt": startAt,
+            "total": 1,
+            "issues": [
+                {
+                    "id": "10001",
+                    "key": "PROJ-1",
+                    "fields": {"summary": "Slow issue", "status": {"name": "To Do"}, "assignee": None}
+                }
+            ][startAt:]
+        }
+
+    def projects(self):
+        time.sleep(SLOW_CALL_SECONDS)
+        return []
+
+class WriteOnlyJira:
+    """Stand-in for jira.JIRA that fails on any issue fetch"""
+
+    def __init__(self):
+        self.writes = []
+        self._session = self
+
+    def issue(self, key, fields=None):
+        raise AssertionError("writes must not fetch the issue first")
+
+    def _get_url(self, path):
+        return f"https://example.atlassian.net/rest/api/2/{path}"
+
+    def add_comment(self, key, body):
+        self.writes.append(("comment", key))
+        return SimpleNamespace(id="1", body=body, created="now")
+
+    def put(self, url, data=None):
+        self.writes.append(("put", url))
+
+class SlowReadJira(WriteOnlyJira):
+    """Stand-in for jira.JIRA whose issue fetch and edit both take a network round-trip"""
+
+    def issue(self, key, fields=None):
+        time.sleep(SLOW_CALL_SECONDS)
+        self.writes.append(("get", key))
+        return SimpleNamespace(raw={"id": "10001", "key": key, "self": self._get_url(f"issue/{key}")})
+
+    def put(self, url, data=None):
+        time.sleep(SLOW_CALL_SECONDS)
+        super().put(url, data)
+
+class RecordingAdapter(requests.adapters.BaseAdapter):
+    """Transport for a real python-jira session that records requests instead of sending them"""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        response = requests.Response()
+        response.status_code = 204
+        response._content = b""
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+def make_client(jira=None) -> JiraClient:
+    client = JiraClient.__new__(JiraClient)
+    client.server_url = "https://example.atlassian.net"
+    client.email = "bot@example.com"
+    client.client = jira or SlowJira()
+    return client
+
+@pytest.fixture(autouse=True)
+def clear_issue_cache():
+    issue_snapshot_cache.clear()
+    yield
+    issue_snapshot_cache.clear()
+
+@pytest.mark.asyncio
+async def test_parallel_slow_calls_do_not_serialize():
+    client = make_client()
+    action = JiraAction(action_type="search", jql="project = PROJ")
+    calls = 8
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(client.execute_action(action) for _ in range(calls)))
+    elapsed = time.perf_counter() - started
+
+    assert len(results) == calls
+    assert results[0][0]["key"] == "PROJ-1"
+    assert elapsed < SLOW_CALL_SECONDS * calls / 2
+
+@pytest.mark.asyncio
+async def test_slow_call_does_not_block_event_loop():
+    client = make_client()
+    project_cache.clear()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await client.get_projects()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert ticks >= 5
+
+@pytest.mark.asyncio
+async def test_comment_and_update_write_without_fetching():
+    jira = WriteOnlyJira()
+    client = make_client(jira)
+
+    comment = await client.execute_action(JiraAction(action_type="comment", issue_key="PROJ-1", comment="Done"))
+    # A read since the comment cached the snapshot the update takes its id from
+    issue_snapshot_cache.set(
+        issue_cache_key(client.server_url, "PROJ-1"),
+        {"id": "10001", "key": "PROJ-1", "self": "https://example.atlassian.net/rest/api/2/issue/10001"}
+    )
+    update = await client.execute_action(
+        JiraAction(action_type="update", issue_key="PROJ-1", fields={"summary": "Renamed"})
+    )
+
+    assert comment["body"] == "Done"
+    assert update["key"] == "PROJ-1" and update["id"] == "10001"
+    assert jira.writes == [("comment", "PROJ-1"), ("put", "https://example.atlassian.net/rest/api/2/issue/PROJ-1")]
+
+@pytest.mark.asyncio
+async def test_update_looks_up_uncached_id_alongside_the_write():
+    jira = SlowReadJira()
+    client = make_client(jira)
+
+    started = time.perf_counter()
+    update = await client.execute_action(
+        JiraAction(action_type="update", issue_key="PROJ-1", fields={"summary": "Renamed"})
+    )
+    elapsed = time.perf_counter() - started
+
+    assert update["id"] == "10001"
+    assert sorted(kind for kind, _ in jira.writes) == ["get", "put"]
+    assert elapsed < SLOW_CALL_SECONDS * 1.75
+
+def test_field_edits_go_through_the_python_jira_session():
+    jira = JIRA(server="https://example.atlassian.net", basic_auth=("bot@example.com", "token"), get_server_info=False, max_retries=0)
+    adapter = RecordingAdapter()
+    jira._session.mount("https://", adapter)
+    client = make_client(jira)
+
+    client._put_issue_fields("PROJ-1", {"summary": "Renamed"})
+
+    request = adapter.requests[0]
+    assert request.method == "PUT"
+    assert request.url == "https://example.atlassian.net/rest/api/2/issue/PROJ-1"
+    assert request.body == '{"fields": {"summary": "Renamed"}}'
+    assert request.headers["Authorization"].startswith("Basic ")
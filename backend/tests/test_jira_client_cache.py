@@ -0,0 +1,37 @@
+import time
+from backend.services.jira_client_cache import JiraClientCache
+
+def test_cached_client_is_reused_until_token_expiry():
+    cache = JiraClientCache(expiry_margin=0)
+    client = object()
+    cache.put("session", "user-1", client, token_expires_at=time.time() + 60)
+
+    assert cache.get("session") is client
+    assert cache.stats()["hit_rate"] == 1.0
+
+def test_expired_token_is_a_miss():
+    cache = JiraClientCache(expiry_margin=60)
+    cache.put("session", "user-1", object(), token_expires_at=time.time() + 30)
+
+    assert cache.get("session") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_token_refresh_invalidates_all_user_clients():
+    cache = JiraClientCache()
+    cache.put("session-a", "user-1", object())
+    cache.put("session-b", "user-1", object())
+    cache.put("session-c", "user-2", object())
+
+    cache.invalidate_user("user-1")
+
+    assert cache.get("session-a") is None
+    assert cache.get("session-b") is None
+    assert cache.get("session-c") is not None
+
+def test_least_recently_used_client_is_evicted():
+    cache = JiraClientCache(max_entries=1)
+    cache.put("session-a", "user-1", object())
+    cache.put("session-b", "user-2", object())
+
+    assert cache.get("session-a") is None
+    assert cache.stats()["evictions"] == 1
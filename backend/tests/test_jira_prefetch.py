@@ -0,0 +1,118 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+from backend.services.command_parser import JiraAction
+from backend.services.jira_client import JiraClient
+from backend.services.issue_cache import issue_snapshot_cache
+from backend.services.jira_prefetch import find_issue_keys, find_lookup_issue_keys, find_project_keys, prefetch_cache
+
+LOOKUP_SECONDS = 0.2
+
+class WorkflowJira:
+    """Stand-in for jira.JIRA with slow reads and a simple workflow"""
+
+    def __init__(self):
+        self.calls = []
+        self._session = self
+
+    def _get_url(self, path):
+        return f"https://example.atlassian.net/rest/api/2/{path}"
+
+    def issue(self, key, fields=None):
+        self.calls.append(("issue", key))
+        time.sleep(LOOKUP_SECONDS)
+        return SimpleNamespace(raw={"id": "10001", "key": key, "self": self._get_url(f"issue/{key}")})
+
+    def transitions(self, key):
+        self.calls.append(("transitions", key))
+        time.sleep(LOOKUP_SECONDS)
+        return [
+            {"id": "21", "name": "Start work", "to": {"name": "In Progress"}},
+            {"id": "31", "name": "Done", "to": {"name": "Done"}}
+        ]
+
+    def project(self, key):
+        self.calls.append(("project", key))
+        time.sleep(LOOKUP_SECONDS)
+        return SimpleNamespace(
+            id="1",
+            key=key,
+            name="Web",
+            raw={"issueTypes": [{"name": "Story", "subtask": False}, {"name": "Sub-task", "subtask": True}]}
+        )
+
+    def transition_issue(self, key, transition_id):
+        self.calls.append(("transition", key, transition_id))
+
+    def put(self, url, data=None):
+        self.calls.append(("put", url))
+
+    def create_issue(self, fields):
+        self.calls.append(("create", fields["issuetype"]["name"]))
+        return SimpleNamespace(key="WEB-2", self="", id="2")
+
+@pytest.fixture
+def client():
+    issue_snapshot_cache.clear()
+    prefetch_cache.clear()
+    client = JiraClient.__new__(JiraClient)
+    client.server_url = "https://example.atlassian.net"
+    client.email = "bot@example.com"
+    client.client = WorkflowJira()
+    return client
+
+def test_finds_issue_and_project_keys():
+    text = "Move proj-12 to done, then check PROJ-12 and WEB-3 in the web project"
+
+    assert find_issue_keys(text) == ["PROJ-12", "WEB-3"]
+    assert find_project_keys(text, ["WEB", "PROJ", "OPS"]) == ["PROJ", "WEB"]
+    assert find_project_keys("nothing here", ["WEB"]) == []
+
+def test_comment_targets_are_not_looked_up():
+    assert find_lookup_issue_keys("Add a comment to PROJ-1 saying WEB-2 is blocking") == ["WEB-2"]
+    assert find_lookup_issue_keys("Comment on PROJ-1 that it shipped, then move PROJ-1 to done") == ["PROJ-1"]
+
+@pytest.mark.asyncio
+async def test_prefetch_skips_reads_for_comments(client):
+    await client.prefetch("Leave a comment on PROJ-12: ready for review")
+
+    assert client.client.calls == []
+
+@pytest.mark.asyncio
+async def test_prefetch_overlaps_jira_reads_with_parsing(client):
+    text = "Move PROJ-12 to in progress"
+
+    started = time.perf_counter()
+    client.prefetch(text)
+    # Stands in for the LLM call that runs alongside the prefetch
+    await asyncio.sleep(LOOKUP_SECONDS * 1.5)
+    result = await client.execute_action(
+        JiraAction(action_type="update", issue_key="PROJ-12", fields={"status": "In Progress"})
+    )
+    elapsed = time.perf_counter() - started
+
+    assert result["id"] == "10001"
+    assert ("transition", "PROJ-12", "21") in client.client.calls
+    assert client.client.calls.count(("transitions", "PROJ-12")) == 1
+    assert ("put", client.client._get_url("issue/PROJ-12")) not in client.client.calls
+    assert elapsed < LOOKUP_SECONDS * 2.5
+
+@pytest.mark.asyncio
+async def test_create_uses_prefetched_project_issue_types(client):
+    await client.prefetch("Create a bug in WEB for the login page", "WEB")
+
+    await client.execute_action(JiraAction(action_type="create", project_key="WEB", summary="Login page"))
+
+    assert ("create", "Story") in client.client.calls
+
+@pytest.mark.asyncio
+async def test_prefetch_failures_are_dropped(client):
+    def missing(key):
+        raise Exception("Issue does not exist")
+
+    client.client.issue = missing
+    await client.prefetch("Close PROJ-404")
+
+    with pytest.raises(Exception):
+        await client.execute_action(JiraAction(action_type="update", issue_key="PROJ-404"))
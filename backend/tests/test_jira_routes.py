@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.routes import jira
+from backend.services.client_registry import client_registry
+from backend.services.jira_client_cache import jira_client_cache
+from backend.services.jira_scheduler import jira_scheduler
+
+class FakeAuth:
+    """Supabase auth that accepts tokens until they are revoked"""
+
+    def __init__(self):
+        self.revoked = set()
+        self.admin = SimpleNamespace(sign_out=self.revoked.add)
+
+    def get_user(self, token):
+        if token in self.revoked or not token.startswith("session-"):
+            raise ValueError("Invalid JWT")
+        return SimpleNamespace(user=SimpleNamespace(id="u1"))
+
+class FakeJira:
+    def search_issues(self, jql, startAt=0, maxResults=50, fields=None, json_result=False):
+        return {"startAt": startAt, "total": 1, "isLast": True, "issues": [
+            {"id": "1", "key": "PROJ-1", "fields": {"summary": "Cached client", "status": {"name": "To Do"}}}
+        ]}
+
+@pytest.fixture
+def supabase():
+    fake = SimpleNamespace(auth=FakeAuth())
+    client_registry.set("supabase", fake)
+    jira_client_cache.invalidate_user("u1")
+    yield fake
+    client_registry.set("supabase", None)
+    jira_client_cache.invalidate_user("u1")
+
+@pytest.fixture
+def client(supabase):
+    app = FastAPI()
+    app.include_router(jira.router, prefix="/api/jira")
+    return TestClient(app)
+
+def search(client, token):
+    return client.get("/api/jira/search", params={"jql": "project = PROJ"}, headers={"Authorization": f"Bearer {token}"})
+
+def test_cached_clients_still_need_a_valid_session(client, supabase):
+    jira_client_cache.put("session-1", "u1", FakeJira())
+
+    assert search(client, "session-1").status_code == 200
+    supabase.auth.revoked.add("session-1")
+
+    assert search(client, "session-1").status_code == 401
+
+def test_client_lookup_does_not_spend_jira_rate_tokens(client):
+    jira_client_cache.put("session-1", "u1", FakeJira())
+    site = jira_scheduler.site(jira.JIRA_URL)
+    before = site.requests
+
+    assert search(client, "session-1").status_code == 200
+    # Only the search page went through the scheduler
+    assert site.requests - before == 1
+
+@pytest.mark.parametrize("path", ["/api/jira/client-cache/stats", "/api/jira/scheduler/stats"])
+def test_stats_need_a_valid_session(client, path):
+    assert client.get(path, headers={"Authorization": "Bearer anything"}).status_code == 401
+    assert client.get(path, headers={"Authorization": "Bearer session-1"}).status_code == 200
+
+@pytest.mark.form_routes
+def test_logout_drops_cached_clients(supabase):
+    from backend.routes import auth
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api/auth")
+    jira_client_cache.put("session-1", "u1", FakeJira())
+    jira_client_cache.put("session-2", "u1", FakeJira())
+
+    response = TestClient(app).post("/api/auth/logout", headers={"Authorization": "Bearer session-1"})
+
+    assert response.status_code == 204
+    assert "session-1" in supabase.auth.revoked
+    assert jira_client_cache.get("session-2") is None
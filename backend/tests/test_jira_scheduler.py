@@ -0,0 +1,175 @@
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+import requests
+from aiohttp import web
+from jira.exceptions import JIRAError
+from backend.models.jira import Task
+from backend.services.http_pool import HttpPool
+from backend.services.jira_executor import run_blocking
+from backend.services.jira_scheduler import JiraScheduler, RateLimited, RetryableError, jira_scheduler, parse_retry_after, site_key
+from backend.services.jira_service import JiraService
+
+def make_scheduler(**overrides) -> JiraScheduler:
+    scheduler = JiraScheduler()
+    scheduler.rate = 1000
+    scheduler.burst = 1000
+    scheduler.max_concurrency = 8
+    scheduler.backoff_base = 0.001
+    for name, value in overrides.items():
+        setattr(scheduler, name, value)
+    return scheduler
+
+@pytest.mark.asyncio
+async def test_throttled_call_waits_for_retry_after_and_succeeds():
+    scheduler = make_scheduler()
+    attempts = []
+
+    async def call():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise RateLimited("Too many requests", retry_after=0.1)
+        return "ok"
+
+    assert await scheduler.run("https://example.atlassian.net", call) == "ok"
+    assert attempts[1] - attempts[0] >= 0.1
+
+    stats = scheduler.stats()["sites"][0]
+    assert stats["throttled"] == 1
+    assert stats["concurrency_limit"] < 5
+
+@pytest.mark.asyncio
+async def test_retries_are_bounded():
+    scheduler = make_scheduler(max_retries=2)
+
+    async def call():
+        raise RateLimited("Too many requests")
+
+    with pytest.raises(RateLimited):
+        await scheduler.run("https://example.atlassian.net", call)
+    assert scheduler.stats()["sites"][0]["requests"] == 3
+
+@pytest.mark.asyncio
+async def test_non_idempotent_calls_are_only_retried_when_throttled():
+    scheduler = make_scheduler()
+    attempts = []
+
+    async def bad_gateway():
+        attempts.append("502")
+        raise RetryableError("Bad gateway")
+
+    with pytest.raises(RetryableError):
+        await scheduler.run("https://example.atlassian.net", bad_gateway, idempotent=False)
+    assert attempts == ["502"]
+
+    async def throttled_once():
+        attempts.append("429")
+        if attempts.count("429") == 1:
+            raise RateLimited("Too many requests")
+        return "ok"
+
+    assert await scheduler.run("https://example.atlassian.net", throttled_once, idempotent=False) == "ok"
+    assert attempts == ["502", "429", "429"]
+
+class FlakyGateway:
+    """Answers 502 to every request, counting them by method"""
+
+    def __init__(self):
+        self.requests = {}
+
+    async def handler(self, request):
+        self.requests[request.method] = self.requests.get(request.method, 0) + 1
+        return web.Response(status=502, text="Bad gateway")
+
+@pytest_asyncio.fixture
+async def gateway(monkeypatch):
+    fake = FlakyGateway()
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", fake.handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    monkeypatch.setenv("JIRA_API_BASE_URL", f"http://127.0.0.1:{port}")
+    monkeypatch.setattr(jira_scheduler, "max_retries", 2)
+    monkeypatch.setattr(jira_scheduler, "backoff_base", 0.001)
+    yield fake
+    await runner.cleanup()
+
+@pytest.mark.asyncio
+async def test_post_that_got_a_502_is_not_resent(gateway):
+    pool = HttpPool("test")
+    service = JiraService("token", pool=pool)
+    try:
+        with pytest.raises(RetryableError):
+            await service.create_task(Task(id="1", key="PROJ-1", summary="Once", status="To Do"))
+        with pytest.raises(RetryableError):
+            await service._make_request("PUT", "/rest/api/3/issue/PROJ-1", json={"fields": {}})
+    finally:
+        await pool.close()
+
+    assert gateway.requests == {"POST": 1, "PUT": 3}
+
+def jira_error(method: str, status: int) -> JIRAError:
+    response = requests.Response()
+    response.status_code = status
+    response.request = requests.Request(method, "https://example.atlassian.net/rest/api/2/issue").prepare()
+    return JIRAError(status_code=status, text="Bad gateway", response=response)
+
+@pytest.mark.asyncio
+async def test_python_jira_writes_that_got_a_502_are_not_resent(monkeypatch):
+    monkeypatch.setattr(jira_scheduler, "backoff_base", 0.001)
+    calls = []
+
+    def create_issue():
+        calls.append("POST")
+        raise jira_error("POST", 502)
+
+    with pytest.raises(JIRAError):
+        await run_blocking("https://writes.atlassian.net", create_issue)
+    assert calls == ["POST"]
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_is_enforced():
+    scheduler = make_scheduler(max_concurrency=2)
+    active = 0
+    peak = 0
+
+    async def call():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+
+    await asyncio.gather(*(scheduler.run("https://example.atlassian.net", call) for _ in range(6)))
+
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_requests():
+    scheduler = make_scheduler(rate=50, burst=1)
+
+    async def call():
+        return None
+
+    started = time.monotonic()
+    await asyncio.gather(*(scheduler.run("https://example.atlassian.net", call) for _ in range(6)))
+
+    assert time.monotonic() - started >= 0.09
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+def test_cloud_tenants_behind_the_gateway_get_their_own_site():
+    scheduler = make_scheduler()
+    first = scheduler.site("https://api.atlassian.com/ex/jira/cloud-1/rest/api/3/search")
+    second = scheduler.site("https://api.atlassian.com/ex/jira/cloud-2/rest/api/3/project")
+
+    assert first is not second
+    assert first is scheduler.site("https://api.atlassian.com/ex/jira/cloud-1/rest/api/3/issue/bulk")
+    assert site_key("https://example.atlassian.net/rest/api/2/issue") == "example.atlassian.net"
@@ -0,0 +1,46 @@
+import pytest
+from backend.services.jira_search import paginate_issues, summarize_issue
+
+def make_issue(n):
+    return {
+        "id": str(n),
+        "key": f"PROJ-{n}",
+        "fields": {"summary": f"Issue {n}", "status": {"name": "To Do"}, "assignee": {"displayName": "Ada"}}
+    }
+
+@pytest.mark.asyncio
+async def test_paginate_with_start_at():
+    calls = []
+
+    async def fetch_page(start_at, next_page_token, max_results):
+        calls.append(start_at)
+        issues = [make_issue(n) for n in range(start_at, min(start_at + max_results, 7))]
+        return {"startAt": start_at, "total": 7, "issues": issues}
+
+    keys = [issue["key"] async for issue in paginate_issues(fetch_page, page_size=3)]
+
+    assert keys == [f"PROJ-{n}" for n in range(7)]
+    assert calls == [0, 3, 6]
+
+@pytest.mark.asyncio
+async def test_paginate_with_next_page_token():
+    pages = {
+        None: {"issues": [make_issue(1)], "nextPageToken": "b", "isLast": False},
+        "b": {"issues": [make_issue(2)], "isLast": True}
+    }
+
+    async def fetch_page(start_at, next_page_token, max_results):
+        return pages[next_page_token]
+
+    keys = [issue["key"] async for issue in paginate_issues(fetch_page)]
+
+    assert keys == ["PROJ-1", "PROJ-2"]
+
+def test_summarize_issue_projects_fields():
+    assert summarize_issue(make_issue(3)) == {
+        "id": "3",
+        "key": "PROJ-3",
+        "summary": "Issue 3",
+        "status": "To Do",
+        "assignee": "Ada"
+    }
@@ -0,0 +1,51 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from backend.benchmarks.jira_stub import JiraStub
+from backend.services.command_parser import JiraAction
+from backend.services.jira_client import JiraClient
+from backend.services.http_pool import HttpPool
+from backend.services.jira_service import JiraService
+from backend.services.jira_scheduler import jira_scheduler
+
+@pytest_asyncio.fixture
+async def stub():
+    stub = JiraStub(issues_per_project=120, project_count=2)
+    await stub.start()
+    yield stub
+    await stub.stop()
+
+@pytest.mark.asyncio
+async def test_jira_client_against_stub(stub, monkeypatch):
+    monkeypatch.setenv("JIRA_SERVER_URL", stub.url)
+    monkeypatch.setenv("JIRA_EMAIL", "bot@example.com")
+    monkeypatch.setenv("JIRA_API_TOKEN", "token")
+    client = await asyncio.to_thread(JiraClient)
+
+    issues = await client.execute_action(JiraAction(action_type="search", jql="project = PROJ"))
+    results = await client.execute_actions([
+        JiraAction(action_type="create", project_key="PROJ", summary="New task"),
+        JiraAction(action_type="comment", issue_key="PROJ-1", comment="Looks good"),
+        JiraAction(action_type="update", issue_key="PROJ-2", fields={"summary": "Renamed"})
+    ])
+
+    assert len(issues) == 120
+    assert [result["success"] for result in results] == [True, True, True]
+    assert stub.issues["PROJ-2"]["fields"]["summary"] == "Renamed"
+    assert stub.comments["PROJ-1"][0]["body"] == "Looks good"
+
+@pytest.mark.asyncio
+async def test_jira_service_pages_and_retries_against_stub(stub, monkeypatch):
+    monkeypatch.setattr(jira_scheduler, "backoff_base", 0.01)
+    stub.throttle_probability = 0.2
+    stub.retry_after = 0
+    pool = HttpPool("test")
+    service = JiraService("token", pool=pool)
+    service.base_url = stub.url
+
+    tasks = [task async for task in service.iter_tasks("PROJ1", page_size=50)]
+    await pool.close()
+
+    assert len(tasks) == 120
+    assert tasks[0].key == "PROJ1-1"
+    assert jira_scheduler.site(stub.url).throttled == stub.throttled_count
@@ -0,0 +1,54 @@
+import asyncio
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.services.json_stream import JsonArrayStream
+from backend.services.streaming import sse_response
+
+ACTIONS = [
+    {"action": "create_issue", "details": {"summary": "Handle {braces} and \"quotes\" ]"}, "confidence": 0.9},
+    {"action": "update_task", "details": {"task_id": "PROJ-1", "labels": ["a", "b"]}, "confidence": 0.8}
+]
+
+def test_objects_are_emitted_as_they_close():
+    text = "```json\n" + json.dumps(ACTIONS, indent=2) + "\n```"
+    parser = JsonArrayStream()
+    emitted = []
+
+    for i in range(0, len(text), 3):
+        objects = parser.feed(text[i:i + 3])
+        emitted.extend(objects)
+        if objects and len(emitted) == 1:
+            # The first object is available before the array is finished
+            assert not parser.finished
+
+    parser.close()
+    assert emitted == ACTIONS
+
+def test_truncated_array_is_an_error():
+    parser = JsonArrayStream()
+    parser.feed(json.dumps(ACTIONS)[:-10])
+
+    with pytest.raises(ValueError):
+        parser.close()
+
+def test_sse_response_streams_events():
+    app = FastAPI()
+
+    async def actions():
+        for action in ACTIONS:
+            await asyncio.sleep(0)
+            yield action
+        raise RuntimeError("model stopped")
+
+    @app.get("/stream")
+    async def stream():
+        return await sse_response(actions(), event="action")
+
+    response = TestClient(app).get("/stream")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    assert [lines[0] for lines in events] == ["event: action", "event: action", "event: error"]
+    assert json.loads(events[0][1][len("data: "):]) == ACTIONS[0]
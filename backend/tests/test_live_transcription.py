@@ -0,0 +1,147 @@
+import asyncio
+import json
+import pytest
+import pytest_asyncio
+from aiohttp import web, WSMsgType
+from backend.services.http_pool import HttpPool
+from backend.services.live_transcription import (
+    DeepgramLiveSession,
+    SlowConsumer,
+    TranscriptOutbox,
+    relay_live_transcription
+)
+
+def results(transcript, is_final):
+    return json.dumps({
+        "type": "Results",
+        "is_final": is_final,
+        "speech_final": is_final,
+        "start": 0.0,
+        "duration": 1.0,
+        "channel": {"alternatives": [{"transcript": transcript, "confidence": 0.9}]}
+    })
+
+class FakeDeepgram:
+    """Live endpoint that answers each frame with an interim and flushes a final on CloseStream"""
+
+    def __init__(self, frame_delay=0.0):
+        self.frame_delay = frame_delay
+        self.frames = []
+        self.control = []
+        self.connections = 0
+
+    async def handler(self, request):
+        self.connections += 1
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for message in ws:
+            if message.type == WSMsgType.BINARY:
+                await asyncio.sleep(self.frame_delay)
+                self.frames.append(message.data)
+                await ws.send_str(results(f"heard {len(self.frames)}", False))
+            elif message.type == WSMsgType.TEXT:
+                self.control.append(json.loads(message.data)["type"])
+                if self.control[-1] == "CloseStream":
+                    await ws.send_str(results(f"final {len(self.frames)}", True))
+                    await ws.send_str(json.dumps({"type": "Metadata"}))
+                    await ws.close()
+        return ws
+
+@pytest_asyncio.fixture
+async def deepgram():
+    fake = FakeDeepgram()
+    app = web.Application()
+    app.router.add_get("/v1/listen", fake.handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    fake.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/v1/listen"
+    pool = HttpPool("deepgram-test")
+    yield fake, pool
+    await pool.close()
+    await runner.cleanup()
+
+def make_session(fake, pool, **kwargs):
+    return DeepgramLiveSession("key", {"model": "nova", "interim_results": True}, pool, url=fake.url, **kwargs)
+
+@pytest.mark.asyncio
+async def test_relay_streams_interim_and_final_transcripts_over_one_connection(deepgram):
+    fake, pool = deepgram
+    frames = [b"\x00" * 320 for _ in range(5)] + [None]
+    sent = []
+
+    async def receive_audio():
+        await asyncio.sleep(0.01)
+        return frames.pop(0)
+
+    async def send_message(message):
+        sent.append(message)
+
+    session = make_session(fake, pool)
+    await session.connect()
+    summary = await relay_live_transcription(session, receive_audio, send_message)
+
+    assert fake.connections == 1
+    assert len(fake.frames) == 5
+    assert fake.control == ["CloseStream"]
+    assert sent[-1] == {**sent[-1], "transcript": "final 5", "is_final": True}
+    assert all(not message["is_final"] for message in sent[:-1])
+    assert summary["frames"] == 5 and summary["transcripts"] == len(sent)
+
+@pytest.mark.asyncio
+async def test_audio_waits_while_deepgram_is_slow(deepgram):
+    fake, pool = deepgram
+    fake.frame_delay = 0.05
+    session = make_session(fake, pool, max_queued_frames=2)
+    await session.connect()
+
+    async def drain():
+        async for _ in session.results():
+            pass
+
+    reader = asyncio.create_task(drain())
+    for _ in range(6):
+        await session.send_audio(b"\x00" * 320)
+        assert session._queue.qsize() <= 2
+    await session.finish()
+    await reader
+    await session.close()
+
+    assert len(fake.frames) == 6
+
+@pytest.mark.asyncio
+async def test_keepalive_sent_while_client_is_silent(deepgram):
+    fake, pool = deepgram
+    session = make_session(fake, pool, keepalive=0.05)
+    await session.connect()
+
+    await asyncio.sleep(0.2)
+    await session.finish()
+    async for _ in session.results():
+        pass
+    await session.close()
+
+    assert fake.control[0] == "KeepAlive"
+    assert fake.control[-1] == "CloseStream"
+
+@pytest.mark.asyncio
+async def test_outbox_replaces_stale_interims_and_keeps_finals():
+    outbox = TranscriptOutbox(max_pending=2)
+    interim = {"type": "transcript", "is_final": False}
+    final = {"type": "transcript", "is_final": True}
+
+    outbox.put({**interim, "transcript": "a"})
+    outbox.put({**interim, "transcript": "a b"})
+    outbox.put({**final, "transcript": "a b c"})
+    outbox.close()
+
+    assert (await outbox.get())["transcript"] == "a b"
+    assert (await outbox.get())["transcript"] == "a b c"
+    assert await outbox.get() is None
+    assert outbox.replaced_interims == 1
+
+    with pytest.raises(SlowConsumer):
+        full = TranscriptOutbox(max_pending=1)
+        full.put(final)
+        full.put(final)
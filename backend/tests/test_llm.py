@@ -0,0 +1,52 @@
+import time
+import pytest
+from backend.services.llm import LocalLLMProvider, set_llm_provider
+from backend.services.parse_cache import parse_cache
+from backend.services.command_service import CommandService
+from backend.services.command_parser import CommandParser
+
+@pytest.fixture
+def local_llm():
+    provider = LocalLLMProvider(canned={
+        "what is blocking the release": {"action": "query_tasks", "details": {"project_key": "WEB", "status": "Blocked"}, "confidence": 0.9}
+    })
+    set_llm_provider(provider)
+    parse_cache.clear()
+    yield provider
+    set_llm_provider(None)
+
+@pytest.mark.asyncio
+async def test_command_service_parses_offline(local_llm):
+    service = CommandService("token")
+
+    # Unsure for the fast path (no project), so the provider answers
+    command = await service.parse_command("create a bug called Login is broken")
+    canned = await service.parse_command("what is blocking the release", "WEB")
+
+    assert command.action == "create_issue"
+    assert command.details["summary"] == "Login is broken"
+    assert canned.details == {"project_key": "WEB", "status": "Blocked"}
+    assert local_llm.requests == 2
+
+@pytest.mark.asyncio
+async def test_transcripts_parse_and_stream_offline(local_llm):
+    parser = CommandParser()
+    transcript = "Alice: Comment on PROJ-1 saying deployed to staging\nBob: nice work\nAlice: Move PROJ-2 to done"
+
+    actions = await parser.parse_teams_transcript(transcript)
+    streamed = [action async for action in parser.stream_teams_transcript(transcript)]
+
+    assert [action.action_type for action in actions] == ["comment", "update"]
+    assert streamed == actions
+
+@pytest.mark.asyncio
+async def test_latency_and_token_rate_are_simulated(local_llm):
+    local_llm.latency = 0.05
+    local_llm.tokens_per_second = 1000
+    messages = [{"role": "system", "content": "Parse"}, {"role": "user", "content": "Command: Move PROJ-2 to done"}]
+
+    started = time.perf_counter()
+    response = await local_llm.complete(messages, "gpt-4", 0.1)
+
+    assert time.perf_counter() - started >= 0.05 + response.completion_tokens / 1000
+    assert response.prompt_tokens > 0
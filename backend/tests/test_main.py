@@ -0,0 +1,72 @@
+import pytest
+from fastapi.testclient import TestClient
+from backend.services.command_parser import JiraAction
+from backend.services.client_registry import client_registry
+from backend.services.transcription_jobs import transcription_jobs
+
+pytestmark = pytest.mark.form_routes
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    monkeypatch.delenv("SUPABASE_KEY", raising=False)
+    monkeypatch.setattr(transcription_jobs, "db_path", str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(transcription_jobs, "audio_dir", str(tmp_path / "jobs"))
+
+    async def no_prewarm(connections=0):
+        pass
+
+    # Startup must not depend on reaching real upstreams
+    monkeypatch.setattr(client_registry, "prewarm", no_prewarm)
+    from backend.main import app
+    return app
+
+def test_app_mounts_the_routes_packages(app):
+    paths = {route.path for route in app.routes}
+
+    assert {"/api/auth/me", "/api/transcribe/transcribe", "/api/jira/search", "/api/parse-command"} <= paths
+
+def test_lifespan_starts_and_stops_the_shared_clients(app):
+    with TestClient(app) as client:
+        assert client.get("/health").json() == {"status": "healthy"}
+        stats = client.get("/api/client-stats").json()
+        assert stats["started"]
+        assert transcription_jobs.stats()["workers"] == transcription_jobs.workers
+
+    assert not client_registry.stats()["started"]
+    assert transcription_jobs.stats()["workers"] == 0
+
+class FakeParser:
+    async def parse_command(self, transcript, project_key=None):
+        return JiraAction(action_type="update", issue_key="PROJ-12", fields={"status": "Done"})
+
+class FakeJiraClient:
+    def __init__(self):
+        self.prefetched = []
+
+    def prefetch(self, text, project_key=None):
+        self.prefetched.append((text, project_key))
+
+@pytest.fixture
+def parse_clients():
+    jira_client = FakeJiraClient()
+    client_registry.set("command_parser", FakeParser())
+    client_registry.set("jira", jira_client)
+    yield jira_client
+    client_registry.set("command_parser", None)
+    client_registry.set("jira", None)
+
+def test_parse_command_prefetches_jira_data(app, parse_clients):
+    response = TestClient(app).post("/api/parse-command", params={"transcript": "Move PROJ-12 to done", "project_key": "PROJ"})
+
+    assert response.status_code == 200
+    assert response.json()["issue_key"] == "PROJ-12"
+    assert parse_clients.prefetched == [("Move PROJ-12 to done", "PROJ")]
+
+def test_parse_command_works_without_jira(app, parse_clients, monkeypatch):
+    client_registry.set("jira", None)
+    monkeypatch.delenv("JIRA_SERVER_URL", raising=False)
+
+    response = TestClient(app).post("/api/parse-command", params={"transcript": "Move PROJ-12 to done"})
+
+    assert response.status_code == 200
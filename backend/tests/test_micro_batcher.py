@@ -0,0 +1,132 @@
+import asyncio
+import json
+import pytest
+from backend.services.micro_batcher import MicroBatcher, parse_numbered_batch, split_batch_response
+from backend.services.model_cascade import ModelCascade
+from backend.services.command_service import validate_command_response
+
+def recording_processor():
+    batches = []
+
+    async def process(items):
+        batches.append(list(items))
+        await asyncio.sleep(0.01)
+        return [ValueError(item) if item == "bad" else item.upper() for item in items]
+
+    return process, batches
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batch():
+    process, batches = recording_processor()
+    batcher = MicroBatcher(process, window_ms=20, max_batch=10)
+
+    results = await asyncio.gather(*(batcher.submit(item) for item in ["a", "b", "c"]))
+
+    assert results == ["A", "B", "C"]
+    assert batches == [["a", "b", "c"]]
+    assert batcher.stats()["avg_batch_size"] == 3
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting_for_the_window():
+    process, batches = recording_processor()
+    batcher = MicroBatcher(process, window_ms=10000, max_batch=2)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.submit("a"), batcher.submit("b")),
+        timeout=1
+    )
+
+    assert results == ["A", "B"]
+
+@pytest.mark.asyncio
+async def test_failures_are_delivered_per_item_or_to_the_whole_batch():
+    process, _ = recording_processor()
+    batcher = MicroBatcher(process, window_ms=5, max_batch=10)
+
+    results = await asyncio.gather(batcher.submit("ok"), batcher.submit("bad"), return_exceptions=True)
+    assert results[0] == "OK"
+    assert isinstance(results[1], ValueError)
+
+    async def broken(items):
+        raise RuntimeError("rate limited")
+
+    batcher = MicroBatcher(broken, window_ms=5, max_batch=10)
+    results = await asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_releases_its_waiters():
+    started = asyncio.Event()
+
+    async def stuck(items):
+        started.set()
+        await asyncio.sleep(60)
+
+    batcher = MicroBatcher(stuck, window_ms=5, max_batch=10)
+    waiters = [asyncio.create_task(batcher.submit(item)) for item in ("a", "b")]
+    await started.wait()
+    for task in list(batcher._tasks):
+        task.cancel()
+
+    results = await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), 1)
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+def test_batch_response_is_mapped_by_index():
+    content = json.dumps([
+        {"index": 2, "action": "update_task"},
+        {"index": 1, "action": "create_issue"}
+    ])
+
+    assert split_batch_response(content, 3) == [
+        {"action": "create_issue"},
+        {"action": "update_task"},
+        None
+    ]
+
+async def parse_scripted_batch(cascade, answers):
+    models, singles = [], []
+
+    async def complete(commands, model):
+        models.append(model)
+        return json.dumps(answers)
+
+    async def parse_single(command):
+        singles.append(command)
+        return {"action": "single", "details": {}, "confidence": 1.0}
+
+    results = await parse_numbered_batch(
+        [f"command {index}" for index in range(1, len(answers) + 1)],
+        describe=str,
+        complete=complete,
+        validate=validate_command_response,
+        cascade=cascade,
+        parse_single=parse_single
+    )
+    return results, models, singles
+
+BATCH_ANSWERS = [
+    {"index": 1, "action": "update_comment", "details": {"task_id": "PROJ-1", "comment": "Done"}, "confidence": 0.9},
+    {"index": 2, "action": "update_comment", "details": {"task_id": "PROJ-2"}, "confidence": 0.99},
+    {"index": 3, "action": "create_issue", "details": {"project_key": "WEB", "summary": "Fix login"}, "confidence": 0.4},
+    {"index": 4, "action": "update_task", "confidence": 0.9}
+]
+
+@pytest.mark.asyncio
+async def test_batched_answers_are_validated_like_single_parses():
+    results, models, singles = await parse_scripted_batch(ModelCascade(["cheap", "large"]), BATCH_ANSWERS)
+
+    assert models == ["cheap"]
+    assert results[0]["details"]["comment"] == "Done"
+    # Missing details, low confidence and invalid answers escalate on their own rather than being cached
+    assert singles == ["command 2", "command 3", "command 4"]
+    assert all(result["action"] == "single" for result in results[1:])
+
+@pytest.mark.asyncio
+async def test_batched_answers_from_the_last_tier_only_retry_invalid_ones():
+    results, models, singles = await parse_scripted_batch(ModelCascade(["large"]), BATCH_ANSWERS)
+
+    assert models == ["large"]
+    # A single parse would accept these from the last tier too
+    assert [result["action"] for result in results[:3]] == ["update_comment", "update_comment", "create_issue"]
+    assert singles == ["command 4"]
@@ -0,0 +1,70 @@
+import json
+import pytest
+from backend.services.model_cascade import InvalidParse, ModelCascade
+from backend.services.command_service import validate_command_response
+
+def answer(action, confidence, **details):
+    return json.dumps({"action": action, "details": details, "confidence": confidence})
+
+def scripted(answers):
+    calls = []
+
+    async def call(model):
+        calls.append(model)
+        return answers[model]
+
+    return call, calls
+
+@pytest.mark.asyncio
+async def test_confident_cheap_answer_is_accepted():
+    cascade = ModelCascade(["cheap", "large"])
+    call, calls = scripted({"cheap": answer("update_comment", 0.9, task_id="PROJ-1", comment="Done")})
+
+    result = await cascade.run(call, validate_command_response)
+
+    assert result["details"]["comment"] == "Done"
+    assert calls == ["cheap"]
+
+@pytest.mark.asyncio
+async def test_thresholds_are_per_action_type():
+    cascade = ModelCascade(["cheap", "large"], thresholds={"create_issue": 0.95, "query_tasks": 0.5})
+    call, calls = scripted({
+        "cheap": answer("create_issue", 0.9, project_key="PROJ", summary="Fix login"),
+        "large": answer("create_issue", 0.6, project_key="PROJ", summary="Fix the login page")
+    })
+
+    result = await cascade.run(call, validate_command_response)
+
+    # The last tier is accepted whatever its confidence
+    assert result["details"]["summary"] == "Fix the login page"
+    assert calls == ["cheap", "large"]
+    assert cascade.threshold("query_tasks") == 0.5
+
+@pytest.mark.asyncio
+async def test_invalid_or_incomplete_answers_escalate():
+    cascade = ModelCascade(["cheap", "large"])
+    call, calls = scripted({
+        "cheap": "Sure! Here is the JSON you asked for",
+        "large": answer("update_comment", 0.9, task_id="PROJ-1", comment="Done")
+    })
+    await cascade.run(call, validate_command_response)
+
+    call, calls = scripted({
+        "cheap": answer("update_comment", 0.99, task_id="PROJ-1"),
+        "large": answer("update_comment", 0.9, task_id="PROJ-1", comment="Done")
+    })
+    await cascade.run(call, validate_command_response)
+
+    assert calls == ["cheap", "large"]
+    stats = cascade.stats()
+    assert stats["escalation_rate"] == 1.0
+    assert stats["tiers"][0]["errors"] == 1
+    assert stats["tiers"][1]["accepted"] == 2
+
+@pytest.mark.asyncio
+async def test_last_tier_failure_is_raised():
+    cascade = ModelCascade(["only"])
+    call, _ = scripted({"only": "not json"})
+
+    with pytest.raises(InvalidParse):
+        await cascade.run(call, validate_command_response)
@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+from backend.services.parse_cache import ParseCache, parse_cache_key
+
+def counting_parser():
+    calls = {"count": 0}
+
+    async def parse():
+        calls["count"] += 1
+        await asyncio.sleep(0.01)
+        return {"action_type": "comment", "issue_key": "PROJ-1", "comment": "Done"}
+
+    return parse, calls
+
+def test_key_ignores_whitespace_and_trailing_punctuation():
+    key = parse_cache_key("jira_action", "v1", "Close  PROJ-1 please.", "proj")
+
+    assert key == parse_cache_key("jira_action", "v1", " Close PROJ-1 please", "PROJ")
+    assert key != parse_cache_key("jira_action", "v2", "Close PROJ-1 please", "PROJ")
+    assert key != parse_cache_key("jira_action", "v1", "Close PROJ-1 please", "WEB")
+
+@pytest.mark.asyncio
+async def test_repeated_and_concurrent_commands_share_one_parse():
+    cache = ParseCache(ttl=60, max_entries=10)
+    parse, calls = counting_parser()
+
+    await asyncio.gather(*(cache.get_or_parse("key", parse) for _ in range(3)))
+    await cache.get_or_parse("key", parse)
+
+    assert calls["count"] == 1
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["memory_hits"] == 1
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "parse.db")
+    parse, calls = counting_parser()
+
+    first = ParseCache(ttl=60, max_entries=10, db_path=path)
+    value = await first.get_or_parse("key", parse)
+    first.store.close()
+
+    second = ParseCache(ttl=60, max_entries=10, db_path=path)
+    assert await second.get_or_parse("key", parse) == value
+    assert calls["count"] == 1
+    assert second.stats()["disk_hits"] == 1
+
+@pytest.mark.asyncio
+async def test_failed_parses_are_not_cached():
+    cache = ParseCache(ttl=60, max_entries=10)
+
+    async def fail():
+        raise ValueError("bad JSON")
+
+    with pytest.raises(ValueError):
+        await cache.get_or_parse("key", fail)
+    parse, calls = counting_parser()
+    await cache.get_or_parse("key", parse)
+
+    assert calls["count"] == 1
@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from backend.services.ttl_cache import TTLCache
+from backend.services.etag import etag_response
+
+def counting_loader():
+    calls = {"count": 0}
+
+    async def load():
+        calls["count"] += 1
+        await asyncio.sleep(0.01)
+        return [{"key": "PROJ", "version": calls["count"]}]
+
+    return load, calls
+
+@pytest.mark.asyncio
+async def test_fresh_entries_are_served_from_cache():
+    cache = TTLCache(ttl=60)
+    load, calls = counting_loader()
+
+    await cache.get_or_load("user", load)
+    await cache.get_or_load("user", load)
+
+    assert calls["count"] == 1
+    assert cache.stats()["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = TTLCache(ttl=60)
+    load, calls = counting_loader()
+
+    await asyncio.gather(*(cache.get_or_load("user", load) for _ in range(5)))
+
+    assert calls["count"] == 1
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_strand_waiters():
+    cache = TTLCache(ttl=60)
+    load, calls = counting_loader()
+
+    leader = asyncio.create_task(cache.get_or_load("user", load))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_load("user", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    value = await asyncio.wait_for(waiter, 1)
+
+    assert leader.cancelled()
+    # The waiter loads for itself once the load it joined is abandoned
+    assert value[0]["version"] == 2
+    assert calls["count"] == 2
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_the_shared_load():
+    cache = TTLCache(ttl=60)
+    load, calls = counting_loader()
+
+    leader = asyncio.create_task(cache.get_or_load("user", load))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_load("user", load))
+    await asyncio.sleep(0)
+    waiter.cancel()
+
+    value = await asyncio.wait_for(leader, 1)
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert value[0]["version"] == 1
+    assert calls["count"] == 1
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_revalidating():
+    cache = TTLCache(ttl=0, stale_ttl=60)
+    load, calls = counting_loader()
+
+    first = await cache.get_or_load("user", load)
+    stale = await cache.get_or_load("user", load)
+    await asyncio.sleep(0.05)
+
+    assert stale == first
+    assert calls["count"] == 2
+    assert cache._entries["user"].value[0]["version"] == 2
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a").value == 1
+
+def test_etag_response_returns_304_for_matching_tag():
+    app = FastAPI()
+
+    @app.get("/projects")
+    async def projects(request: Request):
+        return etag_response(request, [{"key": "PROJ"}])
+
+    client = TestClient(app)
+    first = client.get("/projects")
+    second = client.get("/projects", headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.headers["etag"] == first.headers["etag"]
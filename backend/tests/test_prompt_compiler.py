@@ -0,0 +1,53 @@
+import pytest
+from backend.services.prompt_compiler import PromptTemplate, PromptTooLarge, TokenUsage
+
+def template(**overrides):
+    options = {
+        "fields": [("text", "Command"), ("project_key", "Project"), ("context", "Context")],
+        "truncatable": "text",
+        "droppable": ["context"],
+        "max_output_tokens": 100,
+        "context_window": 400
+    }
+    options.update(overrides)
+    return PromptTemplate("command", "You parse Jira commands.", "Return JSON.", **options)
+
+def test_static_prefix_is_identical_across_requests():
+    prompt = template()
+
+    first = prompt.render(text="Close PROJ-1", project_key="PROJ")
+    second = prompt.render(text="Open PROJ-2", context={"sprint": 4})
+
+    assert first.messages[0] == second.messages[0]
+    assert first.messages[0]["content"] == "You parse Jira commands.\n\nReturn JSON."
+    assert first.messages[1]["content"] == "Command: Close PROJ-1\nProject: PROJ"
+    assert second.messages[1]["content"] == 'Command: Open PROJ-2\nContext: {"sprint":4}'
+
+def test_over_budget_drops_context_then_truncates():
+    prompt = template()
+
+    compiled = prompt.render(text="Close PROJ-1", context={"notes": "x" * 2000})
+    assert compiled.truncated
+    assert "Context" not in compiled.messages[1]["content"]
+
+    compiled = prompt.render(text="word " * 1000)
+    assert compiled.truncated
+    assert compiled.tokens_in <= prompt.max_input_tokens
+
+def test_prompt_that_cannot_fit_is_rejected():
+    prompt = template(truncatable=None)
+
+    with pytest.raises(PromptTooLarge):
+        prompt.render(text="word " * 1000)
+
+def test_token_usage_prefers_provider_counts():
+    usage = TokenUsage()
+    compiled = template().render(text="Close PROJ-1")
+
+    usage.record(compiled, 120, 30)
+    usage.record(compiled, None, 10)
+
+    stats = usage.stats()["command"]
+    assert stats["calls"] == 2
+    assert stats["tokens_in"] == 120 + compiled.tokens_in
+    assert stats["tokens_out"] == 40
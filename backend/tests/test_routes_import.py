@@ -0,0 +1,59 @@
+import importlib
+import sys
+from types import SimpleNamespace
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.services.client_registry import client_registry
+
+@pytest.mark.parametrize("name", [pytest.param("auth", marks=pytest.mark.form_routes), "transcription", "jira"])
+def test_routes_import_the_services_main_uses(name, monkeypatch):
+    # Importing must not build clients, so missing credentials cannot break it
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    monkeypatch.delenv("SUPABASE_KEY", raising=False)
+    routes = importlib.import_module(f"backend.routes.{name}")
+
+    assert routes.router.routes
+    # A second copy under a top-level `services` package would bypass the pools and clients the lifespan manages
+    assert not any(module == "services" or module.startswith("services.") for module in sys.modules)
+
+class FakeSupabase:
+    """Answers the lookups GET /me makes"""
+
+    def __init__(self):
+        self.auth = SimpleNamespace(get_user=lambda token: SimpleNamespace(user=SimpleNamespace(id="u1")))
+
+    def table(self, name):
+        return self
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=[{"id": "u1", "email": "user@example.com"}])
+
+@pytest.fixture
+def auth_app(monkeypatch):
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    monkeypatch.delenv("SUPABASE_KEY", raising=False)
+    from backend.routes import auth
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api/auth")
+    client_registry.set("supabase", None)
+    yield TestClient(app)
+    client_registry.set("supabase", None)
+
+@pytest.mark.form_routes
+def test_auth_routes_use_the_lifespan_supabase_client(auth_app):
+    headers = {"Authorization": "Bearer token"}
+
+    assert auth_app.get("/api/auth/me", headers=headers).status_code == 503
+
+    client_registry.set("supabase", FakeSupabase())
+    response = auth_app.get("/api/auth/me", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "user@example.com"
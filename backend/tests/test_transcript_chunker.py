@@ -0,0 +1,98 @@
+import asyncio
+import time
+import pytest
+from backend.services.tokens import estimate_tokens
+from backend.services.transcript_chunker import (
+    chunk_transcript,
+    map_chunks,
+    merge_actions,
+    split_turns,
+    stream_chunks
+)
+
+def meeting(turns: int) -> str:
+    return "\n".join(
+        f"[00:{i // 60:02d}:{i % 60:02d}] Speaker {chr(65 + i % 3)}: item {i} is about the login page and the release"
+        for i in range(turns)
+    )
+
+def test_continuation_lines_stay_with_their_speaker():
+    turns = split_turns("Alice: create a bug\nfor the login page\nBob: sounds good")
+
+    assert turns == ["Alice: create a bug for the login page", "Bob: sounds good"]
+
+def test_chunks_respect_budget_and_overlap():
+    chunks = chunk_transcript(meeting(200), max_tokens=200, overlap_tokens=40)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 200 for chunk in chunks)
+    for previous, current in zip(chunks, chunks[1:]):
+        # Each window starts with the tail of the previous one
+        assert current.split("\n")[0] in previous.split("\n")
+    assert "item 199" in chunks[-1]
+
+def test_oversized_turn_without_labels_is_split():
+    transcript = " ".join(f"Sentence number {i} mentions PROJ-{i}." for i in range(100))
+
+    chunks = chunk_transcript(transcript, max_tokens=50, overlap_tokens=0)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 50 for chunk in chunks)
+    assert " ".join(chunks) == transcript
+
+def test_overlapping_actions_are_deduplicated():
+    first = [{"action": "create_issue", "details": {"summary": "Fix login"}, "confidence": 0.9}]
+    second = [
+        {"action": "create_issue", "details": {"summary": "fix login."}, "confidence": 0.8},
+        {"action": "update_comment", "details": {"task_id": "PROJ-1", "comment": "Done"}, "confidence": 0.9}
+    ]
+
+    merged = merge_actions([first, second])
+
+    assert merged == [first[0], second[1]]
+
+@pytest.mark.asyncio
+async def test_chunks_are_parsed_concurrently_within_bound():
+    running = {"now": 0, "peak": 0}
+
+    async def parse(chunk, index):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.05)
+        running["now"] -= 1
+        return [index]
+
+    started = time.perf_counter()
+    results = await map_chunks([str(i) for i in range(8)], parse, max_concurrency=8)
+
+    assert results == [[i] for i in range(8)]
+    assert time.perf_counter() - started < 0.2
+    assert running["peak"] == 8
+
+    running["peak"] = 0
+    await map_chunks([str(i) for i in range(8)], parse, max_concurrency=2)
+    assert running["peak"] == 2
+
+@pytest.mark.asyncio
+async def test_streamed_chunks_yield_early_and_deduplicate():
+    async def stream(chunk, index):
+        await asyncio.sleep(0.01 if index == 1 else 0.1)
+        yield {"action": "create_issue", "details": {"summary": f"Task {index}"}}
+        yield {"action": "create_issue", "details": {"summary": "Shared"}}
+
+    received = [action async for action in stream_chunks(["a", "b"], stream)]
+
+    summaries = [action["details"]["summary"] for action in received]
+    assert summaries == ["Task 1", "Shared", "Task 0"]
+
+@pytest.mark.asyncio
+async def test_failing_chunk_stops_the_stream():
+    async def stream(chunk, index):
+        if index == 0:
+            raise ValueError("bad JSON")
+        await asyncio.sleep(1)
+        yield {"action": "never"}
+
+    with pytest.raises(ValueError):
+        async for _ in stream_chunks(["a", "b"], stream):
+            pass
@@ -0,0 +1,133 @@
+import asyncio
+import io
+import os
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+from backend.services.transcription_cache import (
+    TranscriptionCache,
+    digest_bytes,
+    digest_upload,
+    iter_spool,
+    spool_stream,
+    transcription_cache,
+    transcription_cache_key
+)
+from backend.services.transcription_service import TranscriptionService, deepgram_http_pool
+
+class FakeListen:
+    """Prerecorded /listen endpoint that counts the requests it serves"""
+
+    def __init__(self):
+        self.requests = 0
+
+    async def handler(self, request):
+        self.requests += 1
+        await request.read()
+        await asyncio.sleep(0.05)
+        return web.json_response({
+            "results": {"channels": [{
+                "alternatives": [{"transcript": "close PROJ-1", "confidence": 0.9}],
+                "detected_language": request.query.get("language")
+            }]}
+        })
+
+@pytest_asyncio.fixture
+async def deepgram(monkeypatch):
+    fake = FakeListen()
+    app = web.Application(client_max_size=0)
+    app.router.add_post("/v1/listen", fake.handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    monkeypatch.setenv("DEEPGRAM_API_KEY", "key")
+    monkeypatch.setenv("DEEPGRAM_API_URL", f"http://127.0.0.1:{port}/v1")
+    transcription_cache.clear()
+    yield fake
+    transcription_cache.clear()
+    await deepgram_http_pool.close()
+    await runner.cleanup()
+
+def upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="meeting.webm", headers=Headers({"content-type": "audio/webm"}))
+
+async def chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+@pytest.mark.asyncio
+async def test_repeated_and_concurrent_uploads_share_one_request(deepgram):
+    audio = os.urandom(300000)
+    service = TranscriptionService()
+    misses = transcription_cache.stats()["misses"]
+
+    results = await asyncio.gather(*(service.transcribe_upload(upload(audio), "en") for _ in range(3)))
+    again = await service.transcribe_upload(upload(audio), "en")
+
+    assert deepgram.requests == 1
+    assert again == results[0] == {"transcript": "close PROJ-1", "confidence": 0.9, "language": "en"}
+    assert transcription_cache.stats()["misses"] == misses + 1
+
+@pytest.mark.asyncio
+async def test_options_and_content_change_the_key(deepgram):
+    audio = os.urandom(100000)
+    service = TranscriptionService()
+
+    await service.transcribe_upload(upload(audio), "en")
+    spanish = await service.transcribe_upload(upload(audio), "es")
+    await service.transcribe_upload(upload(audio + b"\x00"), "en")
+
+    assert deepgram.requests == 3
+    assert spanish["language"] == "es"
+
+@pytest.mark.asyncio
+async def test_raw_streams_are_spooled_hashed_and_cached(deepgram):
+    audio = os.urandom(3 * 1024 * 1024)
+    service = TranscriptionService()
+
+    streamed = await service.transcribe_chunks(chunks(audio, 65536), "audio/webm", "en")
+    uploaded = await service.transcribe_upload(upload(audio), "en")
+
+    assert streamed == uploaded
+    assert deepgram.requests == 1
+
+@pytest.mark.asyncio
+async def test_digests_do_not_depend_on_chunking():
+    audio = os.urandom(2 * 1024 * 1024 + 17)
+    file = upload(audio)
+
+    spool, digest = await spool_stream(chunks(audio, 4099))
+    replayed = b"".join([chunk async for chunk in iter_spool(spool)])
+
+    assert digest == digest_bytes(audio) == await digest_upload(file, chunk_size=1000)
+    assert replayed == audio
+    assert spool.closed
+    assert await file.read() == audio
+
+def test_key_covers_options_in_any_order():
+    key = transcription_cache_key("abc", {"model": "nova", "language": "en"})
+
+    assert key == transcription_cache_key("abc", {"language": "en", "model": "nova"})
+    assert key != transcription_cache_key("abc", {"model": "nova", "language": "es"})
+    assert key != transcription_cache_key("abd", {"model": "nova", "language": "en"})
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "transcriptions.db")
+    calls = []
+
+    async def transcribe():
+        calls.append(1)
+        return {"transcript": "hello", "confidence": 0.8, "language": "en"}
+
+    await TranscriptionCache(ttl=60, max_entries=10, db_path=path).get_or_load("key", transcribe)
+    restarted = TranscriptionCache(ttl=60, max_entries=10, db_path=path)
+    result = await restarted.get_or_load("key", transcribe)
+
+    assert result["transcript"] == "hello"
+    assert len(calls) == 1
+    assert restarted.stats()["disk_hits"] == 1
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import pytest
+from backend.services.transcription_jobs import COMPLETED, FAILED, QUEUED, JobQueueFull, TranscriptionJobs
+
+class FakeTranscriber:
+    """Stands in for Deepgram, tracking how many calls overlap"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+        self.release = None
+
+    async def __call__(self, path, language, content_type):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            self.calls.append(audio)
+            if self.release is not None:
+                await self.release.wait()
+            await asyncio.sleep(self.delay)
+            if audio == b"bad":
+                raise Exception("Deepgram API error: corrupt audio")
+            return {"transcript": f"{len(audio)} bytes", "confidence": 0.9, "language": language}
+        finally:
+            self.active -= 1
+
+def make_jobs(tmp_path, transcribe, workers=2, max_queued=100) -> TranscriptionJobs:
+    return TranscriptionJobs(
+        transcribe=transcribe,
+        db_path=str(tmp_path / "jobs.db"),
+        audio_dir=str(tmp_path / "audio"),
+        workers=workers,
+        max_queued=max_queued,
+        ttl=3600
+    )
+
+async def chunks(data: bytes):
+    for start in range(0, len(data), 1000):
+        yield data[start:start + 1000]
+
+async def wait_finished(jobs: TranscriptionJobs, job_id: str):
+    async for job in jobs.watch(job_id):
+        pass
+    return job
+
+@pytest.mark.asyncio
+async def test_jobs_run_in_the_background_on_bounded_workers(tmp_path):
+    transcriber = FakeTranscriber()
+    jobs = make_jobs(tmp_path, transcriber, workers=2)
+    await jobs.start()
+    try:
+        submitted = [await jobs.submit(chunks(os.urandom(5000 + i)), "audio/wav", "en") for i in range(6)]
+        assert all(job["status"] == QUEUED for job in submitted)
+
+        finished = await asyncio.gather(*(wait_finished(jobs, job["id"]) for job in submitted))
+    finally:
+        await jobs.close()
+
+    assert [job["status"] for job in finished] == [COMPLETED] * 6
+    assert finished[2]["result"]["transcript"] == "5002 bytes"
+    assert transcriber.peak == 2
+    # Finished jobs give up their spooled audio
+    assert os.listdir(tmp_path / "audio") == []
+
+@pytest.mark.asyncio
+async def test_failures_are_recorded_on_the_job(tmp_path):
+    jobs = make_jobs(tmp_path, FakeTranscriber())
+    await jobs.start()
+    try:
+        job = await jobs.submit(chunks(b"bad"), "audio/wav", "en")
+        finished = await wait_finished(jobs, job["id"])
+    finally:
+        await jobs.close()
+
+    assert finished["status"] == FAILED
+    assert "corrupt audio" in finished["error"]
+    assert jobs.stats()["failed"] == 1
+
+@pytest.mark.asyncio
+async def test_watch_reports_each_status_change(tmp_path):
+    jobs = make_jobs(tmp_path, FakeTranscriber())
+    await jobs.start()
+    try:
+        job = await jobs.submit(chunks(b"audio"), "audio/wav", "en")
+        statuses = [update["status"] async for update in jobs.watch(job["id"])]
+    finally:
+        await jobs.close()
+
+    assert statuses[-1] == COMPLETED
+    assert "running" in statuses
+
+@pytest.mark.asyncio
+async def test_queue_limit_rejects_new_jobs(tmp_path):
+    transcriber = FakeTranscriber()
+    transcriber.release = asyncio.Event()
+    jobs = make_jobs(tmp_path, transcriber, workers=1, max_queued=2)
+    await jobs.start()
+    try:
+        first = await jobs.submit(chunks(b"one"))
+        await asyncio.sleep(0.01)
+        await jobs.submit(chunks(b"two"))
+        await jobs.submit(chunks(b"three"))
+        with pytest.raises(JobQueueFull):
+            await jobs.submit(chunks(b"four"))
+        transcriber.release.set()
+        await wait_finished(jobs, first["id"])
+    finally:
+        await jobs.close()
+
+    assert jobs.stats()["rejected"] == 1
+    assert len(os.listdir(tmp_path / "audio")) <= 2
+
+@pytest.mark.asyncio
+async def test_unfinished_jobs_resume_after_restart(tmp_path):
+    stalled = FakeTranscriber()
+    stalled.release = asyncio.Event()
+    jobs = make_jobs(tmp_path, stalled, workers=1)
+    await jobs.start()
+    running = await jobs.submit(chunks(b"running"), "audio/wav", "en")
+    queued = await jobs.submit(chunks(b"queued"), "audio/wav", "en")
+    await asyncio.sleep(0.01)
+    assert jobs.get(running["id"])["status"] == "running"
+    await jobs.close()
+
+    restarted = make_jobs(tmp_path, FakeTranscriber(), workers=1)
+    await restarted.start()
+    try:
+        finished = [await wait_finished(restarted, job["id"]) for job in (running, queued)]
+    finally:
+        await restarted.close()
+
+    assert [job["status"] for job in finished] == [COMPLETED, COMPLETED]
+    assert finished[1]["result"]["transcript"] == "6 bytes"
+    assert restarted.stats()["recovered"] == 2
@@ -0,0 +1,143 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from starlette.websockets import WebSocketDisconnect
+from fastapi.testclient import TestClient
+from backend.services.client_registry import client_registry
+from backend.services.transcription_jobs import transcription_jobs
+
+pytestmark = pytest.mark.form_routes
+
+HEADERS = {"Authorization": "Bearer valid"}
+
+class FakeAuth:
+    """Accepts only the token "valid" """
+
+    def get_user(self, token):
+        if token != "valid":
+            raise ValueError("Invalid JWT")
+        return SimpleNamespace(user=SimpleNamespace(id="u1"))
+
+class FakeDeepgram:
+    """Collects streamed bodies and answers with a fixed transcript"""
+
+    def __init__(self):
+        self.received = b""
+
+    async def transcribe_chunks(self, chunks, content_type, language=None):
+        async for chunk in chunks:
+            self.received += chunk
+        return {"transcript": "hello", "confidence": 0.9, "language": language}
+
+    async def transcribe_long(self, path, language=None, content_type=None):
+        with open(path, "rb") as f:
+            self.received += f.read()
+        return {"transcript": "hello", "confidence": 0.9}
+
+    def live_session(self, language=None, encoding=None, sample_rate=None, channels=None):
+        return FakeLiveSession()
+
+class FakeLiveSession:
+    """Echoes the number of audio bytes it got as one final transcript"""
+
+    def __init__(self):
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.finished = asyncio.Event()
+
+    async def connect(self):
+        pass
+
+    async def send_audio(self, frame):
+        self.frames_sent += 1
+        self.bytes_sent += len(frame)
+
+    async def finish(self):
+        self.finished.set()
+
+    async def results(self):
+        await self.finished.wait()
+        yield {"type": "transcript", "transcript": f"{self.bytes_sent} bytes", "is_final": True}
+
+    async def close(self):
+        pass
+
+@pytest.fixture
+def deepgram(monkeypatch):
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    monkeypatch.delenv("SUPABASE_KEY", raising=False)
+    fake = FakeDeepgram()
+    client_registry.set("supabase", SimpleNamespace(auth=FakeAuth()))
+    client_registry.set("deepgram", fake)
+    yield fake
+    client_registry.set("supabase", None)
+    client_registry.set("deepgram", None)
+
+@pytest.fixture
+def client(deepgram, monkeypatch, tmp_path):
+    monkeypatch.setattr(transcription_jobs, "db_path", str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(transcription_jobs, "audio_dir", str(tmp_path / "jobs"))
+
+    async def no_prewarm(connections=0):
+        pass
+
+    monkeypatch.setattr(client_registry, "prewarm", no_prewarm)
+    from backend.main import app
+    # Entering the client runs the lifespan, which starts the job workers
+    with TestClient(app) as client:
+        yield client
+
+def test_raw_audio_streams_through_the_mounted_app(client, deepgram):
+    response = client.post(
+        "/api/transcribe/audio/raw",
+        content=b"\x00" * 4096,
+        headers={**HEADERS, "Content-Type": "audio/wav"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"transcript": "hello", "confidence": 0.9}
+    assert len(deepgram.received) == 4096
+
+def test_raw_audio_needs_a_valid_session(client, deepgram):
+    response = client.post(
+        "/api/transcribe/audio/raw",
+        content=b"\x00" * 16,
+        headers={"Authorization": "Bearer revoked", "Content-Type": "audio/wav"}
+    )
+
+    assert response.status_code == 401
+    assert deepgram.received == b""
+
+def test_jobs_are_served_by_the_mounted_app(client, deepgram):
+    submitted = client.post(
+        "/api/transcribe/jobs",
+        files={"file": ("meeting.wav", b"\x00" * 1024, "audio/wav")},
+        headers=HEADERS
+    )
+    assert submitted.status_code == 202
+    job_id = submitted.json()["id"]
+
+    events = client.get(f"/api/transcribe/jobs/{job_id}/events", headers=HEADERS)
+    job = client.get(f"/api/transcribe/jobs/{job_id}", headers=HEADERS).json()
+
+    assert "event: job" in events.text
+    assert job["status"] == "completed" and job["result"]["transcript"] == "hello"
+    assert client.get("/api/transcribe/stats", headers=HEADERS).json()["jobs"]["completed"] >= 1
+    assert client.get(f"/api/transcribe/jobs/{job_id}").status_code == 401
+
+def test_live_websocket_is_served_by_the_mounted_app(client):
+    with client.websocket_connect("/api/transcribe/live?token=valid") as websocket:
+        websocket.send_bytes(b"\x00" * 320)
+        websocket.send_bytes(b"\x00" * 320)
+        websocket.send_text('{"type": "CloseStream"}')
+        transcript = websocket.receive_json()
+        closed = websocket.receive_json()
+
+    assert transcript["transcript"] == "640 bytes"
+    assert closed == {"type": "closed", "frames": 2, "bytes": 640, "transcripts": 1, "replaced_interims": 0}
+
+def test_live_websocket_rejects_invalid_tokens(client):
+    with pytest.raises(WebSocketDisconnect) as error:
+        with client.websocket_connect("/api/transcribe/live?token=revoked") as websocket:
+            websocket.receive_json()
+    assert error.value.code == 1008